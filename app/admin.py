@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Lawyer, StatusOption, Person, LawyerPerson, UploadBatch, UploadRowStaging, BatchDiff, AuditLog, Election, ElectionVote
+from .models import Lawyer, StatusOption, Person, LawyerPerson, UploadBatch, UploadRowStaging, BatchDiff, AuditLog, Election, ElectionVote, ImportJob
 
 
 @admin.register(Lawyer)
@@ -34,6 +34,13 @@ admin.site.register(BatchDiff)
 admin.site.register(AuditLog)
 
 
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "lawyer", "original_filename", "status", "stage", "progress", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    search_fields = ("original_filename",)
+
+
 @admin.register(Election)
 class ElectionAdmin(admin.ModelAdmin):
     list_display = ("name", "election_date", "is_active", "allow_external_registration", "created_at")
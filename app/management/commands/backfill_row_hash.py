@@ -0,0 +1,21 @@
+# app/management/commands/backfill_row_hash.py
+from django.core.management.base import BaseCommand
+
+from app.services.diff_service import backfill_row_hashes
+
+
+class Command(BaseCommand):
+    help = ("row_hash'i boş olan LawyerPerson ve staging satırlarının içerik özetini parçalar halinde "
+            "hesaplar (özeti olmayan satırlar diff'te alan alan karşılaştırılır)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk', type=int, default=5000,
+                            help='Her turda okunup güncellenecek en fazla satır')
+
+    def handle(self, *args, **options):
+        def on_chunk(model_name, done):
+            self.stdout.write(f'{model_name}: {done} satır')
+
+        report = backfill_row_hashes(chunk_rows=options['chunk'], progress=on_chunk)
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f'{name}: {count} satırın özeti hesaplandı' for name, count in report.items())))
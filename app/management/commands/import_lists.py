@@ -0,0 +1,162 @@
+# app/management/commands/import_lists.py
+import shutil
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app.services.bulk_import_service import (
+    ALLOWED_EXTENSIONS, MANIFEST_NAME, audit_report, collect_files, import_files, plan_tasks,
+)
+from app.services.importer import DUPLICATE_POLICIES
+from app.utils.file_validators import ValidationError
+
+PROCESSED_DIR = 'processed'
+FAILED_DIR = 'failed'
+
+
+class Command(BaseCommand):
+    help = ("Yerel liste dosyalarını HTTP'siz içe aktarır (süreç havuzu ile paralel). "
+            "Avukat eşlemesi: --mapping / manifest.csv (dosya, avukat_sicil[, sayfa]), "
+            "dosya adı (<avukat_sicil>[_...].csv) veya çalışma kitabı sayfa adı. "
+            "--watch ile bırakma klasörü izlenir ve gelen dosyalar içe aktarılır.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Dosyalar ve/veya dizinler (--watch: tek dizin)')
+        parser.add_argument('--mapping', help='Eşleme dosyası (manifest.csv biçiminde)')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Paralel okuma süreç sayısı (varsayılan: IMPORT_WORKERS / CPU sayısı)')
+        parser.add_argument('--duplicate-policy', choices=DUPLICATE_POLICIES, default=None,
+                            help=f'Dosya içi tekrar eden sicil no çözümü (varsayılan: {settings.IMPORT_DUPLICATE_POLICY})')
+        parser.add_argument('--actor', default='import_lists', help="AuditLog'a yazılacak kullanıcı")
+        parser.add_argument('--watch', action='store_true',
+                            help=f"Dizini izle; işlenen dosyalar {PROCESSED_DIR}/ veya {FAILED_DIR}/ altına taşınır")
+        parser.add_argument('--interval', type=float, default=5.0, help='İzleme aralığı (saniye)')
+
+    def handle(self, *args, **options):
+        if options['watch']:
+            self._watch(options)
+            return
+
+        try:
+            files = collect_files(options['paths'])
+            self._run(files, options, source=', '.join(options['paths']))
+        except ValidationError as ve:
+            raise CommandError(_error_text(ve))
+
+    def _run(self, files, options, source, missing_ok=False):
+        if options['mapping']:
+            files[MANIFEST_NAME] = Path(options['mapping'])
+        report = import_files(files, created_by=options['actor'], max_workers=options['workers'],
+                              duplicate_policy=options['duplicate_policy'], missing_ok=missing_ok)
+
+        # Manifest varken listelenmeyen dosyalar eşlenmez; sessizce kalmasınlar
+        reported = {item['file'] for item in report['files']}
+        for name in sorted(set(files) - reported - {MANIFEST_NAME}):
+            report['files'].append({'file': name, 'sheet': None, 'lawyerSicil': None, 'ok': False,
+                                    'message': f"Eşleme bulunamadı ({MANIFEST_NAME}'te yok)",
+                                    'details': [], 'errors': []})
+            report['totals']['files'] += 1
+            report['totals']['failed'] += 1
+        audit_report(report, actor=options['actor'], source=source)
+
+        for item in report['files']:
+            label = f"{item['file']} [{item['sheet']}]" if item['sheet'] else item['file']
+            line = f"{label} → {item['lawyerSicil'] or '-'}: {item['message']}"
+            if item['ok']:
+                counts = item.get('counts', {})
+                self.stdout.write(self.style.SUCCESS(
+                    f"{line} ({item.get('rowCount', 0)} satır, +{counts.get('added', 0)} "
+                    f"-{counts.get('removed', 0)} ~{counts.get('changed', 0)})"))
+            else:
+                self.stdout.write(self.style.ERROR(line))
+                for detail in item['details'][:5]:
+                    self.stdout.write(f"    {detail}")
+                if item['errors']:
+                    self.stdout.write(f"    {len(item['errors'])} satır hatası")
+
+        totals = report['totals']
+        self.stdout.write(
+            f"Toplam: {totals['succeeded']}/{totals['files']} liste içe aktarıldı "
+            f"({totals['failed']} başarısız, {totals['unchanged']} değişmemiş, {totals['rows']} satır)")
+        return report
+
+    def _watch(self, options):
+        if len(options['paths']) != 1 or not Path(options['paths'][0]).is_dir():
+            raise CommandError('--watch için tek bir dizin verin')
+        drop = Path(options['paths'][0])
+        if options['mapping']:
+            # Hatalı eşleme dosyası her turda tüm dosyaları başarısız sayardı; baştan reddedilir
+            try:
+                plan_tasks({MANIFEST_NAME: Path(options['mapping'])}, missing_ok=True)
+            except ValidationError as ve:
+                raise CommandError(_error_text(ve))
+        self.stdout.write(self.style.SUCCESS(f'{drop} izleniyor (Ctrl+C ile çıkılır).'))
+
+        # Boyutu/zamanı iki tur boyunca değişmeyen dosya kopyalanmasını bitirmiş sayılır
+        seen = {}
+        try:
+            while True:
+                current = {
+                    p.name: (p, p.stat().st_size, p.stat().st_mtime_ns)
+                    for p in drop.iterdir()
+                    if p.is_file() and not p.name.startswith('.') and p.name != MANIFEST_NAME
+                    and p.suffix.lower() in ALLOWED_EXTENSIONS
+                }
+                ready = {name: path for name, (path, size, mtime) in current.items()
+                         if seen.get(name) == (size, mtime)}
+                seen = {name: (size, mtime) for name, (_, size, mtime) in current.items()}
+
+                if ready:
+                    files = dict(ready)
+                    manifest = drop / MANIFEST_NAME
+                    if manifest.is_file() and not options['mapping']:
+                        files[MANIFEST_NAME] = manifest
+                    try:
+                        report = self._run(files, options, source=str(drop), missing_ok=True)
+                    except Exception as e:
+                        # Bozuk manifest veya beklenmeyen hata izlemeyi durdurmaz; dosyalar failed/'a
+                        report = self._failed_report(ready, e, options, source=str(drop))
+                        if isinstance(e, ValidationError) and MANIFEST_NAME in files:
+                            ready = {**ready, MANIFEST_NAME: files[MANIFEST_NAME]}
+                    self._archive(drop, ready, report)
+                    for name in ready:
+                        seen.pop(name, None)
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write('İzleme durdu.')
+
+    def _failed_report(self, ready, error, options, source):
+        """Tur tamamen başarısız olduğunda her dosya için hata satırı yazar ve AuditLog'a işler."""
+        if isinstance(error, ValidationError):
+            message, details = error.message, error.details
+        else:
+            message, details = f"Beklenmeyen hata: {error}", []
+        self.stderr.write(self.style.ERROR(f"{', '.join(sorted(ready))}: {message}"))
+        for detail in details[:5]:
+            self.stderr.write(f"    {detail}")
+
+        items = [{'file': name, 'sheet': None, 'lawyerSicil': None, 'ok': False,
+                  'message': message, 'details': details, 'errors': []} for name in sorted(ready)]
+        report = {'files': items}
+        audit_report(report, actor=options['actor'], source=source)
+        return report
+
+    def _archive(self, drop, ready, report):
+        """İşlenen dosyaları processed/<zaman>/ veya failed/<zaman>/ altına taşır (tekrar işlenmesin)."""
+        results = {}
+        for item in report['files']:
+            results[item['file']] = results.get(item['file'], True) and item['ok']
+
+        stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+        for name, path in ready.items():
+            target = drop / (PROCESSED_DIR if results.get(name) else FAILED_DIR) / stamp
+            target.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(path), str(target / name))
+
+
+def _error_text(ve: ValidationError) -> str:
+    return '; '.join([ve.message] + ve.details)
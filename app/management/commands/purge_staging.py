@@ -0,0 +1,50 @@
+# app/management/commands/purge_staging.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.services.retention_service import purge_staging
+from app.services.upload_session_service import purge_expired_sessions
+
+
+def _mb(value) -> str:
+    return '-' if value is None else f'{value / (1024 * 1024):.1f} MB'
+
+
+class Command(BaseCommand):
+    help = ("Uygulanmış/reddedilmiş ve saklama süresi dolmuş batch'lerin staging satırlarını siler "
+            "(batch başlıkları ve sayıları korunur)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help=f'Saklama süresi, gün (varsayılan: STAGING_RETENTION_DAYS={settings.STAGING_RETENTION_DAYS})')
+        parser.add_argument('--chunk', type=int, default=5000,
+                            help='Her DELETE ifadesinde silinecek en fazla satır')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Silmeden yalnızca silinecek batch/satır sayısını göster')
+        parser.add_argument('--vacuum', action='store_true',
+                            help='Bitince VACUUM (ANALYZE) çalıştır (PostgreSQL)')
+
+    def handle(self, *args, **options):
+        def on_batch(batch, deleted):
+            self.stdout.write(f'Batch {batch.id} ({batch.original_filename}): {deleted} satır silindi')
+
+        report = purge_staging(days=options['days'], chunk_rows=options['chunk'],
+                               dry_run=options['dry_run'], vacuum=options['vacuum'],
+                               progress=None if options['dry_run'] else on_batch)
+
+        if report['dryRun']:
+            self.stdout.write(self.style.WARNING(
+                f"[dry-run] {report['batches']} batch, {report['rows']} staging satırı silinecek."))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['batches']} batch, {report['rows']} staging satırı silindi; "
+            f"{report['diffs']} diff içeriği boşaltıldı."))
+        self.stdout.write(f"Silinen satırların boyutu: {_mb(report['bytes'])}")
+        self.stdout.write(f"Tablo boyutu: {_mb(report['tableBytesBefore'])} → {_mb(report['tableBytesAfter'])}")
+        if report['bytes'] and not options['vacuum']:
+            self.stdout.write('Not: alan VACUUM sonrası yeniden kullanılabilir olur (--vacuum).')
+
+        sessions = purge_expired_sessions()
+        if sessions:
+            self.stdout.write(f"{sessions} süresi dolmuş parçalı yükleme oturumu silindi.")
@@ -0,0 +1,41 @@
+# app/management/commands/run_import_worker.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.models import ImportJob
+from app.services.job_service import claim_next_job, fail_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Kuyruktaki liste içe aktarma işlerini (ImportJob) arka planda çalıştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Kuyrukta bekleyen işleri bitirip çık')
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help='Kuyruk boşken bekleme süresi (saniye)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Import worker başladı.'))
+        stale = fail_stale_jobs()
+        if stale:
+            self.stdout.write(self.style.WARNING(f'{stale} yarım kalmış iş başarısız sayıldı.'))
+        try:
+            while True:
+                job = claim_next_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+
+                self.stdout.write(f'Job {job.id} başladı: {job.original_filename}')
+                run_job(job)
+                if job.status == ImportJob.DONE:
+                    self.stdout.write(self.style.SUCCESS(f'Job {job.id} tamamlandı: {job.message}'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'Job {job.id} başarısız: {job.message}'))
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write('Import worker durdu.')
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.2 on 2026-10-17 03:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_election_electionvote'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_filename', models.CharField(max_length=512)),
+                ('file_path', models.CharField(max_length=1024)),
+                ('status', models.CharField(choices=[('QUEUED', 'QUEUED'), ('RUNNING', 'RUNNING'), ('DONE', 'DONE'), ('FAILED', 'FAILED')], default='QUEUED', max_length=16)),
+                ('stage', models.CharField(default='queued', max_length=32)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('message', models.TextField(blank=True, null=True)),
+                ('details', models.JSONField(blank=True, default=list)),
+                ('result_json', models.JSONField(blank=True, null=True)),
+                ('error_report', models.CharField(blank=True, max_length=64, null=True)),
+                ('created_by', models.CharField(blank=True, max_length=128, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('batch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='app.uploadbatch')),
+                ('lawyer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.lawyer')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='app_importj_status_4c6ac5_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.2 on 2026-10-17 03:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='kind',
+            field=models.CharField(choices=[('single', 'single'), ('zip', 'zip')], default='single', max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='lawyer',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='app.lawyer'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-17 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_importjob_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='file_sha256',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='uploadbatch',
+            index=models.Index(fields=['lawyer', 'status'], name='app_uploadb_lawyer__faba3f_idx'),
+        ),
+    ]
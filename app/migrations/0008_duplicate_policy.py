@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-17 04:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_uploadbatch_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='duplicate_policy',
+            field=models.CharField(default='last', max_length=8),
+        ),
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='duplicates',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-17 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_duplicate_policy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='purged_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
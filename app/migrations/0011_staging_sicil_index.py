@@ -0,0 +1,17 @@
+# Generated by Django 5.1.2 on 2026-10-17 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='uploadrowstaging',
+            index=models.Index(fields=['batch', 'kisi_sicilno'], name='app_uploadr_batch_i_86c32d_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-17 04:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0011_staging_sicil_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='batchdiff',
+            name='computed_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='batchdiff',
+            name='version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-17 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0012_batchdiff_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lawyerperson',
+            name='row_hash',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadrowstaging',
+            name='row_hash',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-17 05:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0013_row_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchDiffRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=8)),
+                ('kisi_sicilno', models.CharField(max_length=64)),
+                ('data', models.JSONField()),
+                ('diff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='app.batchdiff')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['diff', 'section', 'kisi_sicilno'], name='app_batchdi_diff_id_3ed8da_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-17 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0014_batch_diff_rows'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='review',
+            field=models.BooleanField(default=False),
+        ),
+    ]
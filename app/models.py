@@ -2,6 +2,8 @@ from django.utils import timezone
 
 from django.db import models
 
+from app.utils.normalization import ROW_HASH_FIELDS, row_hash
+
 
 class Lawyer(models.Model):
     sicil_no = models.CharField(max_length=64, unique=True)
@@ -63,6 +65,10 @@ class LawyerPerson(models.Model):
     notlar = models.TextField(blank=True, null=True)
     cevap_status = models.ForeignKey(StatusOption, on_delete=models.SET_NULL, null=True, blank=True)
 
+    # Alanların içerik özeti (bkz. normalization.row_hash); save'de güncellenir.
+    # bulk_create/bulk_update save çağırmadığından orada açıkça verilmelidir.
+    row_hash = models.BigIntegerField(null=True, blank=True, editable=False)
+
     # Metadata
     active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -78,6 +84,13 @@ class LawyerPerson(models.Model):
     def __str__(self):
         return f"{self.lawyer.sicil_no} - {self.kisi_sicilno} - {self.ad} {self.soyad}"
 
+    def save(self, *args, **kwargs):
+        self.row_hash = row_hash(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(ROW_HASH_FIELDS):
+            kwargs['update_fields'] = {*update_fields, 'row_hash'}
+        super().save(*args, **kwargs)
+
 
 class UploadBatch(models.Model):
     STAGED = 'STAGED'
@@ -93,6 +106,25 @@ class UploadBatch(models.Model):
     created_by = models.CharField(max_length=128, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Parmak izleri: yüklenen dosyanın ham SHA-256'sı ve staging satırlarının
+    # sıradan bağımsız içerik özeti. Son uygulanan batch ile eşleşen yükleme
+    # diff/apply yapılmadan "değişiklik yok" olarak sonlandırılır.
+    file_sha256 = models.CharField(max_length=64, blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, null=True)
+
+    # Dosya içi tekrar eden sicil numaraları ve uygulanan çözüm (tekrar yoksa boş):
+    # {'policy', 'removedRows', 'groups': [{'sicilno', 'rows': [dosya satırları], 'keptRow'}]}
+    duplicates = models.JSONField(null=True, blank=True)
+
+    # Staging satırları saklama süresi dolduğu için silindiyse silinme zamanı
+    # (bkz. retention_service); başlık ve sayılar korunur.
+    purged_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['lawyer', 'status']),
+        ]
+
 
 class UploadRow(models.Model):
     """
@@ -137,14 +169,148 @@ class UploadRowStaging(models.Model):
     adres_aciklama = models.TextField(blank=True, null=True)
     notlar = models.TextField(blank=True, null=True)
     cevap_status_key = models.CharField(max_length=64, blank=True, null=True)
+    # Alanların içerik özeti (bkz. normalization.row_hash); staging'e yazılırken hesaplanır
+    row_hash = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # diff (LawyerPerson ile eşleme / anti-join) ve dosya içi tekrar kontrolü
+            models.Index(fields=['batch', 'kisi_sicilno']),
+        ]
 
 
 class BatchDiff(models.Model):
+    """
+    Batch staging'e alındığında hesaplanan diff (bkz. diff_service.store_diff / get_diff).
+    version: hesaplandığı andaki avukat listesinin sürüm damgası (diff_service.list_version);
+    liste o zamandan beri değiştiyse kayıt geçersizdir ve diff yeniden hesaplanır.
+    """
     batch = models.ForeignKey(UploadBatch, on_delete=models.CASCADE)
     added_count = models.IntegerField(default=0)
     removed_count = models.IntegerField(default=0)
     changed_count = models.IntegerField(default=0)
     diff_json = models.JSONField()
+    version = models.CharField(max_length=64, blank=True, default='')
+    computed_at = models.DateTimeField(auto_now=True)
+
+
+class BatchDiffRow(models.Model):
+    """
+    BatchDiff'in satırları; bölümler (added / removed / changed) diff_json'u yüklemeden
+    sayfa sayfa okunur (bkz. diff_service.diff_page). store_diff ile birlikte yeniden yazılır.
+    """
+    diff = models.ForeignKey(BatchDiff, on_delete=models.CASCADE, related_name='rows')
+    section = models.CharField(max_length=8)
+    kisi_sicilno = models.CharField(max_length=64)
+    data = models.JSONField()
+
+    class Meta:
+        indexes = [
+            # sayfalama: (diff, bölüm) içinde sicil no sırasıyla imleçten sonrası
+            models.Index(fields=['diff', 'section', 'kisi_sicilno']),
+        ]
+
+
+class ImportJob(models.Model):
+    """
+    Arka planda çalışan liste içe aktarma işi.
+    Yükleme isteği dosyayı diske yazıp işi kuyruğa alır; run_import_worker komutu
+    işleri sırayla alıp staging → diff → apply adımlarını çalıştırır. İnceleme modunda (review)
+    apply atlanır; batch STAGED kalır ve önizlemeden tamamen veya seçilerek onaylanır.
+    UI ve API, stage/progress alanlarını okuyarak ilerlemeyi takip eder.
+    """
+    QUEUED = 'QUEUED'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [(QUEUED, QUEUED), (RUNNING, RUNNING), (DONE, DONE), (FAILED, FAILED)]
+
+    STAGE_QUEUED = 'queued'
+    STAGE_STAGING = 'staging'
+    STAGE_DIFFING = 'diffing'
+    STAGE_APPLYING = 'applying'
+    STAGE_DONE = 'done'
+    STAGE_FAILED = 'failed'
+
+    # Tek avukat dosyası veya çok avukatlı ZIP arşivi
+    KIND_SINGLE = 'single'
+    KIND_ZIP = 'zip'
+    KIND_CHOICES = [(KIND_SINGLE, KIND_SINGLE), (KIND_ZIP, KIND_ZIP)]
+
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES, default=KIND_SINGLE)
+    # Dosya içi tekrar eden sicil numaraları için çözüm (bkz. importer.DUPLICATE_POLICIES)
+    duplicate_policy = models.CharField(max_length=8, default='last')
+    # Diff hesaplandıktan sonra otomatik uygulama yerine onay beklenir (yalnızca tek avukat işleri)
+    review = models.BooleanField(default=False)
+    lawyer = models.ForeignKey(Lawyer, on_delete=models.CASCADE, null=True, blank=True)  # ZIP işlerinde boş
+    batch = models.ForeignKey(UploadBatch, on_delete=models.SET_NULL, null=True, blank=True)
+    original_filename = models.CharField(max_length=512)
+    file_path = models.CharField(max_length=1024)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    stage = models.CharField(max_length=32, default=STAGE_QUEUED)
+    progress = models.PositiveSmallIntegerField(default=0)
+
+    # Sonuç / hata bilgileri
+    message = models.TextField(blank=True, null=True)
+    details = models.JSONField(default=list, blank=True)
+    result_json = models.JSONField(null=True, blank=True)
+    error_report = models.CharField(max_length=64, blank=True, null=True)
+
+    created_by = models.CharField(max_length=128, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} - {self.original_filename} ({self.status})"
+
+
+class UploadSession(models.Model):
+    """
+    Parçalı (chunked) ve kaldığı yerden devam edebilen yükleme oturumu.
+    İstemci oturumu açar, dosyayı numaralı parçalar halinde (her biri SHA-256 ile) gönderir
+    ve sonlandırır; parçalar diskteki tek dosyaya kendi konumlarına yazılır.
+    Sonlandırılan dosya normal yüklemeler gibi ImportJob olarak kuyruğa alınır.
+    """
+    OPEN = 'OPEN'
+    COMPLETE = 'COMPLETE'
+    STATUS_CHOICES = [(OPEN, OPEN), (COMPLETE, COMPLETE)]
+
+    token = models.CharField(max_length=32, unique=True)
+    original_filename = models.CharField(max_length=512)
+    size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    # Tüm dosyanın beklenen SHA-256'sı (opsiyonel; verilirse sonlandırmada doğrulanır)
+    sha256 = models.CharField(max_length=64, blank=True, null=True)
+    file_path = models.CharField(max_length=1024)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=OPEN)
+    job = models.ForeignKey(ImportJob, on_delete=models.SET_NULL, null=True, blank=True)
+    created_by = models.CharField(max_length=128, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def total_chunks(self) -> int:
+        return -(-self.size // self.chunk_size)
+
+    def __str__(self):
+        return f"Upload {self.token} - {self.original_filename} ({self.status})"
+
+
+class UploadChunk(models.Model):
+    """Oturumda alınmış ve SHA-256'sı doğrulanmış parça."""
+    session = models.ForeignKey(UploadSession, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+
+    class Meta:
+        unique_together = ('session', 'index')
 
 
 class AuditLog(models.Model):
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Lawyer, StatusOption, Person
-from .models import UploadBatch, UploadRowStaging, BatchDiff
+from .models import UploadBatch, UploadRowStaging, BatchDiff, ImportJob
+from django.urls import reverse
 
 
 class LawyerSerializer(serializers.ModelSerializer):
@@ -28,7 +29,27 @@ class UploadBatchSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = UploadBatch
-        fields = ["id", "lawyerId", "original_filename", "file_path", "row_count", "status", "created_by", "created_at"]
+        fields = ["id", "lawyerId", "original_filename", "file_path", "row_count", "status", "created_by", "created_at",
+                  "duplicates"]
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    lawyerId = serializers.IntegerField(source='lawyer_id', allow_null=True)
+    batchId = serializers.IntegerField(source='batch_id', allow_null=True)
+    result = serializers.JSONField(source='result_json')
+    duplicatePolicy = serializers.CharField(source='duplicate_policy')
+    statusUrl = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = ["id", "kind", "duplicatePolicy", "review", "lawyerId", "batchId", "original_filename", "status", "stage", "progress",
+                  "message", "details", "result", "statusUrl", "created_by", "created_at",
+                  "started_at", "finished_at"]
+
+    def get_statusUrl(self, obj):
+        url = reverse('import-jobs-detail', args=[obj.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 
 class DiffResponseSerializer(serializers.Serializer):
@@ -1,109 +1,164 @@
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Set
+import pandas as pd
 from django.db import transaction
-from django.db.models import Q
+from django.utils import timezone
 
 from app.models import (
-    UploadBatch, UploadRowStaging, LawyerPerson, Person, StatusOption, BatchDiff, AuditLog
+    UploadBatch, LawyerPerson, Person, StatusOption, AuditLog
 )
+from app.services.bulk_loader import update_rows
+from app.services.diff_service import get_diff
+from app.utils.normalization import row_hash_series
+
+# Tek sorguda okunan / yazılan en fazla satır (IN listeleri ve bulk_create/bulk_update)
+APPLY_CHUNK_ROWS = 2000
+
+# Diff satırından LawyerPerson'a birebir kopyalanan alanlar
+_COPY_FIELDS = ['ad', 'soyad', 'telno', 'mail', 'ilce', 'adres_aciklama', 'notlar']
+_UPDATE_FIELDS = _COPY_FIELDS + ['person', 'cevap_status', 'active', 'row_hash', 'updated_at']
+
+
+def _chunks(items: List, size: int = APPLY_CHUNK_ROWS) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _person_ids(rows: List[Dict]) -> Dict[str, int]:
+    """
+    Satırların sicil no → Person id eşlemesi. Olmayan Person'lar tek bulk_create ile oluşturulur
+    (sadece sicilno referansı). Aynı sicil için birden fazla Person varsa en eskisi kullanılır.
+    """
+    sicils = list({row['kisi_sicilno'] for row in rows})
+    ids: Dict[str, int] = {}
+    for part in _chunks(sicils):
+        for ks, pid in Person.objects.filter(kisi_sicilno__in=part).order_by('-id').values_list('kisi_sicilno', 'id'):
+            ids[ks] = pid
+
+    missing = [row for row in {row['kisi_sicilno']: row for row in rows}.values() if row['kisi_sicilno'] not in ids]
+    if missing:
+        # kisi_sicilno unique olmadığından ignore_conflicts çakışma yakalamaz; id'ler geri okunur
+        Person.objects.bulk_create(
+            [Person(kisi_sicilno=row['kisi_sicilno'], ad=row.get('ad', ''), soyad=row.get('soyad', ''))
+             for row in missing],
+            batch_size=APPLY_CHUNK_ROWS,
+        )
+        for part in _chunks([row['kisi_sicilno'] for row in missing]):
+            for ks, pid in Person.objects.filter(kisi_sicilno__in=part).order_by('-id').values_list('kisi_sicilno', 'id'):
+                ids[ks] = pid
+    return ids
+
+
+def upsert_rows(lawyer_id: int, rows: List[Dict]) -> int:
+    """
+    Diff satırlarını (eklenen satırlar ve değişenlerin 'after'ı) avukatın LawyerPerson
+    kayıtlarına yazar. Status'ler tek sorguda çözülür; mevcut kayıtlar (pasif olanlar dahil)
+    parça başına bir SELECT ile bulunup toplu UPDATE (bulk_loader.update_rows), olmayanlar
+    bulk_create ile yazılır. save() çağrılmadığından row_hash ve updated_at (list_version)
+    burada verilir.
+
+    :return: yazılan satır sayısı
+    """
+    if not rows:
+        return 0
+    statuses = dict(StatusOption.objects.values_list('key', 'id'))
+    person_ids = _person_ids(rows)
+    now = timezone.now()
+
+    for part in _chunks(rows):
+        hashes = row_hash_series(pd.DataFrame([{f: row.get(f) for f in _COPY_FIELDS} for row in part],
+                                              dtype=object)).tolist()
+        existing = dict(LawyerPerson.objects.filter(
+            lawyer_id=lawyer_id, kisi_sicilno__in=[row['kisi_sicilno'] for row in part],
+        ).values_list('kisi_sicilno', 'id'))
+
+        to_create, to_update = [], []
+        for row, row_hash in zip(part, hashes):
+            ks = row['kisi_sicilno']
+            values = {
+                'ad': row.get('ad', ''),
+                'soyad': row.get('soyad', ''),
+                'telno': row.get('telno'),
+                'mail': row.get('mail'),
+                'ilce': row.get('ilce'),
+                'adres_aciklama': row.get('adres_aciklama'),
+                'notlar': row.get('notlar'),
+                'person': person_ids[ks],
+                'cevap_status': statuses.get(row.get('cevap_status_key')),
+                'active': True,
+                'row_hash': row_hash,
+                'updated_at': now,
+            }
+            if ks in existing:
+                to_update.append((existing[ks], *[values[f] for f in _UPDATE_FIELDS]))
+            else:
+                values['person_id'] = values.pop('person')
+                values['cevap_status_id'] = values.pop('cevap_status')
+                to_create.append(LawyerPerson(lawyer_id=lawyer_id, kisi_sicilno=ks, **values))
+
+        LawyerPerson.objects.bulk_create(to_create, batch_size=APPLY_CHUNK_ROWS)
+        update_rows(LawyerPerson, _UPDATE_FIELDS, to_update)
+    return len(rows)
+
+
+def remove_rows(lawyer_id: int, sicils: List[str]) -> int:
+    """Avukatın verilen sicil numaralı kayıtlarını parça başına tek DELETE ile siler (hard delete)."""
+    deleted = 0
+    for part in _chunks(sicils):
+        deleted += LawyerPerson.objects.filter(lawyer_id=lawyer_id, kisi_sicilno__in=part).delete()[1].get(
+            LawyerPerson._meta.label, 0)
+    return deleted
 
 
 @transaction.atomic
-def apply_diff(batch_id: int, actor: str = None) -> Dict:
+def apply_diff(batch_id: int, actor: str = None, diff: Dict = None,
+               selected: Optional[Dict[str, Set[str]]] = None) -> Dict:
+    """
+    Batch'in diff'ini avukatın listesine uygular ve batch'i APPLIED yapar.
+
+    :param selected: kısmi onay; {'added': {...}, 'removed': {...}, 'changed': {...}} sicil no
+                     kümeleri. Verilirse yalnızca bu satırlar uygulanır, diğerleri atlanır ve
+                     batch'in dosya parmak izleri silinir.
+    :return: {"ok", "message", "counts"} (kısmi onayda counts uygulanan satır sayılarıdır)
+    """
     batch = UploadBatch.objects.select_for_update().select_related('lawyer').get(id=batch_id)
     if batch.status != UploadBatch.STAGED:
         return {"ok": False, "message": "Batch zaten uygulanmış veya reddedilmiş."}
 
-    # diff’i hazırla (mevcut varsa kullan; yoksa hesaplanmış varsay)
-    diff_obj = BatchDiff.objects.filter(batch_id=batch_id).first()
-    diff = diff_obj.diff_json if diff_obj else None
-    if not diff:
-        # güvenlik için yeniden hesaplamak istenirse diff_service.compute_diff çağrılabilir
-        from app.services.diff_service import compute_diff
-        diff = compute_diff(batch_id)
+    # diff’i hazırla (parametre ile verilmediyse saklanan diff; liste değiştiyse yeniden hesaplanır)
+    if diff is None:
+        diff = get_diff(batch_id)
 
     added = diff.get('added', [])
     removed = diff.get('removed', [])
     changed = diff.get('changed', [])
+    counts = diff.get('counts', {})
+    if selected is not None:
+        added = [row for row in added if row['kisi_sicilno'] in selected.get('added', ())]
+        removed = [row for row in removed if row['kisi_sicilno'] in selected.get('removed', ())]
+        changed = [item for item in changed if item['kisi_sicilno'] in selected.get('changed', ())]
+        counts = {'added': len(added), 'removed': len(removed), 'changed': len(changed)}
 
-    # 1) ADDED → LawyerPerson'a ekle (her avukat için bağımsız)
-    for row in added:
-        ks = row['kisi_sicilno']
-
-        # Person referansı oluştur/al (sadece sicilno için)
-        p, _ = Person.objects.get_or_create(
-            kisi_sicilno=ks,
-            defaults={'ad': row.get('ad', ''), 'soyad': row.get('soyad', '')}
-        )
-
-        # Status objesini al
-        key = row.get('cevap_status_key')
-        status_obj = StatusOption.objects.filter(key=key).first() if key else None
+    # 1) ADDED + CHANGED → LawyerPerson'a toplu yaz (her avukat için bağımsız kopya)
+    upsert_rows(batch.lawyer_id, added + [item['after'] for item in changed])
 
-        # KRITIK: LawyerPerson'a yaz - bu avukat için bağımsız kopya
-        LawyerPerson.objects.update_or_create(
-            lawyer_id=batch.lawyer_id,
-            kisi_sicilno=ks,
-            defaults={
-                'person': p,
-                'ad': row.get('ad', ''),
-                'soyad': row.get('soyad', ''),
-                'telno': row.get('telno'),
-                'mail': row.get('mail'),
-                'ilce': row.get('ilce'),
-                'adres_aciklama': row.get('adres_aciklama'),
-                'notlar': row.get('notlar'),
-                'cevap_status': status_obj,
-                'active': True
-            }
-        )
-
-    # 2) REMOVED → Bu avukattan kaldır (hard delete veya soft delete)
-    for row in removed:
-        ks = row['kisi_sicilno']
-        LawyerPerson.objects.filter(
-            lawyer_id=batch.lawyer_id,
-            kisi_sicilno=ks
-        ).delete()
-
-    # 3) CHANGED → LawyerPerson alanlarını güncelle (sadece bu avukat için)
-    for item in changed:
-        ks = item['kisi_sicilno']
-        after = item['after']
-
-        # Person referansı
-        p, _ = Person.objects.get_or_create(
-            kisi_sicilno=ks,
-            defaults={'ad': after.get('ad', ''), 'soyad': after.get('soyad', '')}
-        )
-
-        # Status objesini al
-        key = after.get('cevap_status_key')
-        status_obj = StatusOption.objects.filter(key=key).first() if key else None
-
-        # KRITIK: Sadece bu avukatın LawyerPerson kaydını güncelle
-        LawyerPerson.objects.update_or_create(
-            lawyer_id=batch.lawyer_id,
-            kisi_sicilno=ks,
-            defaults={
-                'person': p,
-                'ad': after.get('ad', ''),
-                'soyad': after.get('soyad', ''),
-                'telno': after.get('telno'),
-                'mail': after.get('mail'),
-                'ilce': after.get('ilce'),
-                'adres_aciklama': after.get('adres_aciklama'),
-                'notlar': after.get('notlar'),
-                'cevap_status': status_obj,
-                'active': True
-            }
-        )
+    # 2) REMOVED → Bu avukattan kaldır (hard delete)
+    remove_rows(batch.lawyer_id, [row['kisi_sicilno'] for row in removed])
 
     # audit
+    after = {'status': UploadBatch.APPLIED}
+    if selected is not None:
+        after.update(partial=True, counts=counts)
     AuditLog.objects.create(
         entity='UploadBatch', entity_id=batch.id, action='APPLY',
-        before_json={'status': batch.status}, after_json={'status': UploadBatch.APPLIED}, actor=actor
+        before_json={'status': batch.status}, after_json=after, actor=actor
     )
     batch.status = UploadBatch.APPLIED
-    batch.save(update_fields=['status'])
-
-    return {"ok": True, "message": "Uygulandı", "counts": diff.get('counts', {})}
+    update_fields = ['status']
+    if selected is not None:
+        # Liste artık dosyanın tamamını yansıtmıyor: aynı dosya tekrar yüklendiğinde
+        # check_unchanged "Değişiklik yok" dememeli
+        batch.file_sha256 = batch.content_hash = None
+        update_fields += ['file_sha256', 'content_hash']
+    batch.save(update_fields=update_fields)
+
+    return {"ok": True, "message": "Uygulandı", "counts": counts}
@@ -0,0 +1,394 @@
+"""
+Çok avukatlı toplu içe aktarma (ZIP arşivi).
+
+Arşivdeki her CSV/XLSX/Parquet/Arrow dosyası (veya çalışma kitabı sayfası) bir avukata eşlenir:
+  1) manifest.csv varsa: dosya, avukat_sicil[, sayfa] kolonları
+  2) yoksa dosya adı: "<avukat_sicil>.csv" veya "<avukat_sicil>_herhangi.xlsx"
+  3) dosya adı eşleşmeyen çalışma kitaplarında sayfa adı = avukat sicil no
+
+Dosyalar prepare_file ile ayrı süreçlerde paralel okunur ve doğrulanır
+(veritabanına dokunmadan). Ardından her avukat için staging ve apply,
+parse_and_stage / apply_diff ile aynı semantikle sırayla çalıştırılır.
+Sonuç tek bir konsolide rapordur.
+
+Aynı akış yerel dosyalar için de kullanılır (collect_files + import_files;
+bkz. import_lists komutu).
+"""
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Callable, Tuple
+
+import django
+import pandas as pd
+from django.conf import settings
+from django.db import connections
+
+from app.models import AuditLog, Lawyer
+from app.services.importer import (
+    prepare_file, stage_prepared, check_unchanged, file_sha256, UnchangedUpload,
+    duplicate_report_rows, duplicate_summary,
+)
+from app.services.diff_service import store_diff
+from app.services.apply_service import apply_diff
+from app.utils.file_validators import ValidationError
+
+ALLOWED_EXTENSIONS = {'.csv', '.txt', '.xlsx', '.xlsm', '.xltx', '.xltm',
+                      '.parquet', '.pq', '.arrow', '.feather', '.ipc', '.arrows'}
+WORKBOOK_EXTENSIONS = {'.xlsx', '.xlsm', '.xltx', '.xltm'}
+MANIFEST_NAME = 'manifest.csv'
+
+
+def extract_archive(zip_path: str, dest_dir: str) -> Dict[str, Path]:
+    """
+    ZIP içindeki desteklenen dosyaları dest_dir altına düz (klasörsüz) çıkarır.
+    Yol bileşenleri atılır, __MACOSX ve gizli dosyalar atlanır.
+
+    :return: {dosya adı: çıkarılan yol}
+    :raises ValidationError: arşiv okunamazsa, boşsa veya dosya boyutu limiti aşılırsa
+    """
+    try:
+        zf = zipfile.ZipFile(zip_path)
+    except (zipfile.BadZipFile, OSError) as e:
+        raise ValidationError(f"ZIP arşivi okunamadı: {str(e)}")
+
+    files = {}
+    duplicates = []
+    with zf:
+        for info in zf.infolist():
+            if info.is_dir() or info.filename.startswith('__MACOSX/'):
+                continue
+            name = os.path.basename(info.filename)
+            if not name or name.startswith('.'):
+                continue
+            if Path(name).suffix.lower() not in ALLOWED_EXTENSIONS:
+                continue
+            if info.file_size > settings.UPLOAD_MAX_BYTES:
+                raise ValidationError(
+                    f"Arşivdeki dosya çok büyük: {name}",
+                    [f"Maksimum dosya boyutu: {settings.UPLOAD_MAX_BYTES // (1024 * 1024)}MB"]
+                )
+            if name in files:
+                duplicates.append(name)
+                continue
+
+            target = Path(dest_dir) / name
+            with zf.open(info) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            files[name] = target
+
+    if duplicates:
+        raise ValidationError(
+            "Arşivde aynı isimli birden fazla dosya var",
+            [f"Tekrarlanan dosya: {name}" for name in duplicates]
+        )
+    if not files:
+        raise ValidationError(
+            "Arşivde içe aktarılabilir dosya bulunamadı",
+            ["Desteklenen formatlar: " + ", ".join(sorted(ALLOWED_EXTENSIONS))]
+        )
+    return files
+
+
+def collect_files(paths: List[str]) -> Dict[str, Path]:
+    """
+    Yerel dosya ve dizinlerden içe aktarılacak dosyaları toplar (dizinler alt klasörsüz
+    taranır, gizli dosyalar atlanır). manifest.csv varsa eşleme için eklenir.
+
+    :return: {dosya adı: yol}
+    :raises ValidationError: yol bulunamazsa, aynı isimli dosya varsa veya dosya yoksa
+    """
+    files = {}
+    duplicates = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            candidates = sorted(p for p in path.iterdir() if p.is_file())
+        elif path.is_file():
+            candidates = [path]
+        else:
+            raise ValidationError(f"Dosya veya dizin bulunamadı: {raw}")
+
+        for candidate in candidates:
+            name = candidate.name
+            if name.startswith('.'):
+                continue
+            if name != MANIFEST_NAME and candidate.suffix.lower() not in ALLOWED_EXTENSIONS:
+                continue
+            if name in files:
+                duplicates.append(name)
+                continue
+            files[name] = candidate
+
+    if duplicates:
+        raise ValidationError(
+            "Aynı isimli birden fazla dosya var",
+            [f"Tekrarlanan dosya: {name}" for name in duplicates]
+        )
+    if not set(files) - {MANIFEST_NAME}:
+        raise ValidationError(
+            "İçe aktarılabilir dosya bulunamadı",
+            ["Desteklenen formatlar: " + ", ".join(sorted(ALLOWED_EXTENSIONS))]
+        )
+    return files
+
+
+def _read_manifest(path: Path) -> List[Dict]:
+    """manifest.csv → [{'file', 'sicil', 'sheet'}]"""
+    try:
+        df = pd.read_csv(path, dtype=str).fillna('')
+    except Exception as e:
+        raise ValidationError(f"manifest.csv okunamadı: {str(e)}")
+
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    missing = [c for c in ('dosya', 'avukat_sicil') if c not in df.columns]
+    if missing:
+        raise ValidationError(
+            "manifest.csv gerekli sütunları içermiyor",
+            [f"Eksik sütunlar: {', '.join(missing)}"]
+        )
+
+    has_sheet = 'sayfa' in df.columns
+    return [
+        {'file': row['dosya'].strip(), 'sicil': row['avukat_sicil'].strip(),
+         'sheet': (row['sayfa'].strip() or None) if has_sheet else None}
+        for _, row in df.iterrows()
+        if row['dosya'].strip()
+    ]
+
+
+def _sheet_names(path: Path) -> List[str]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def _name_candidates(filename: str) -> List[str]:
+    stem = Path(filename).stem.strip()
+    candidates = [stem]
+    if '_' in stem:
+        candidates.append(stem.split('_', 1)[0].strip())
+    return candidates
+
+
+def plan_tasks(files: Dict[str, Path], missing_ok: bool = False) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Çıkarılan dosyaları avukatlara eşler.
+
+    :param missing_ok: manifest'te olup dosyası henüz gelmemiş satırlar hata sayılmaz
+                       (bırakma klasörü izlenirken manifest tüm avukatları listeler)
+    :return: (görevler, eşlenemeyen dosyalar için rapor satırları)
+             görev: {'file', 'sheet', 'path', 'sicil', 'lawyer_id'}
+    """
+    manifest_path = files.pop(MANIFEST_NAME, None)
+
+    candidates = []  # (file, sheet, [aday sicil no'lar])
+    problems = []
+    if manifest_path is not None:
+        for entry in _read_manifest(manifest_path):
+            if entry['file'] not in files:
+                if missing_ok:
+                    continue
+                problems.append(_failed(entry['file'], entry['sheet'], entry['sicil'],
+                                        "Dosya arşivde bulunamadı"))
+                continue
+            candidates.append((entry['file'], entry['sheet'], [entry['sicil']]))
+    else:
+        for name, path in sorted(files.items()):
+            names = _name_candidates(name)
+            if Path(name).suffix.lower() in WORKBOOK_EXTENSIONS:
+                try:
+                    sheets = _sheet_names(path)
+                except Exception as e:
+                    problems.append(_failed(name, None, None, f"Dosya okunamadı: {str(e)}"))
+                    continue
+                if len(sheets) > 1:
+                    # Çok sayfalı kitap: her sayfa bir avukata ait
+                    candidates.extend((name, sheet, [sheet.strip()]) for sheet in sheets)
+                    continue
+            candidates.append((name, None, names))
+
+    # Avukatları tek sorguda çöz
+    all_sicils = {s for _, _, sicils in candidates for s in sicils}
+    lawyers = dict(Lawyer.objects.filter(sicil_no__in=all_sicils).values_list('sicil_no', 'id'))
+
+    tasks = []
+    for name, sheet, sicils in candidates:
+        sicil = next((s for s in sicils if s in lawyers), None)
+        if sicil is None:
+            problems.append(_failed(name, sheet, sicils[0], "Avukat bulunamadı"))
+            continue
+        tasks.append({'file': name, 'sheet': sheet, 'path': str(files[name]),
+                      'sicil': sicil, 'lawyer_id': lawyers[sicil]})
+
+    # Aynı avukata birden fazla liste gelirse hangisinin geçerli olduğu belirsiz; hepsini reddet
+    by_lawyer = {}
+    for task in tasks:
+        by_lawyer.setdefault(task['lawyer_id'], []).append(task)
+    unique = []
+    for group in by_lawyer.values():
+        if len(group) == 1:
+            unique.append(group[0])
+            continue
+        others = ", ".join(_label(t['file'], t['sheet']) for t in group)
+        for task in group:
+            problems.append(_failed(task['file'], task['sheet'], task['sicil'],
+                                    f"Aynı avukat için birden fazla liste var: {others}"))
+    return unique, problems
+
+
+def _label(filename: str, sheet: Optional[str]) -> str:
+    return f"{filename} [{sheet}]" if sheet else filename
+
+
+def _failed(filename: str, sheet: Optional[str], sicil: Optional[str], message: str,
+            details: List[str] = None, errors: List[Dict] = None) -> Dict:
+    return {'file': filename, 'sheet': sheet, 'lawyerSicil': sicil, 'ok': False,
+            'message': message, 'details': details or [], 'errors': errors or []}
+
+
+def _prepare_task(task: Dict) -> Dict:
+    """Süreç havuzunda çalışır: dosyayı okuyup staging'e hazırlar."""
+    return prepare_file(task['path'], task['sheet'], task['duplicate_policy'])
+
+
+def run_bulk_import(zip_path: str, created_by: str = None,
+                    progress: Optional[Callable[[int, int], None]] = None,
+                    max_workers: Optional[int] = None,
+                    duplicate_policy: Optional[str] = None) -> Dict:
+    """
+    ZIP arşivini içe aktarır ve konsolide rapor döndürür.
+
+    Dosyalar ProcessPoolExecutor ile paralel hazırlanır (okuma + doğrulama + normalize);
+    staging ve apply her avukat için ayrı transaction'da sırayla çalışır. Bir dosyanın
+    hatası diğerlerini etkilemez.
+
+    :param progress: progress(tamamlanan, toplam) — her dosya bittiğinde çağrılır
+    :param duplicate_policy: dosya içi tekrar eden sicil numaraları için çözüm (bkz. prepare_file)
+    :return: {'files': [dosya sonuçları], 'totals': {...}}
+    :raises ValidationError: arşiv düzeyindeki hatalarda (okunamayan ZIP, boş arşiv, manifest)
+    """
+    work_dir = tempfile.mkdtemp(prefix='bulk_import_')
+    try:
+        files = extract_archive(zip_path, work_dir)
+        return import_files(files, created_by=created_by, progress=progress,
+                            max_workers=max_workers, duplicate_policy=duplicate_policy)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def import_files(files: Dict[str, Path], created_by: str = None,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 max_workers: Optional[int] = None,
+                 duplicate_policy: Optional[str] = None,
+                 missing_ok: bool = False) -> Dict:
+    """
+    Diskteki dosyaları (extract_archive / collect_files çıktısı) avukatlara eşleyip içe aktarır.
+    Parametreler ve dönüş değeri run_bulk_import ile aynıdır; missing_ok için bkz. plan_tasks.
+    """
+    files = dict(files)
+    tasks, report = plan_tasks(files, missing_ok=missing_ok)
+    total = len(tasks) + len(report)
+    done = len(report)
+
+    # Ham dosyası son uygulanan liste ile aynı olanlar okunmadan atlanır
+    pending = []
+    for task in tasks:
+        try:
+            if task['sheet'] is None:
+                check_unchanged(task['lawyer_id'], file_hash=file_sha256(task['path']))
+        except UnchangedUpload as uu:
+            report.append(_unchanged(task, uu))
+            done += 1
+            continue
+        pending.append({**task, 'duplicate_policy': duplicate_policy})
+    tasks = pending
+    if progress:
+        progress(done, total)
+
+    if tasks:
+        # Çocuk süreçlere açık bağlantı devredilmesin
+        connections.close_all()
+        workers = min(max_workers or settings.IMPORT_WORKERS or os.cpu_count() or 1, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            futures = [(task, pool.submit(_prepare_task, task)) for task in tasks]
+            for task, future in futures:
+                report.append(_stage_and_apply(task, future, created_by))
+                done += 1
+                if progress:
+                    progress(done, total)
+
+    report.sort(key=lambda r: (r['file'], r['sheet'] or ''))
+    return {'files': report, 'totals': _totals(report)}
+
+
+def audit_report(report: Dict, actor: str = None, source: str = None):
+    """
+    Rapordaki her dosya sonucu için AuditLog kaydı yazar (action IMPORT / IMPORT_FAILED).
+    Batch oluşmayan sonuçlarda (eşleme hatası, değişmemiş liste) entity_id 0'dır.
+    """
+    AuditLog.objects.bulk_create([
+        AuditLog(
+            entity='UploadBatch', entity_id=item.get('batchId') or 0,
+            action='IMPORT' if item['ok'] else 'IMPORT_FAILED',
+            after_json={
+                'source': source, 'file': _label(item['file'], item['sheet']),
+                'lawyerSicil': item['lawyerSicil'], 'message': item['message'],
+                'rowCount': item.get('rowCount', 0), 'counts': item.get('counts', {}),
+                'unchanged': bool(item.get('unchanged')),
+            },
+            actor=actor,
+        )
+        for item in report['files']
+    ])
+
+
+def _stage_and_apply(task: Dict, future, created_by: str = None) -> Dict:
+    name, sheet, sicil = task['file'], task['sheet'], task['sicil']
+    try:
+        prepared = future.result()
+        batch_id, row_count = stage_prepared(
+            prepared, task['lawyer_id'], _label(name, sheet), created_by=created_by
+        )
+        diff = store_diff(batch_id)
+        result = apply_diff(batch_id, actor=created_by, diff=diff)
+    except UnchangedUpload as uu:
+        return _unchanged(task, uu)
+    except ValidationError as ve:
+        return _failed(name, sheet, sicil, ve.message, ve.details, ve.errors)
+    except Exception as e:
+        return _failed(name, sheet, sicil, f"Beklenmeyen hata: {e}")
+
+    return {'file': name, 'sheet': sheet, 'lawyerSicil': sicil,
+            'ok': bool(result.get('ok')), 'message': result.get('message'),
+            'details': [], 'errors': [], 'batchId': batch_id, 'rowCount': row_count,
+            'counts': result.get('counts', {}),
+            'duplicates': duplicate_summary(prepared['duplicates']),
+            'duplicateRows': duplicate_report_rows(prepared['duplicates'])}
+
+
+def _unchanged(task: Dict, uu: UnchangedUpload) -> Dict:
+    result = uu.as_result()
+    return {'file': task['file'], 'sheet': task['sheet'], 'lawyerSicil': task['sicil'],
+            'ok': True, 'message': result['message'], 'details': [], 'errors': [],
+            'batchId': None, 'rowCount': uu.row_count, 'counts': result['counts'],
+            'unchanged': True, 'matched': uu.matched, 'matchedBatchId': uu.batch_id}
+
+
+def _totals(report: List[Dict]) -> Dict:
+    totals = {'files': len(report), 'succeeded': 0, 'failed': 0, 'unchanged': 0,
+              'rows': 0, 'added': 0, 'removed': 0, 'changed': 0}
+    for item in report:
+        totals['succeeded' if item['ok'] else 'failed'] += 1
+        totals['unchanged'] += bool(item.get('unchanged'))
+        totals['rows'] += item.get('rowCount', 0)
+        for key in ('added', 'removed', 'changed'):
+            totals[key] += item.get('counts', {}).get(key, 0)
+    return totals
@@ -0,0 +1,141 @@
+"""
+Toplu yükleme yardımcıları.
+Satırları düz tuple'lar halinde tabloya yazar.
+
+PostgreSQL'de COPY ... FROM STDIN (model nesnesi oluşturulmaz), diğer veritabanlarında
+bulk_create kullanılır.
+Staging dışındaki toplu yazma yolları da bulk_load üzerinden aynı yükleyiciyi kullanabilir.
+Mevcut satırların toplu güncellemesi için update_rows (UPDATE ... FROM (VALUES ...)).
+"""
+import io
+import json
+from itertools import islice
+from typing import Iterable, Sequence, Iterator, List
+
+from django.db import connections, DEFAULT_DB_ALIAS
+
+
+def _batched(rows: Iterable[Sequence], size: int) -> Iterator[List[Sequence]]:
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_rows(model, fields: Sequence[str], rows: Iterable[Sequence],
+                batch_size: int = 1000, using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    rows içindeki tuple'ları QuerySet.bulk_create ile model tablosuna yazar (COPY olmayan
+    veritabanları). Değerler alanların kendi dönüşümünden geçer (datetime/saat dilimi,
+    JSONField vb.). fields: model alan adları (FK için 'batch' gibi alan adı verilir, değer id'dir).
+    Her tuple, fields ile aynı sırada değer içermelidir.
+
+    :return: yazılan satır sayısı
+    """
+    attnames = [model._meta.get_field(f).attname for f in fields]
+    manager = model.objects.using(using)
+    total = 0
+    for batch in _batched(rows, batch_size):
+        manager.bulk_create([model(**dict(zip(attnames, row))) for row in batch], batch_size=batch_size)
+        total += len(batch)
+    return total
+
+
+# COPY text formatında kaçış gerektiren karakterler
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_value(value) -> str:
+    if value is None or (isinstance(value, float) and value != value):  # None / NaN → NULL
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):  # JSONField
+        value = json.dumps(value, ensure_ascii=False)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def _copy_buffer(rows: Sequence[Sequence]) -> io.StringIO:
+    """Satırları COPY text formatında (tab ayrımlı, NULL = \\N) bellekteki bir tampona yazar."""
+    buf = io.StringIO()
+    buf.writelines('\t'.join(_copy_value(v) for v in row) + '\n' for row in rows)
+    buf.seek(0)
+    return buf
+
+
+def copy_rows(model, fields: Sequence[str], rows: Iterable[Sequence],
+              batch_size: int = 10000, using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    rows içindeki tuple'ları PostgreSQL COPY ... FROM STDIN ile model tablosuna yazar.
+    Her batch_size satır için bir bellek tamponu oluşturulur ve tek COPY ile gönderilir.
+
+    :return: yazılan satır sayısı
+    """
+    conn = connections[using]
+    opts = model._meta
+    table = conn.ops.quote_name(opts.db_table)
+    columns = ', '.join(conn.ops.quote_name(opts.get_field(f).column) for f in fields)
+    sql = f"COPY {table} ({columns}) FROM STDIN"
+
+    total = 0
+    with conn.cursor() as cursor:
+        for batch in _batched(rows, batch_size):
+            cursor.copy_expert(sql, _copy_buffer(batch))
+            total += len(batch)
+    return total
+
+
+def bulk_load(model, fields: Sequence[str], rows: Iterable[Sequence],
+              using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    Veritabanına göre en hızlı toplu yazma yolunu seçer:
+    PostgreSQL (psycopg2) → COPY, diğerleri → bulk_create (bkz. insert_rows).
+    Değerler model alanlarının Python değerleridir (JSONField için dict/list).
+
+    :return: yazılan satır sayısı
+    """
+    conn = connections[using]
+    # copy_expert psycopg2'ye özgüdür; psycopg 3 kullanılıyorsa bulk_create'e düşülür
+    if conn.vendor == 'postgresql' and conn.Database.__name__ == 'psycopg2':
+        return copy_rows(model, fields, rows, using=using)
+    return insert_rows(model, fields, rows, using=using)
+
+
+def update_rows(model, fields: Sequence[str], rows: Iterable[Sequence],
+                batch_size: int = 1000, using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    rows içindeki (pk, değer1, değer2, ...) tuple'larıyla mevcut satırların fields kolonlarını
+    günceller. Her batch tek bir UPDATE ... FROM (VALUES ...) ifadesidir (PostgreSQL, SQLite 3.33+);
+    QuerySet.bulk_update'in satır × alan CASE ifadeleri kurulmaz. save() ve auto_now çalışmaz.
+
+    :return: gönderilen satır sayısı
+    """
+    conn = connections[using]
+    opts = model._meta
+    qn = conn.ops.quote_name
+    field_objs = [opts.pk] + [opts.get_field(f) for f in fields]
+    aliases = [f"c{i}" for i in range(len(field_objs))]
+
+    def value(field, alias):
+        # PostgreSQL'de VALUES kolonlarının tipi (ör. tamamı NULL → text) kolona açıkça çevrilir.
+        # SQLite'ta CAST tip yakınlığını (ör. datetime → NUMERIC) bozacağından yapılmaz.
+        if conn.vendor == 'postgresql':
+            return f"CAST(v.{alias} AS {field.cast_db_type(conn)})"
+        return f"v.{alias}"
+
+    table = qn(opts.db_table)
+    assignments = ', '.join(f"{qn(f.column)} = {value(f, a)}" for f, a in zip(field_objs[1:], aliases[1:]))
+    match = f"{table}.{qn(opts.pk.column)} = {value(opts.pk, aliases[0])}"
+    placeholder = '(' + ', '.join(['%s'] * len(field_objs)) + ')'
+    batch_size = max(1, min(batch_size, conn.ops.bulk_batch_size(field_objs, range(batch_size))))
+
+    total = 0
+    with conn.cursor() as cursor:
+        for batch in _batched(rows, batch_size):
+            sql = (f"WITH v ({', '.join(aliases)}) AS (VALUES {', '.join([placeholder] * len(batch))}) "
+                   f"UPDATE {table} SET {assignments} FROM v WHERE {match}")
+            cursor.execute(sql, [f.get_db_prep_save(v, conn) for row in batch for f, v in zip(field_objs, row)])
+            total += len(batch)
+    return total
@@ -1,13 +1,25 @@
 # app/services/diff_service.py
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple
-from django.db.models import Prefetch
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
+import pandas as pd
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Max, Prefetch, Subquery
+
+from app.utils.normalization import ROW_HASH_FIELDS, fold_key, normalize_email, normalize_phone, row_hash_series
 from app.models import (
     UploadBatch,  # staging batch
     UploadRowStaging,    # staging rows (parse_and_stage buraya yazar)
-    Lawyer, Person, LawyerPerson, StatusOption
+    Lawyer, Person, LawyerPerson, StatusOption, BatchDiff, BatchDiffRow
 )
+from app.services.bulk_loader import bulk_load
+from app.utils.file_validators import ValidationError
+
+# Sayfalı diff okuması (diff_page) için bölümler ve sayfa boyutu
+DIFF_SECTIONS = ("added", "removed", "changed")
+DIFF_PAGE_SIZE = 100
+DIFF_PAGE_MAX = 1000
 
 # Karşılaştırmada kullanılacak alanlar
 COMPARE_FIELDS = [
@@ -15,124 +27,195 @@ COMPARE_FIELDS = [
 ]
 
 
-def _status_key_of_lp(lp: LawyerPerson) -> str:
-    """LawyerPerson.cevap_status varsa key'ini döndürür."""
-    if lp.cevap_status_id:
-        try:
-            return lp.cevap_status.key
-        except StatusOption.DoesNotExist:  # teorik
-            return ""
-    return ""
+# Python diff motorunun snapshot satırı: bu sırada sabit konumlu tuple (bkz. _row_dict)
+SNAPSHOT_FIELDS = ("kisi_sicilno", *COMPARE_FIELDS)
+_SNAPSHOT_CHUNK = 5000
+
+Snapshot = Dict[str, Tuple[str, ...]]
+
+
+def _row_dict(row: Tuple[str, ...]) -> Dict[str, Any]:
+    """Snapshot tuple'ını diff çıktısındaki satır sözlüğüne çevirir (yalnızca çıktıya girenler için)."""
+    return dict(zip(SNAPSHOT_FIELDS, row))
 
 
-def _snapshot_for_lawyer(lawyer_id: int) -> Dict[str, Dict[str, Any]]:
+def _snapshot_for_lawyer(lawyer_id: int) -> Snapshot:
     """
-    Veritabanındaki mevcut (onaylanmış) kayıtlar.
-    Dönen sözlük: kisi_sicilno -> alanlar
-    ÖNEMLI: Artık LawyerPerson'dan direkt okuyoruz, Person'a bakmıyoruz.
-    Her avukatın kendi verisi LawyerPerson'da saklanıyor.
+    Veritabanındaki mevcut (onaylanmış) kayıtlar: kisi_sicilno -> SNAPSHOT_FIELDS tuple'ı.
+    Avukatın AKTİF LawyerPerson kayıtları model nesnesi oluşturulmadan values_list ile
+    parça parça okunur; status key'leri JOIN yerine küçük bir id → key eşlemesinden gelir.
+    Değerlerde yalnızca None → '' yapılır.
     """
-    # Bu avukata bağlı AKTIF kayıtları çek
-    lp_qs = LawyerPerson.objects.filter(
-        lawyer_id=lawyer_id,
-        active=True  # KRITIK: Sadece aktif kayıtlar
-    ).select_related("cevap_status")
+    status_keys = dict(StatusOption.objects.values_list("id", "key"))
+    rows = (LawyerPerson.objects.filter(lawyer_id=lawyer_id, active=True)
+            .values_list("kisi_sicilno", *COMPARE_FIELDS[:-1], "cevap_status_id"))
 
-    result: Dict[str, Dict[str, Any]] = {}
-
-    for lp in lp_qs:
-        ks = (lp.kisi_sicilno or "").strip()
+    result: Snapshot = {}
+    for row in rows.iterator(chunk_size=_SNAPSHOT_CHUNK):
+        ks = (row[0] or "").strip()
         if not ks:
             continue
-
-        result[ks] = {
-            "kisi_sicilno": ks,
-            "ad": lp.ad or "",
-            "soyad": lp.soyad or "",
-            "mail": lp.mail or "",
-            "telno": lp.telno or "",
-            "ilce": lp.ilce or "",
-            "adres_aciklama": lp.adres_aciklama or "",
-            "notlar": lp.notlar or "",
-            "cevap_status_key": _status_key_of_lp(lp) or "",
-        }
-
+        result[ks] = (ks, *[v or "" for v in row[1:-1]], status_keys.get(row[-1], ""))
     return result
 
 
-def _snapshot_from_batch(batch_id: int) -> Dict[str, Dict[str, Any]]:
+def _snapshot_from_batch(batch_id: int) -> Snapshot:
     """
-    Staging (yeni yüklenen) satırlar.
-    Dönen sözlük: kisi_sicilno -> alanlar
+    Staging (yeni yüklenen) satırlar: kisi_sicilno -> SNAPSHOT_FIELDS tuple'ı (trim'lenmiş).
+    Aynı sicil no birden fazla varsa son satır geçerlidir.
     """
-    rows = UploadRowStaging.objects.filter(batch_id=batch_id)
-    snap: Dict[str, Dict[str, Any]] = {}
+    rows = (UploadRowStaging.objects.filter(batch_id=batch_id).order_by("id")
+            .values_list(*SNAPSHOT_FIELDS))
 
-    for r in rows:
-        ks = (r.kisi_sicilno or "").strip()
+    snap: Snapshot = {}
+    for row in rows.iterator(chunk_size=_SNAPSHOT_CHUNK):
+        ks = (row[0] or "").strip()
         if not ks:
             # Sicil numarası yoksa satır atlanır
             continue
+        snap[ks] = (ks, *[(v or "").strip() for v in row[1:]])
+    return snap
 
-        snap[ks] = {
-            "kisi_sicilno": ks,
-            "ad": (getattr(r, "ad", "") or "").strip(),
-            "soyad": (getattr(r, "soyad", "") or "").strip(),
-            "mail": (getattr(r, "mail", "") or "").strip(),
-            "telno": (getattr(r, "telno", "") or "").strip(),
-            "ilce": (getattr(r, "ilce", "") or "").strip(),
-            "adres_aciklama": (getattr(r, "adres_aciklama", "") or "").strip(),
-            "notlar": (getattr(r, "notlar", "") or "").strip(),
-            "cevap_status_key": (getattr(r, "cevap_status_key", "") or "").strip(),
-        }
 
-    return snap
+# Alan bazlı karşılaştırma anahtarları; sadece biçim farkı (İ/ı, büyük/küçük harf,
+# telefon yazımı) değişiklik sayılmaz. Listede olmayan alanlar trim'lenerek karşılaştırılır.
+_FIELD_KEYS = {
+    "ad": fold_key,
+    "soyad": fold_key,
+    "ilce": fold_key,
+    "mail": lambda v: normalize_email(v) or "",
+    "telno": lambda v: normalize_phone(v) or "",
+}
 
 
 def _field_changed(before: Dict[str, Any], after: Dict[str, Any], field: str) -> bool:
     """Metin alanlarını trim’leyerek karşılaştır; None -> '' normalize et."""
-    b = (before.get(field) or "").strip()
-    a = (after.get(field) or "").strip()
-    return b != a
+    return _value_changed(field, before.get(field), after.get(field))
+
+
+def _value_changed(field: str, before: Any, after: Any) -> bool:
+    b = (before or "").strip()
+    a = (after or "").strip()
+    if b == a:
+        return False
+    key = _FIELD_KEYS.get(field)
+    return key is None or key(b) != key(a)
 
 
 def _diff_dicts(
-    current: Dict[str, Dict[str, Any]],
-    new: Dict[str, Dict[str, Any]],
+    current: Snapshot,
+    new: Snapshot,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     current: mevcut sistem (lawyer'a bağlı kişiler)
     new:     batch'ten gelen yeni liste
 
+    Tuple'ları birebir aynı olan satırlar alan alan karşılaştırılmaz. Satır sözlükleri
+    yalnızca çıktıya giren satırlar için oluşturulur.
+
     return:
       added[], removed[], changed[]
     """
-    cur_keys = set(current.keys())
-    new_keys = set(new.keys())
+    cur_keys = current.keys()
+    new_keys = new.keys()
 
-    added_keys = sorted(list(new_keys - cur_keys))
-    removed_keys = sorted(list(cur_keys - new_keys))
-    inter_keys = sorted(list(cur_keys & new_keys))
-
-    added = [new[k] for k in added_keys]
-    removed = [current[k] for k in removed_keys]
+    added = [_row_dict(new[k]) for k in sorted(new_keys - cur_keys)]
+    removed = [_row_dict(current[k]) for k in sorted(cur_keys - new_keys)]
 
     changed: List[Dict[str, Any]] = []
-    for ks in inter_keys:
+    for ks in sorted(cur_keys & new_keys):
         before = current[ks]
         after = new[ks]
-        changed_fields = [f for f in COMPARE_FIELDS if _field_changed(before, after, f)]
+        if before == after:
+            continue
+        changed_fields = [f for i, f in enumerate(COMPARE_FIELDS, start=1)
+                          if _value_changed(f, before[i], after[i])]
         if changed_fields:
             changed.append({
                 "kisi_sicilno": ks,
                 "fields": changed_fields,
-                "before": before,
-                "after": after,
+                "before": _row_dict(before),
+                "after": _row_dict(after),
             })
 
     return added, removed, changed
 
 
+def _sql_diff(batch_id: int, lawyer_id: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    _diff_dicts'in veritabanı tarafı karşılığı: aynı sonuç, aynı satır biçimi.
+
+    Staging satırları avukatın aktif LawyerPerson kayıtlarına (lawyer, kisi_sicilno) indeksiyle
+    LEFT JOIN edilir: eşi olmayanlar eklenen, içerik özeti (row_hash) veya status key'i farklı
+    olanlar değişiklik adayıdır; özetler eşitse metin alanları hiç karşılaştırılmaz. Özeti henüz
+    hesaplanmamış (NULL, bkz. backfill_row_hashes) satırlarda trim'lenmiş alanlar karşılaştırılır.
+    Kaldırılanlar (batch, kisi_sicilno) indeksi üzerinden NOT EXISTS ile bulunur. Adaylarda alan
+    bazlı karşılaştırma (_field_changed) Python'da yapılır. Sicil numaraları iki tabloda da trim'lenmiş saklandığından eşleme ham
+    kolonlar üzerindedir. Staging'de aynı sicil no birden fazla varsa sözlükteki gibi son satır
+    (en büyük id) geçerlidir.
+    """
+    qn = connection.ops.quote_name
+    staging = qn(UploadRowStaging._meta.db_table)
+    people = qn(LawyerPerson._meta.db_table)
+    statuses = qn(StatusOption._meta.db_table)
+    text_fields = [f for f in COMPARE_FIELDS if f != "cevap_status_key"]
+
+    new_cols = ", ".join(["s.kisi_sicilno"] + [f"s.{f}" for f in COMPARE_FIELDS])
+    cur_cols = ", ".join(["p.kisi_sicilno"] + [f"p.{f}" for f in text_fields] + [f"o.{qn('key')}"])
+    nulls = ", ".join(["NULL"] * (len(COMPARE_FIELDS) + 1))
+    text_differs = " OR ".join(f"TRIM(COALESCE(s.{f}, '')) <> TRIM(COALESCE(p.{f}, ''))" for f in text_fields)
+    differs = (
+        f"TRIM(COALESCE(s.cevap_status_key, '')) <> COALESCE(o.{qn('key')}, '')"
+        f" OR (s.row_hash IS NOT NULL AND p.row_hash IS NOT NULL AND s.row_hash <> p.row_hash)"
+        f" OR ((s.row_hash IS NULL OR p.row_hash IS NULL) AND ({text_differs}))"
+    )
+    sql = f"""
+        SELECT {new_cols}, {cur_cols}
+        FROM {staging} s
+        LEFT JOIN {people} p ON p.lawyer_id = %s AND p.active = %s AND p.kisi_sicilno = s.kisi_sicilno
+        LEFT JOIN {statuses} o ON o.id = p.cevap_status_id
+        WHERE s.batch_id = %s AND TRIM(s.kisi_sicilno) <> ''
+          AND s.id IN (SELECT MAX(id) FROM {staging} WHERE batch_id = %s GROUP BY kisi_sicilno)
+          AND (p.id IS NULL OR {differs})
+        UNION ALL
+        SELECT {nulls}, {cur_cols}
+        FROM {people} p
+        LEFT JOIN {statuses} o ON o.id = p.cevap_status_id
+        WHERE p.lawyer_id = %s AND p.active = %s AND TRIM(p.kisi_sicilno) <> ''
+          AND NOT EXISTS (SELECT 1 FROM {staging} s WHERE s.batch_id = %s AND s.kisi_sicilno = p.kisi_sicilno)
+    """
+
+    # Snapshot kuralları: staging değerleri trim'lenir, mevcut kayıtlarda yalnızca None → ''
+    def new_record(values) -> Dict[str, Any]:
+        return {"kisi_sicilno": values[0], **{f: (v or "").strip() for f, v in zip(COMPARE_FIELDS, values[1:])}}
+
+    def cur_record(values) -> Dict[str, Any]:
+        return {"kisi_sicilno": values[0], **{f: v or "" for f, v in zip(COMPARE_FIELDS, values[1:])}}
+
+    width = len(COMPARE_FIELDS) + 1
+    added, removed, changed = [], [], []
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [lawyer_id, True, batch_id, batch_id, lawyer_id, True, batch_id])
+        for row in cursor.fetchall():
+            new, cur = row[:width], row[width:]
+            if cur[0] is None:
+                added.append(new_record(new))
+            elif new[0] is None:
+                removed.append(cur_record(cur))
+            else:
+                before, after = cur_record(cur), new_record(new)
+                fields = [f for f in COMPARE_FIELDS if _field_changed(before, after, f)]
+                if fields:
+                    changed.append({"kisi_sicilno": after["kisi_sicilno"], "fields": fields,
+                                    "before": before, "after": after})
+
+    # Sıralama veritabanı collation'ına bırakılmaz; _diff_dicts ile aynı (kod noktası) sıra
+    added.sort(key=lambda r: r["kisi_sicilno"])
+    removed.sort(key=lambda r: r["kisi_sicilno"])
+    changed.sort(key=lambda r: r["kisi_sicilno"])
+    return added, removed, changed
+
+
 def compute_diff(batch_id: int) -> Dict[str, Any]:
     """
     UI ve apply servislerinin beklediği diff sözlüğü.
@@ -149,10 +232,16 @@ def compute_diff(batch_id: int) -> Dict[str, Any]:
     batch: UploadBatch = UploadBatch.objects.select_related("lawyer").get(id=batch_id)
     lawyer: Lawyer = batch.lawyer
 
-    current = _snapshot_for_lawyer(lawyer.id)
-    new = _snapshot_from_batch(batch_id)
-
-    added, removed, changed = _diff_dicts(current, new)
+    if batch.purged_at:
+        # Staging satırları silinmiş (bkz. retention_service); boş staging'le
+        # karşılaştırmak tüm listeyi "kaldırılan" gösterirdi
+        added, removed, changed = [], [], []
+    elif settings.DIFF_ENGINE == "sql":
+        added, removed, changed = _sql_diff(batch_id, lawyer.id)
+    else:
+        current = _snapshot_for_lawyer(lawyer.id)
+        new = _snapshot_from_batch(batch_id)
+        added, removed, changed = _diff_dicts(current, new)
 
     return {
         "batchId": batch.id,
@@ -170,4 +259,191 @@ def compute_diff(batch_id: int) -> Dict[str, Any]:
         "added": added,
         "removed": removed,
         "changed": changed,
+        "purged": batch.purged_at is not None,
+    }
+
+
+def list_version(lawyer_id: int) -> str:
+    """
+    Avukatın aktif LawyerPerson kümesinin sürüm damgası: kayıt sayısı, en büyük id ve en son
+    updated_at. Ekleme/silme sayıyı veya en büyük id'yi, düzenleme (save / update_or_create)
+    updated_at'i değiştirir. (lawyer, active) indeksiyle tek sorgu.
+    """
+    agg = LawyerPerson.objects.filter(lawyer_id=lawyer_id, active=True).aggregate(
+        n=Count("id"), last_id=Max("id"), touched=Max("updated_at"))
+    touched = agg["touched"].isoformat() if agg["touched"] else ""
+    return f"{agg['n']}:{agg['last_id'] or 0}:{touched}"
+
+
+def store_diff(batch_id: int) -> Dict[str, Any]:
+    """
+    Diff'i hesaplar ve sürüm damgasıyla BatchDiff'e yazar (batch staging'e alındığında çağrılır).
+    Damga diff'ten önce alınır; arada liste değişirse kayıt ilk okumada geçersiz sayılır.
+    Staging'i silinmiş batch'lerin (boş) diff'i saklanmaz.
+    """
+    lawyer_id = UploadBatch.objects.values_list("lawyer_id", flat=True).get(id=batch_id)
+    version = list_version(lawyer_id)
+    diff = compute_diff(batch_id)
+    if not diff["purged"]:
+        stored, _ = BatchDiff.objects.update_or_create(batch_id=batch_id, defaults={
+            "added_count": diff["counts"]["added"],
+            "removed_count": diff["counts"]["removed"],
+            "changed_count": diff["counts"]["changed"],
+            "diff_json": diff,
+            "version": version,
+        })
+        _store_rows(stored.id, diff)
+    return diff
+
+
+def _store_rows(diff_id: int, diff: Dict[str, Any]):
+    """Diff bölümlerini sayfalı okuma için BatchDiffRow'a yazar (PostgreSQL'de COPY)."""
+    BatchDiffRow.objects.filter(diff_id=diff_id).delete()
+    rows = ((diff_id, section, row["kisi_sicilno"], row)
+            for section in DIFF_SECTIONS for row in diff.get(section, []))
+    bulk_load(BatchDiffRow, ["diff", "section", "kisi_sicilno", "data"], rows)
+
+
+def _current_diff(batch_id: int):
+    """
+    Batch'in geçerli BatchDiff kaydı (diff_json yüklenmeden). Kayıt yoksa veya avukatın listesi
+    değiştiyse diff yeniden hesaplanıp saklanır. Staging'i silinmiş batch'te None.
+    """
+    def load():
+        return (BatchDiff.objects.filter(batch_id=batch_id).select_related("batch__lawyer")
+                .defer("diff_json").first())
+
+    stored = load()
+    if stored is None or stored.batch.purged_at or stored.version != list_version(stored.batch.lawyer_id):
+        store_diff(batch_id)
+        stored = load()
+    if stored is None or stored.batch.purged_at:
+        return None
+    return stored
+
+
+def get_diff(batch_id: int) -> Dict[str, Any]:
+    """
+    Saklanan diff'i döndürür; yoksa, boşaltılmışsa (retention) veya avukatın listesi
+    hesaplandığından beri değiştiyse yeniden hesaplayıp saklar. Önizleme, onay ve
+    seçili onay bu fonksiyonu kullanır.
+    """
+    stored = BatchDiff.objects.filter(batch_id=batch_id).select_related("batch").first()
+    if stored and stored.diff_json and stored.version == list_version(stored.batch.lawyer_id):
+        return stored.diff_json
+    return store_diff(batch_id)
+
+
+def diff_summary(batch_id: int) -> Dict[str, Any]:
+    """
+    Satırlar olmadan diff başlığı (batchId, lawyer, counts, purged). Sayılar geçerli
+    BatchDiff kaydının kolonlarından okunur; diff_json hiç yüklenmez.
+    """
+    stored = _current_diff(batch_id)
+    if stored is None:
+        # Staging'i silinmiş batch: compute_diff satır okumadan boş başlık döndürür
+        diff = compute_diff(batch_id)
+        return {k: v for k, v in diff.items() if k not in DIFF_SECTIONS}
+
+    lawyer = stored.batch.lawyer
+    return {
+        "batchId": batch_id,
+        "lawyer": {"id": lawyer.id, "sicilNo": lawyer.sicil_no, "ad": lawyer.ad, "soyad": lawyer.soyad},
+        "counts": {"added": stored.added_count, "removed": stored.removed_count,
+                   "changed": stored.changed_count},
+        "purged": False,
+    }
+
+
+def batch_overlap(batch_id: int) -> Dict[str, Any]:
+    """
+    Batch'teki kişilerden başka avukatların aktif listelerinde de bulunanlar.
+    Staging sicil numaraları alt sorgu olarak LawyerPerson.kisi_sicilno indeksiyle eşlenir
+    (semi-join) ve avukata göre gruplanır; satırlar Python'a taşınmaz.
+
+    :return: {"people": başka listede de olan kişi sayısı,
+              "lawyers": [{"id", "sicilNo", "ad", "soyad", "count"}, ...] (çoktan aza)}
+    """
+    batch = UploadBatch.objects.only("lawyer_id").get(id=batch_id)
+    staged = UploadRowStaging.objects.filter(batch_id=batch_id).values("kisi_sicilno")
+    shared = (LawyerPerson.objects.filter(active=True, kisi_sicilno__in=Subquery(staged))
+              .exclude(lawyer_id=batch.lawyer_id))
+
+    lawyers = (shared.values("lawyer_id", "lawyer__sicil_no", "lawyer__ad", "lawyer__soyad")
+               .annotate(n=Count("kisi_sicilno", distinct=True))
+               .order_by("-n", "lawyer__sicil_no"))
+    return {
+        "people": shared.aggregate(n=Count("kisi_sicilno", distinct=True))["n"],
+        "lawyers": [
+            {"id": row["lawyer_id"], "sicilNo": row["lawyer__sicil_no"], "ad": row["lawyer__ad"],
+             "soyad": row["lawyer__soyad"], "count": row["n"]}
+            for row in lawyers
+        ],
     }
+
+
+def diff_page(batch_id: int, section: str, cursor: str = None, limit: int = DIFF_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Diff'in tek bölümünden bir sayfa; BatchDiffRow'dan (diff, section, kisi_sicilno) indeksiyle
+    okunur, maliyeti sayfa boyutu kadardır. İmleç (cursor) önceki sayfanın son sicil
+    numarasıdır; araya kayıt girse de sayfalar kaymaz.
+
+    :return: {"batchId", "section", "count", "results", "nextCursor"} (son sayfada nextCursor None)
+    :raises ValidationError: geçersiz bölüm
+    """
+    if section not in DIFF_SECTIONS:
+        raise ValidationError(f"Geçersiz bölüm: {section}", details=[f"Geçerli: {', '.join(DIFF_SECTIONS)}"])
+    limit = max(1, min(int(limit or DIFF_PAGE_SIZE), DIFF_PAGE_MAX))
+
+    stored = _current_diff(batch_id)
+    count = getattr(stored, f"{section}_count") if stored else 0
+    if not count:
+        return {"batchId": batch_id, "section": section, "count": 0, "results": [], "nextCursor": None}
+
+    rows = stored.rows.filter(section=section)
+    if not rows.exists():
+        # Satır tablosundan önce saklanmış kayıt: bir kez diff_json'dan doldurulur
+        _store_rows(stored.id, BatchDiff.objects.values_list("diff_json", flat=True).get(id=stored.id))
+    if cursor:
+        rows = rows.filter(kisi_sicilno__gt=cursor)
+    page = list(rows.order_by("kisi_sicilno").values_list("data", flat=True)[:limit + 1])
+    more = len(page) > limit
+    page = page[:limit]
+    return {
+        "batchId": batch_id,
+        "section": section,
+        "count": count,
+        "results": page,
+        "nextCursor": page[-1]["kisi_sicilno"] if more else None,
+    }
+
+
+def backfill_row_hashes(chunk_rows: int = 5000,
+                        progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+    """
+    row_hash'i NULL olan LawyerPerson ve UploadRowStaging satırlarının özetini id sırasıyla
+    chunk_rows'luk parçalar halinde hesaplayıp yazar. Yalnızca row_hash güncellenir
+    (updated_at ve dolayısıyla list_version değişmez). Kesilirse kaldığı yerden devam eder.
+
+    :return: model adı → güncellenen satır sayısı
+    """
+    report = {}
+    for model in (LawyerPerson, UploadRowStaging):
+        done, last_id = 0, 0
+        pending = model.objects.filter(row_hash__isnull=True).order_by("id")
+        while True:
+            rows = list(pending.filter(id__gt=last_id).values_list("id", *ROW_HASH_FIELDS)[:chunk_rows])
+            if not rows:
+                break
+            frame = pd.DataFrame(rows, columns=["id", *ROW_HASH_FIELDS], dtype=object)
+            hashes = row_hash_series(frame).tolist()
+            model.objects.bulk_update(
+                [model(id=row_id, row_hash=h) for row_id, h in zip(frame["id"], hashes)],
+                ["row_hash"], batch_size=1000,
+            )
+            done += len(rows)
+            last_id = rows[-1][0]
+            if progress:
+                progress(model.__name__, done)
+        report[model.__name__] = done
+    return report
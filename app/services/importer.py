@@ -1,18 +1,34 @@
-import os
-import tempfile
+import csv
+import hashlib
+import io
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
 from pathlib import Path
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Iterator, Callable, Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import csv as pa_csv
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Count
 
 from app.models import UploadBatch, UploadRowStaging, Lawyer, StatusOption
-from app.utils.normalization import normalize_email, normalize_phone
+from app.services.bulk_loader import bulk_load
+from app.utils.normalization import (
+    normalize_email_series, normalize_name_series, normalize_phone_series,
+    normalize_status_key_series, normalize_text_series, row_hash_series,
+)
 from app.utils.file_validators import (
     validate_upload_file,
     validate_dataframe_structure,
-    validate_dataframe_data,
-    validate_sicil_no,
+    collect_dataframe_errors,
+    summarize_validation,
     ValidationError
 )
 
@@ -32,17 +48,61 @@ HEADER_MAP = {
     'notlar': 'notlar',
 }
 
+# Aynı sicil no dosyada birden fazla satırda geçerse uygulanacak çözüm
+DUPLICATE_FIRST = 'first'    # ilk satır kalır
+DUPLICATE_LAST = 'last'      # son satır kalır
+DUPLICATE_MERGE = 'merge'    # tek satırda birleştirilir: her alanın dosya sırasındaki ilk dolu değeri
+DUPLICATE_REJECT = 'reject'  # dosya reddedilir
+DUPLICATE_POLICIES = (DUPLICATE_FIRST, DUPLICATE_LAST, DUPLICATE_MERGE, DUPLICATE_REJECT)
 
-def _read_to_df(file_path: str) -> pd.DataFrame:
-    suffix = Path(file_path).suffix.lower()
+
+class UnchangedUpload(Exception):
+    """
+    Yüklenen dosya avukatın son uygulanan listesi ile aynı (ham dosya veya içerik özeti eşleşti).
+    Batch oluşturulmaz; diff/apply adımlarına gerek yoktur.
+    """
+    def __init__(self, batch_id: int, row_count: int, matched: str):
+        self.batch_id = batch_id
+        self.row_count = row_count
+        self.matched = matched  # 'file' veya 'content'
+        self.message = "Değişiklik yok: dosya son uygulanan liste ile aynı"
+        super().__init__(self.message)
+
+    def as_result(self) -> Dict:
+        """apply_diff sonucu ile aynı biçimde 'değişiklik yok' sonucu."""
+        return {'ok': True, 'message': self.message, 'unchanged': True,
+                'matched': self.matched, 'matchedBatchId': self.batch_id,
+                'counts': {'added': 0, 'removed': 0, 'changed': 0}}
+
+
+def _normalize_header(columns) -> List[str]:
+    return [str(c).strip().lower() for c in columns]
+
+
+# Apache Parquet ve Arrow IPC (file/stream) formatları
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc', '.arrows')
+
+
+def _source_suffix(source, suffix: Optional[str] = None) -> str:
+    """Kaynağın (yol veya dosya nesnesi) uzantısı; dosya nesnesinde name özniteliğinden okunur."""
+    if suffix:
+        return suffix.lower()
+    return Path(str(getattr(source, 'name', source))).suffix.lower()
+
+
+def _read_to_df(source, suffix: Optional[str] = None) -> pd.DataFrame:
+    suffix = _source_suffix(source, suffix)
     if suffix in ('.xlsx', '.xlsm', '.xltx', '.xltm'):
-        df = pd.read_excel(file_path, engine='openpyxl')
+        df = pd.read_excel(source, engine='openpyxl')
     elif suffix in ('.csv', '.txt'):
-        df = pd.read_csv(file_path)
+        df = pd.concat(list(_iter_csv_chunks(source, 1_000_000)), ignore_index=True)
+    elif suffix in PARQUET_EXTENSIONS + ARROW_EXTENSIONS:
+        df = pd.concat(list(_iter_arrow_chunks(source, 1_000_000, suffix)), ignore_index=True)
     else:
         raise ValueError(f"Desteklenmeyen dosya türü: {suffix}")
     # kolon adlarını normalize et
-    df.columns = [str(c).strip().lower() for c in df.columns]
+    df.columns = _normalize_header(df.columns)
     return df
 
 
@@ -52,162 +112,938 @@ def _ensure_required(df: pd.DataFrame):
         raise ValueError(f"Eksik zorunlu sütun(lar): {', '.join(missing)}")
 
 
+_HEADER_ASCII = str.maketrans('ıçğöşü', 'icgosu')
+
+
+def _header_key(col: str) -> str:
+    """Normalize edilmiş sütun adının HEADER_MAP anahtarı (ı/İ → i, nokta ve boşluklar atılır)."""
+    # 'İ'.lower() 'i' + birleşik nokta (U+0307) üretir; 'İlçe' → 'ilce'
+    key = col.replace('İ', 'i').lower().replace('\u0307', '').translate(_HEADER_ASCII)
+    return key.replace('.', '').replace(' ', '')
+
+
 def _map_columns(df: pd.DataFrame) -> pd.DataFrame:
     mapped = {}
     for col in df.columns:
-        key = col.replace('ı', 'i').replace('İ', 'i').lower()
-        key = key.replace('.', '').replace(' ', '')
+        key = _header_key(col)
         if key in HEADER_MAP:
             mapped[HEADER_MAP[key]] = df[col]
     out = pd.DataFrame(mapped)
     return out
 
 
+NAME_COLS = ('ad', 'soyad', 'ilce')
+
+
 def _normalize_df(df: pd.DataFrame) -> pd.DataFrame:
-    if 'mail' in df.columns:
-        df['mail'] = df['mail'].astype(str).apply(lambda x: normalize_email(x) if x and x != 'nan' else None)
-    if 'telno' in df.columns:
-        df['telno'] = df['telno'].astype(str).apply(lambda x: normalize_phone(x) if x and x != 'nan' else None)
+    """
+    Kolonları vektörel olarak normalize eder (bkz. app.utils.normalization).
+    Boş hücreler NaN (CSV) veya None (XLSX, Parquet/Arrow) olabilir; ikisi de None olur.
+    """
     for col in df.columns:
-        df[col] = df[col].apply(
-            lambda x: None if (isinstance(x, float) and pd.isna(x)) or (isinstance(x, str) and x.strip() == '') else x)
+        if col == 'mail':
+            df[col] = normalize_email_series(df[col])
+        elif col == 'telno':
+            df[col] = normalize_phone_series(df[col])
+        elif col == 'cevap_status_key':
+            df[col] = normalize_status_key_series(df[col])
+        elif col in NAME_COLS:
+            df[col] = normalize_name_series(df[col])
+        else:
+            df[col] = normalize_text_series(df[col])
     return df
 
 
-@transaction.atomic
-def parse_and_stage(uploaded_file, lawyer_id: int, created_by: str = None) -> Tuple[int, int]:
+def _xlsx_value(value):
+    # pandas.read_excel ile aynı: tam sayı değerli float'lar int'e çevrilir (1234.0 → 1234)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _iter_xlsx_chunks(source, chunk_rows: int, sheet: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    XLSX dosyasının ilk (veya adı verilen) sayfasını openpyxl read-only modunda satır satır okur.
+    Tüm çalışma kitabı belleğe alınmaz; en fazla chunk_rows satırlık parçalar üretilir.
+    Tamamen boş satırlar atlanır; index sayfadaki gerçek satırı gösterir (Excel satırı = index + 2).
     """
-    Yüklenen dosyayı geçici olarak işler, veritabanına yazar.
-    Dosya kalıcı olarak saklanmaz, sadece parse edilir.
+    from openpyxl import load_workbook
 
-    Validasyonlar:
-    - Dosya formatı kontrolü (xlsx, csv)
-    - Dosya boyutu kontrolü (max 10MB)
-    - Gerekli sütunlar kontrolü
-    - Sicil no validasyonu
-    - Veri satırı validasyonu
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+        # read-only modda sondaki boş başlık hücreleri de gelebilir
+        width = max((i + 1 for i, c in enumerate(header) if c is not None), default=0)
+        columns = [
+            str(c).strip().lower() if c is not None else f'unnamed: {i}'
+            for i, c in enumerate(header[:width])
+        ]
 
-    :return: (batch_id, row_count)
-    :raises ValidationError: Validasyon hatası durumunda
+        data, index = [], []
+        for pos, row in enumerate(rows):
+            values = list(row[:width])
+            if all(v is None for v in values):
+                continue
+            values += [None] * (width - len(values))
+            data.append([_xlsx_value(v) for v in values])
+            index.append(pos)
+            if len(data) >= chunk_rows:
+                yield pd.DataFrame(data, columns=columns, index=index, dtype=object)
+                data, index = [], []
+        if data:
+            yield pd.DataFrame(data, columns=columns, index=index, dtype=object)
+    finally:
+        wb.close()
+
+
+def _xml_name(tag: str) -> str:
+    """'{namespace}c' → 'c' (Transitional ve Strict OOXML aynı işlenir)."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _xlsx_first_sheet(zf: zipfile.ZipFile) -> Tuple[str, Optional[str]]:
+    """Çalışma kitabındaki ilk sayfanın ve paylaşılan metin tablosunun zip içi yolları."""
+    rels = {}
+    for rel in ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels')):
+        target = rel.get('Target', '')
+        target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+        rels[rel.get('Id')] = (rel.get('Type', ''), target)
+
+    sheet_path = None
+    for el in ElementTree.fromstring(zf.read('xl/workbook.xml')).iter():
+        if _xml_name(el.tag) == 'sheet':
+            rel_id = next(v for k, v in el.attrib.items() if _xml_name(k) == 'id')
+            sheet_path = rels[rel_id][1]
+            break
+    shared = next((target for kind, target in rels.values() if kind.endswith('/sharedStrings')), None)
+    return sheet_path, shared
+
+
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+
+
+def _xlsx_col(ref: str) -> int:
+    col = 0
+    for ch in _CELL_REF.match(ref).group(1):
+        col = col * 26 + ord(ch) - 64
+    return col - 1
+
+
+def _xlsx_sample(source, rows: int) -> Optional[pd.DataFrame]:
     """
-    # 0) Dosya validasyonu (format ve boyut)
-    is_valid, msg, _ = validate_upload_file(uploaded_file, max_size_mb=10)
+    XLSX ilk sayfasının başlığını ve ilk `rows` veri satırını okur (önizleme için).
+    openpyxl read-only modu açılışta tüm paylaşılan metin tablosunu yükler; büyük
+    dosyalarda bu saniyeler sürer. Burada sayfa XML'i akış halinde yalnızca gereken
+    satırlar kadar, paylaşılan metinler de yalnızca bu satırların kullandığı en büyük
+    indekse kadar okunur. Çıktı _iter_xlsx_chunks ile aynı biçimdedir; tarih biçimli
+    hücreler seri numarası olarak kalır.
+    """
+    with zipfile.ZipFile(source) as zf:
+        sheet_path, shared_path = _xlsx_first_sheet(zf)
+        if sheet_path is None:
+            return None
+
+        # {satır no: {kolon: (tip, değer)}}
+        cells: Dict[int, Dict[int, Tuple[str, str]]] = {}
+        with zf.open(sheet_path) as fh:
+            for _, el in ElementTree.iterparse(fh):
+                name = _xml_name(el.tag)
+                if name != 'row':
+                    continue
+                row_no = int(el.get('r')) if el.get('r') else len(cells) + 1
+                values = {}
+                for pos, c in enumerate(x for x in el if _xml_name(x.tag) == 'c'):
+                    kind = c.get('t', 'n')
+                    texts = [t.text or '' for t in c.iter() if _xml_name(t.tag) in ('v', 't')]
+                    if texts:
+                        values[_xlsx_col(c.get('r')) if c.get('r') else pos] = (kind, ''.join(texts))
+                el.clear()
+                if values:
+                    cells[row_no] = values
+                if row_no > rows:  # 1 başlık + rows veri satırı
+                    break
+
+        needed = [int(v) for row in cells.values() for kind, v in row.values() if kind == 's']
+        shared = []
+        if needed and shared_path:
+            last = max(needed)
+            with zf.open(shared_path) as fh:
+                for _, el in ElementTree.iterparse(fh):
+                    if _xml_name(el.tag) != 'si':
+                        continue
+                    # Zengin metin parçaları birleştirilir; fonetik (rPh) okunuşlar atlanır
+                    phonetic = {id(t) for r in el if _xml_name(r.tag) == 'rPh' for t in r.iter()}
+                    shared.append(''.join(t.text or '' for t in el.iter()
+                                          if _xml_name(t.tag) == 't' and id(t) not in phonetic))
+                    el.clear()
+                    if len(shared) > last:
+                        break
+
+    def value(kind: str, raw: str):
+        if kind == 's':
+            return shared[int(raw)]
+        if kind == 'b':
+            return raw == '1'
+        if kind in ('str', 'inlineStr', 'e'):
+            return raw
+        number = float(raw)
+        return _xlsx_value(number)
+
+    header = cells.get(1)
+    if not header:
+        return None
+    width = max(header) + 1
+    columns = [str(value(*header[i])).strip().lower() if i in header else f'unnamed: {i}' for i in range(width)]
+    data, index = [], []
+    for row_no in sorted(r for r in cells if 1 < r <= rows + 1):
+        row = cells[row_no]
+        data.append([value(*row[i]) if i in row else None for i in range(width)])
+        index.append(row_no - 2)
+    return pd.DataFrame(data, columns=columns, index=index, dtype=object)
+
+
+def _open_arrow_batches(source, suffix: str):
+    """
+    Parquet veya Arrow IPC kaynağının RecordBatch'lerini döndürür (dosya tamamen belleğe alınmaz).
+    source: dosya yolu (memory map ile açılır) veya seek edilebilir dosya nesnesi.
+    """
+    if suffix in PARQUET_EXTENSIONS:
+        return pq.ParquetFile(source).iter_batches()
+
+    if isinstance(source, (str, Path)):
+        source = pa.memory_map(str(source), 'r')
+    try:
+        # IPC file formatı (Feather v2 / .arrow); olmazsa stream formatı denenir
+        reader = pa.ipc.open_file(source)
+        return (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return iter(pa.ipc.open_stream(source))
+
+
+def _frames_from_batches(batches, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    RecordBatch'leri en fazla chunk_rows satırlık DataFrame'lere çevirir.
+    Metin olmayan kolonlar CSV yolu ile aynı sonucu vermesi için Arrow
+    içinde (vektörel) metne çevrilir: 1234 → '1234', null → None.
+    Index tüm parçalar boyunca süreklidir.
+    """
+    offset = 0
+    for record_batch in batches:
+        for start in range(0, record_batch.num_rows, chunk_rows):
+            part = record_batch.slice(start, chunk_rows)
+            columns = [
+                col if pa.types.is_string(col.type) else pc.cast(col, pa.string())
+                for col in part.columns
+            ]
+            df = pa.RecordBatch.from_arrays(columns, names=part.schema.names).to_pandas()
+            df.columns = _normalize_header(df.columns)
+            df.index = pd.RangeIndex(offset, offset + len(df))
+            offset += len(df)
+            yield df
+
+
+def _iter_arrow_chunks(source, chunk_rows: int, suffix: str) -> Iterator[pd.DataFrame]:
+    """
+    Parquet / Arrow IPC dosyasını en fazla chunk_rows satırlık parçalar halinde okur.
+    Tip çıkarımı gerekmez; kolonlar metne çevrilir (bkz. _frames_from_batches).
+    """
+    yield from _frames_from_batches(_open_arrow_batches(source, suffix), chunk_rows)
+
+
+# pandas.read_csv varsayılan NA değerleri; pyarrow yolu aynı hücreleri boş saymalı
+CSV_NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+CSV_BLOCK_BYTES = 8 * 1024 * 1024
+
+
+def _read_csv_header(source) -> List[str]:
+    """CSV başlık satırını okur; dosya nesnesi başa sarılır."""
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as fh:
+            head = fh.read(64 * 1024)
+    else:
+        source.seek(0)
+        head = source.read(64 * 1024)
+        source.seek(0)
+    text = head.decode('utf-8-sig', errors='replace')
+    return next(csv.reader(io.StringIO(text)), [])
+
+
+def _iter_csv_chunks_pyarrow(source, chunk_rows: int, header: List[str]) -> Iterator[pd.DataFrame]:
+    """
+    pyarrow akış (streaming) CSV okuyucusu: çok iş parçacıklı ayrıştırma, yol verilirse
+    memory-map. Şema HEADER_MAP'ten türetilir: eşlenen tüm sütunlar string okunur
+    (tip çıkarımı yok, '01234' olduğu gibi kalır), eşlenmeyen sütunlar hiç ayrıştırılmaz.
+    """
+    columns = [c for c in header if _header_key(str(c).strip().lower()) in HEADER_MAP]
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_BYTES)
+    # Tırnak içinde çok satırlı hücreler (adres, not) blok sınırını aşabilir
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={c: pa.string() for c in columns},
+        include_columns=columns,
+        null_values=CSV_NULL_VALUES,
+        strings_can_be_null=True,
+    )
+    stream = pa.memory_map(str(source), 'r') if isinstance(source, (str, Path)) else source
+    reader = pa_csv.open_csv(stream, read_options=read_options, parse_options=parse_options,
+                             convert_options=convert_options)
+    yield from _frames_from_batches(reader, chunk_rows)
+
+
+def _iter_csv_chunks(source, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    CSV'yi en fazla chunk_rows satırlık, tüm kolonları metin olan parçalar halinde okur.
+    settings.IMPORT_CSV_ENGINE == 'pyarrow' ise çok iş parçacıklı pyarrow okuyucusu,
+    değilse pandas C okuyucusu (dtype=str) kullanılır.
+    """
+    if settings.IMPORT_CSV_ENGINE == 'pyarrow':
+        header = _read_csv_header(source)
+        normalized = _normalize_header(header)
+        # Tekrarlanan başlıkları pandas yeniden adlandırır (ad, ad.1); bu dosyalarda pandas yolu kullanılır
+        # Zorunlu sütun eksikse yapı hatası pandas yolunda aynı mesajla üretilir
+        if (len(set(normalized)) == len(normalized)
+                and all(col in normalized for col in REQUIRED_COLS)):
+            yield from _iter_csv_chunks_pyarrow(source, chunk_rows, header)
+            return
+
+    # Parçalar arasında tip çıkarımı tutarsız olmasın diye tüm kolonlar metin okunur
+    reader = pd.read_csv(source, chunksize=chunk_rows, dtype=str)
+    for chunk in reader:
+        chunk.columns = _normalize_header(chunk.columns)
+        yield chunk
+
+
+def _iter_chunks(source, chunk_rows: int, sheet: Optional[str] = None,
+                 suffix: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Dosyayı en fazla chunk_rows satırlık DataFrame parçaları halinde döndürür.
+    source: dosya yolu veya seek edilebilir binary dosya nesnesi (ör. bellekteki yükleme);
+    dosya nesnesinde uzantı suffix ile veya nesnenin name özniteliğinden belirlenir.
+    sheet: çok sayfalı çalışma kitaplarında okunacak sayfa (varsayılan ilk sayfa).
+    CSV ve XLSX dosyaları parça parça okunur; bellek kullanımı dosya boyutundan bağımsızdır.
+    Index tüm parçalar boyunca süreklidir (Excel satırı = index + 2).
+    """
+    suffix = _source_suffix(source, suffix)
+    if suffix in ('.csv', '.txt'):
+        yield from _iter_csv_chunks(source, chunk_rows)
+        return
+
+    if suffix in ('.xlsx', '.xlsm', '.xltx', '.xltm'):
+        yield from _iter_xlsx_chunks(source, chunk_rows, sheet)
+        return
+
+    if suffix in PARQUET_EXTENSIONS + ARROW_EXTENSIONS:
+        yield from _iter_arrow_chunks(source, chunk_rows, suffix)
+        return
+
+    df = _read_to_df(source, suffix)
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+# Staging tablosuna yazılan alanlar (tuple sırası)
+STAGING_FIELDS = [
+    'batch', 'kisi_sicilno', 'ad', 'soyad', 'telno', 'mail',
+    'ilce', 'adres_aciklama', 'notlar', 'cevap_status_key',
+]
+
+
+def _text_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Kolonu metne çevirir; eksik kolon veya boş hücreler None olur."""
+    if col not in df.columns:
+        # pd.Series(None, ...) NaN ile doldurur; staging'e NULL yazılması için açıkça None
+        return pd.Series([None] * len(df.index), index=df.index, dtype=object)
+    s = df[col]
+    return s.astype(str).where(s.notna(), None)
+
+
+def _staging_columns(df: pd.DataFrame) -> Tuple[Dict[str, pd.Series], pd.Series]:
+    """
+    Eşlenmiş ve normalize edilmiş parçadan staging kolonlarını vektörel olarak üretir.
+    Zorunlu alanları (sicil, ad, soyad) boş olan satırlar maske ile elenir.
+    Sicil no formatı collect_dataframe_errors'ta zaten doğrulandığı için tekrar kontrol edilmez.
+
+    :return: (kolonlar, tutulacak satır maskesi)
+    """
+    cols = {}
+    for col in ('kisi_sicilno', 'ad', 'soyad'):
+        cols[col] = _text_column(df, col).fillna('').str.strip()
+    for col in ('telno', 'mail', 'ilce', 'adres_aciklama', 'notlar', 'cevap_status_key'):
+        cols[col] = _text_column(df, col)
+
+    keep = (cols['kisi_sicilno'] != '') & (cols['ad'] != '') & (cols['soyad'] != '')
+    return cols, keep
+
+
+CONTENT_HASH_MOD = 2 ** 64
+
+
+def _chunk_values(df: pd.DataFrame, stats: Dict) -> Tuple[List[list], set]:
+    """
+    Parçanın staging kolonlarını (STAGING_FIELDS sırasında, batch hariç) düz listeler olarak döndürür.
+    Satır özetleri stats['content_sum'] toplamına eklenir (bkz. content_digest).
+
+    :return: (kolon değer listeleri, parçadaki status key'leri)
+    """
+    cols, keep = _staging_columns(df)
+    if not keep.all():
+        cols = {k: v[keep] for k, v in cols.items()}
+
+    stats['content_sum'] = (stats['content_sum'] + _rows_hash_sum(pd.DataFrame(cols))) % CONTENT_HASH_MOD
+    # Dosya içi tekrar tespiti için sicil özeti ve dosya satırı (bkz. _find_duplicates)
+    sicil = cols['kisi_sicilno']
+    stats['sicil_hashes'].append(pd.util.hash_pandas_object(sicil, index=False).to_numpy())
+    stats['row_numbers'].append(sicil.index.to_numpy() + 2)
+
+    status_keys = set(cols['cevap_status_key'].dropna().unique())
+    return [cols[f].tolist() for f in STAGING_FIELDS[1:]], status_keys
+
+
+def _rows_hash_sum(rows: pd.DataFrame) -> int:
+    """Satırların (STAGING_FIELDS sırasında) 64-bit özetlerinin toplamı."""
+    row_hashes = pd.util.hash_pandas_object(rows[STAGING_FIELDS[1:]], index=False)
+    return int(row_hashes.to_numpy().sum())
+
+
+def content_digest(stats: Dict, row_count: int) -> str:
+    """
+    Staging satırlarının sıradan bağımsız içerik özeti.
+    Her satırın 64-bit özeti toplanır (toplama sıradan bağımsızdır, tekrar eden
+    satırlar birbirini götürmez); satır sayısı ile birlikte SHA-256'ya verilir.
+    """
+    return hashlib.sha256(f"v1:{row_count}:{stats['content_sum']:016x}".encode()).hexdigest()
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def check_unchanged(lawyer_id: int, file_hash: Optional[str] = None, content_hash: Optional[str] = None):
+    """
+    Avukatın son uygulanan batch'i ile parmak izlerini karşılaştırır.
+    Eşleşme varsa UnchangedUpload fırlatır.
+    Not: listeler elle düzenlenmiş olsa bile aynı dosyanın yeniden yüklenmesi
+    bu düzenlemeleri ezmez.
+    """
+    if not file_hash and not content_hash:
+        return
+    last = (UploadBatch.objects.filter(lawyer_id=lawyer_id, status=UploadBatch.APPLIED)
+            .order_by('-id').only('id', 'row_count', 'file_sha256', 'content_hash').first())
+    if last is None:
+        return
+    if file_hash and last.file_sha256 == file_hash:
+        raise UnchangedUpload(last.id, last.row_count, 'file')
+    if content_hash and last.content_hash == content_hash:
+        raise UnchangedUpload(last.id, last.row_count, 'content')
+
+
+def _write_rows(batch: UploadBatch, values: List[list]) -> int:
+    """
+    Kolon listelerini model nesnesi oluşturmadan düz tuple'lar halinde staging tablosuna yazar.
+    PostgreSQL'de COPY, diğer veritabanlarında bulk_create kullanılır.
+    Her satırın içerik özeti (row_hash) burada vektörel olarak eklenir.
+    """
+    hashes = row_hash_series(pd.DataFrame(dict(zip(STAGING_FIELDS[1:], values)), dtype=object)).tolist()
+    rows = ((batch.id,) + row for row in zip(*values, hashes))
+    return bulk_load(UploadRowStaging, STAGING_FIELDS + ['row_hash'], rows)
+
+
+def _find_duplicates(stats: Dict) -> pd.DataFrame:
+    """
+    Tüm parçalar okunduktan sonra sicil özetleri üzerinde tek bir gruplama ile
+    dosyada birden fazla geçen sicil numaralarının satırlarını bulur.
+
+    :return: index = staging sırası; kolonlar: key (sicil özeti), row (dosya satırı). Tekrar yoksa boş.
+    """
+    if not stats['sicil_hashes']:
+        return pd.DataFrame({'key': np.array([], dtype='uint64'), 'row': np.array([], dtype='int64')})
+    found = pd.DataFrame({'key': np.concatenate(stats['sicil_hashes']),
+                          'row': np.concatenate(stats['row_numbers'])})
+    return found[found['key'].duplicated(keep=False)]
+
+
+def _resolve_duplicates(rows: pd.DataFrame, policy: str, stats: Dict) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Tekrar eden satırları politikaya göre tek satıra indirir.
+    rows: tekrar eden satırlar, dosya sırasında (STAGING_FIELDS kolonları + row).
+    Kalan satırlar rows ile aynı index'i taşır; MERGE'de ilk satırın yerine birleştirilmiş değerler yazılır.
+    İçerik özeti (stats['content_sum']) kalan satırlara göre güncellenir.
+
+    :return: (kalan satırlar, batch.duplicates raporu)
+    :raises ValidationError: politika REJECT ise (tüm tekrar eden satırlar hata raporunda)
+    """
+    grouped = rows.groupby('kisi_sicilno', sort=False)
+    if policy == DUPLICATE_LAST:
+        kept = rows[grouped.cumcount(ascending=False) == 0]
+    elif policy == DUPLICATE_MERGE:
+        # groupby.first boş (None) değerleri atlar
+        merged = grouped[STAGING_FIELDS[2:]].first()
+        first = rows[grouped.cumcount() == 0]
+        kept = first[['kisi_sicilno', 'row']].join(merged, on='kisi_sicilno')[rows.columns]
+    else:
+        kept = rows[grouped.cumcount() == 0]
+
+    kept_rows = kept.set_index('kisi_sicilno')['row']
+    report = {
+        'policy': policy,
+        'removedRows': len(rows) - len(kept),
+        'groups': [{'sicilno': sicil, 'rows': [int(r) for r in file_rows], 'keptRow': int(kept_rows[sicil])}
+                   for sicil, file_rows in grouped['row'].agg(list).items()],
+    }
+    if policy == DUPLICATE_REJECT:
+        raise _format_errors(
+            f"Dosyada tekrar eden sicil numaraları var: {len(report['groups'])} sicil, {len(rows)} satır",
+            duplicate_report_rows(report),
+        )
+
+    stats['content_sum'] = (stats['content_sum'] - _rows_hash_sum(rows) + _rows_hash_sum(kept)) % CONTENT_HASH_MOD
+    return kept, report
+
+
+def duplicate_report_rows(report: Optional[Dict]) -> List[dict]:
+    """batch.duplicates raporunu hata raporu (CSV) satırlarına çevirir: tekrar eden her satır için bir kayıt."""
+    if not report:
+        return []
+    outcome = {
+        DUPLICATE_FIRST: 'ilk satır tutuldu',
+        DUPLICATE_LAST: 'son satır tutuldu',
+        DUPLICATE_MERGE: 'dolu alanlar ilk satırda birleştirildi',
+        DUPLICATE_REJECT: 'dosya reddedildi',
+    }[report['policy']]
+    errors = []
+    for group in report['groups']:
+        rows = ', '.join(str(r) for r in group['rows'])
+        for row in group['rows']:
+            errors.append({'row': row, 'field': 'sicilno', 'value': group['sicilno'],
+                           'error': f"Sicil No dosyada tekrar ediyor (satırlar: {rows}); {outcome}"})
+    errors.sort(key=lambda e: e['row'])
+    return errors
+
+
+def duplicate_summary(report: Optional[Dict]) -> Optional[Dict]:
+    """İş sonucunda gösterilen kısa özet."""
+    if not report:
+        return None
+    return {'policy': report['policy'], 'sicils': len(report['groups']), 'removedRows': report['removedRows']}
+
+
+def _dedupe_staged(batch: UploadBatch, stats: Dict, policy: str) -> int:
+    """
+    Staging'e yazılmış batch'teki tekrar eden sicil numaralarını çözer.
+    Tekrar eden satırlar veritabanında gruplanarak okunur; id sırası dosya sırasıdır.
+
+    :return: silinen satır sayısı
+    """
+    found = _find_duplicates(stats)
+    if found.empty:
+        return 0
+
+    staged = UploadRowStaging.objects.filter(batch=batch)
+    dup_sicils = (staged.values('kisi_sicilno').annotate(n=Count('id')).filter(n__gt=1)
+                  .values('kisi_sicilno'))
+    rows = pd.DataFrame(
+        list(staged.filter(kisi_sicilno__in=dup_sicils).order_by('id').values_list('id', *STAGING_FIELDS[1:])),
+        columns=['id', *STAGING_FIELDS[1:]], dtype=object,
+    ).set_index('id')
+
+    # Dosya satırı: aynı sicilin n'inci staging satırı, n'inci dosya satırıdır
+    rows['key'] = pd.util.hash_pandas_object(rows['kisi_sicilno'], index=False).to_numpy()
+    rows['nth'] = rows.groupby('key').cumcount().to_numpy()
+    found = found.assign(nth=found.groupby('key').cumcount())
+    rows['row'] = rows.merge(found, on=['key', 'nth'], how='left')['row'].to_numpy()
+    rows = rows.drop(columns=['key', 'nth'])
+
+    kept, report = _resolve_duplicates(rows, policy, stats)
+
+    removed = rows.index.difference(kept.index).tolist()
+    for start in range(0, len(removed), 10_000):
+        UploadRowStaging.objects.filter(id__in=removed[start:start + 10_000]).delete()
+    if policy == DUPLICATE_MERGE:
+        kept = kept.assign(row_hash=row_hash_series(kept))
+        merged = STAGING_FIELDS[2:] + ['row_hash']
+        UploadRowStaging.objects.bulk_update(
+            [UploadRowStaging(id=row_id, **dict(zip(merged, values)))
+             for row_id, values in zip(kept.index, kept[merged].itertuples(index=False))],
+            merged, batch_size=1000,
+        )
+    batch.duplicates = report
+    return len(removed)
+
+
+def _dedupe_values(values: List[list], stats: Dict, policy: str) -> Tuple[List[list], Optional[Dict]]:
+    """prepare_file için _dedupe_staged karşılığı: bellekteki kolon listeleri üzerinde çalışır."""
+    found = _find_duplicates(stats)
+    if found.empty:
+        return values, None
+
+    frame = pd.DataFrame(dict(zip(STAGING_FIELDS[1:], values)), dtype=object)
+    rows = frame.loc[found.index].assign(row=found['row'])
+    kept, report = _resolve_duplicates(rows, policy, stats)
+
+    frame.loc[kept.index, STAGING_FIELDS[1:]] = kept[STAGING_FIELDS[1:]]
+    frame = frame.drop(rows.index.difference(kept.index))
+    return [frame[f].tolist() for f in STAGING_FIELDS[1:]], report
+
+
+def _format_errors(msg: str, errors: List[dict]) -> ValidationError:
+    error_details = []
+    for err in errors[:5]:  # İlk 5 hatayı göster
+        error_details.append(
+            f"Satır {err['row']}, {err['field']}: {err['error']} (Değer: '{err['value']}')"
+        )
+    if len(errors) > 5:
+        error_details.append(f"... ve {len(errors) - 5} hata daha")
+    return ValidationError(msg, error_details, errors=errors)
+
+
+PREVIEW_ROWS = 20
+PREVIEW_MAX_ROWS = 200
+
+
+def preview_file(source, suffix: Optional[str] = None, rows: int = PREVIEW_ROWS) -> Dict:
+    """
+    Dosyanın yalnızca başlığını ve ilk `rows` satırını okuyarak hızlı önizleme üretir:
+    sütun eşlemesi (HEADER_MAP), eksik zorunlu sütunlar, normalize edilmiş örnek satırlar
+    ve örnekteki validasyon hataları. Staging'e yazılmaz; dosyanın geri kalanı okunmaz.
+    CSV ve Parquet/Arrow akış okuyucularıyla, XLSX _xlsx_sample ile okunur.
+
+    :return: {'columns': [{'column', 'field'}], 'missing': [...], 'rows': [...],
+              'errors': [...], 'sampleRows': int, 'validRows': int, 'message': str|None}
+    """
+    rows = max(1, min(rows, PREVIEW_MAX_ROWS))
+    suffix = _source_suffix(source, suffix)
+    try:
+        # pyarrow CSV okuyucusu eşlenmeyen sütunları hiç ayrıştırmaz (ve dosya nesnesini kapatır);
+        # tam sütun listesi önceden başlıktan alınır
+        header = _normalize_header(_read_csv_header(source)) if suffix in ('.csv', '.txt') else None
+        if suffix in ('.xlsx', '.xlsm', '.xltx', '.xltm'):
+            sample = _xlsx_sample(source, rows)
+        else:
+            chunks = _iter_chunks(source, rows, suffix=suffix)
+            try:
+                sample = next(chunks, None)
+            finally:
+                chunks.close()
+    except Exception as e:
+        raise ValidationError(f"Dosya okunamadı: {str(e)}")
+    if sample is None or sample.empty:
+        raise ValidationError("Dosya boş veya okunabilir veri içermiyor")
+
+    header = header if header is not None else list(sample.columns)
+    columns = [{'column': col, 'field': HEADER_MAP.get(_header_key(col))} for col in header]
+
+    is_valid, msg, missing = validate_dataframe_structure(sample, REQUIRED_COLS)
+    if not is_valid:
+        return {'columns': columns, 'missing': missing or [], 'rows': [], 'errors': [],
+                'sampleRows': len(sample), 'validRows': 0, 'message': msg}
+
+    errors, valid_rows = collect_dataframe_errors(sample)
+    normalized = _normalize_df(_map_columns(sample))
+    records = [{'row': int(idx) + 2, **{k: (None if pd.isna(v) else v) for k, v in rec.items()}}
+               for idx, rec in zip(normalized.index, normalized.to_dict('records'))]
+    return {'columns': columns, 'missing': [], 'rows': records, 'errors': errors,
+            'sampleRows': len(sample), 'validRows': valid_rows, 'message': None}
+
+
+def preview_upload(uploaded_file, rows: int = PREVIEW_ROWS, truncated: bool = False) -> Dict:
+    """
+    Yüklenen dosya için preview_file. truncated: tarayıcı büyük CSV'lerin yalnızca başını
+    gönderdiyse yarım kalan son satır atılır (XLSX/Parquet zip/footer yapısı gereği tam gönderilir).
+
+    :raises ValidationError: format/boyut hatası veya okunamayan dosya
+    """
+    is_valid, msg, _ = validate_upload_file(uploaded_file, max_size_bytes=settings.UPLOAD_MAX_BYTES)
     if not is_valid:
         raise ValidationError(msg)
 
-    # 1) Geçici dosyaya yaz
     suffix = Path(uploaded_file.name).suffix
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        for chunk in uploaded_file.chunks():
-            tmp_file.write(chunk)
-        file_path = tmp_file.name
+    if truncated and suffix.lower() in ('.csv', '.txt'):
+        uploaded_file.seek(0)
+        head = uploaded_file.read()
+        source = io.BytesIO(head[:head.rfind(b'\n') + 1] if b'\n' in head else head)
+    else:
+        source = _upload_source(uploaded_file)
+    return preview_file(source, suffix=suffix, rows=rows)
 
-    try:
-        # 2) avukat doğrula
+
+def estimate_row_count(file_path: str) -> Optional[int]:
+    """
+    İlerleme hesabı için dosyadaki veri satırı sayısını ucuz yoldan tahmin eder.
+    CSV'de satır sonları sayılır, XLSX'te sayfa boyutu, Parquet'te metadata okunur. Bilinmiyorsa None.
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix in ('.csv', '.txt'):
+        lines = 0
+        with open(file_path, 'rb') as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b''):
+                lines += block.count(b'\n')
+        return max(lines - 1, 0)
+    if suffix in ('.xlsx', '.xlsm', '.xltx', '.xltm'):
+        from openpyxl import load_workbook
+        wb = load_workbook(file_path, read_only=True)
         try:
-            lawyer = Lawyer.objects.select_for_update().get(id=lawyer_id)
-        except Lawyer.DoesNotExist:
-            raise ValidationError(f"Avukat bulunamadı (ID: {lawyer_id})")
+            max_row = wb.worksheets[0].max_row
+        finally:
+            wb.close()
+        return max_row - 1 if max_row else None
+    if suffix in PARQUET_EXTENSIONS:
+        try:
+            return pq.ParquetFile(file_path).metadata.num_rows
+        except Exception:
+            return None
+    return None
+
 
-        # 3) Dosyayı oku
+def _iter_prepared(source, stats: Dict, sheet: Optional[str] = None,
+                   suffix: Optional[str] = None) -> Iterator[Tuple[List[list], set]]:
+    """
+    Dosyayı (yol veya dosya nesnesi) parça parça okur, doğrular, eşler ve normalize eder.
+    Hatasız her parça için (kolon değer listeleri, status key'leri) üretir; veritabanına dokunmaz.
+    stats sözlüğüne total_rows, valid_rows ve errors yazılır.
+    Okuma, yapı ve satır limiti hatalarında ValidationError fırlatır.
+    """
+    max_rows = settings.UPLOAD_MAX_ROWS
+    chunks = _iter_chunks(source, settings.IMPORT_CHUNK_ROWS, sheet, suffix)
+
+    while True:
+        # Sıradaki parçayı oku
         try:
-            df_raw = _read_to_df(file_path)
+            df_raw = next(chunks, None)
         except Exception as e:
             raise ValidationError(f"Dosya okunamadı: {str(e)}")
+        if df_raw is None:
+            return
 
-        # 4) DataFrame yapı validasyonu
-        is_valid, msg, missing_cols = validate_dataframe_structure(df_raw, REQUIRED_COLS)
-        if not is_valid:
-            details = [f"Eksik sütunlar: {', '.join(missing_cols)}"] if missing_cols else []
-            raise ValidationError(msg, details)
-
-        # 5) DataFrame veri validasyonu
-        is_valid, msg, errors = validate_dataframe_data(df_raw)
-        if not is_valid:
-            error_details = []
-            for err in errors[:5]:  # İlk 5 hatayı göster
-                error_details.append(
-                    f"Satır {err['row']}, {err['field']}: {err['error']} (Değer: '{err['value']}')"
-                )
-            if len(errors) > 5:
-                error_details.append(f"... ve {len(errors) - 5} hata daha")
-
-            raise ValidationError(msg, error_details)
-
-        # 6) batch oluştur
-        batch = UploadBatch.objects.create(
-            lawyer=lawyer,
-            original_filename=uploaded_file.name,
-            file_path=None,  # Artık dosya saklanmıyor
-            row_count=0,
-            status=UploadBatch.STAGED,
-            created_by=created_by,
-        )
+        # DataFrame yapı validasyonu (ilk parçada)
+        if stats['total_rows'] == 0:
+            is_valid, msg, missing_cols = validate_dataframe_structure(df_raw, REQUIRED_COLS)
+            if not is_valid:
+                details = [f"Eksik sütunlar: {', '.join(missing_cols)}"] if missing_cols else []
+                raise ValidationError(msg, details)
 
-        # 7) kolonları eşle → normalize
-        _ensure_required(df_raw)
+        stats['total_rows'] += len(df_raw)
+        if max_rows and stats['total_rows'] > max_rows:
+            raise ValidationError(
+                f"Dosya çok fazla satır içeriyor. Maksimum satır sayısı: {max_rows}"
+            )
+
+        # Parça veri validasyonu
+        chunk_errors, chunk_valid = collect_dataframe_errors(df_raw)
+        stats['valid_rows'] += chunk_valid
+        stats['errors'].extend(chunk_errors)
+        if stats['errors']:
+            # Dosya zaten reddedilecek; kalan parçalar yalnızca tam hata raporu için okunur
+            continue
+
+        # kolonları eşle → normalize
         df = _map_columns(df_raw)
         df = _normalize_df(df)
+        yield _chunk_values(df, stats)
 
-        # 8) satırları staging'e yaz
-        rows = []
-        skipped_rows = []
 
-        for idx, r in df.iterrows():
-            row_num = idx + 2  # Excel satır numarası
+def _new_stats() -> Dict:
+    return {'total_rows': 0, 'valid_rows': 0, 'errors': [], 'content_sum': 0,
+            'sicil_hashes': [], 'row_numbers': []}
 
-            ks = str(r.get('kisi_sicilno') or r.get('sicilno') or '').strip()
-            ad = str(r.get('ad') or '').strip()
-            soyad = str(r.get('soyad') or '').strip()
 
-            # Zorunlu alanlar kontrolü
-            if not ks or not ad or not soyad:
-                skipped_rows.append(row_num)
-                continue
+def _check_stats(stats: Dict, staged_count: int):
+    """Tüm parçalar okunduktan sonra dosyanın kabul edilip edilmeyeceğine karar verir."""
+    if stats['total_rows'] == 0:
+        raise ValidationError("Dosya boş veya okunabilir veri içermiyor")
 
-            # Sicil no validasyonu
-            is_valid, error_msg = validate_sicil_no(ks)
-            if not is_valid:
-                skipped_rows.append(row_num)
-                continue
+    errors = stats['errors']
+    if errors:
+        _, msg = summarize_validation(len(errors), stats['valid_rows'])
+        raise _format_errors(msg, errors)
 
-            rows.append(UploadRowStaging(
-                batch=batch,
-                kisi_sicilno=ks,
-                ad=ad,
-                soyad=soyad,
-                telno=r.get('telno'),
-                mail=r.get('mail'),
-                ilce=r.get('ilce'),
-                adres_aciklama=r.get('adres_aciklama'),
-                notlar=r.get('notlar'),
-                cevap_status_key=(str(r.get('cevap_status_key')).lower() if r.get('cevap_status_key') else None)
-            ))
-
-        # Hiç geçerli satır yoksa
-        if not rows:
-            batch.delete()  # Boş batch oluşturma
-            raise ValidationError(
-                "Dosyada geçerli kayıt bulunamadı",
-                [f"Toplam {len(df)} satır kontrol edildi, hepsi geçersiz"] if len(df) > 0 else []
-            )
+    # Hiç geçerli satır yoksa
+    if not staged_count:
+        raise ValidationError(
+            "Dosyada geçerli kayıt bulunamadı",
+            [f"Toplam {stats['total_rows']} satır kontrol edildi, hepsi geçersiz"]
+        )
 
-        # 9) Bulk insert
-        UploadRowStaging.objects.bulk_create(rows, batch_size=1000)
-        batch.row_count = len(rows)
-        batch.save(update_fields=['row_count'])
 
-        # 10) Yeni status seçeneklerini seed et
-        keys = {r.cevap_status_key for r in rows if r.cevap_status_key}
-        if keys:
-            existing = set(StatusOption.objects.filter(key__in=keys).values_list('key', flat=True))
-            for key in (keys - existing):
-                StatusOption.objects.get_or_create(key=key, defaults={'label': key})
+def _create_batch(lawyer_id: int, original_filename: str, created_by: str = None,
+                  file_hash: Optional[str] = None) -> UploadBatch:
+    """Avukatı kilitleyip boş bir STAGED batch oluşturur (transaction içinde çağrılmalı)."""
+    try:
+        lawyer = Lawyer.objects.select_for_update().get(id=lawyer_id)
+    except Lawyer.DoesNotExist:
+        raise ValidationError(f"Avukat bulunamadı (ID: {lawyer_id})")
 
-        return batch.id, batch.row_count
-    finally:
-        # Geçici dosyayı temizle
-        try:
-            os.unlink(file_path)
-        except:
-            pass
+    return UploadBatch.objects.create(
+        lawyer=lawyer,
+        original_filename=original_filename,
+        file_path=None,  # Artık dosya saklanmıyor
+        row_count=0,
+        status=UploadBatch.STAGED,
+        created_by=created_by,
+        file_sha256=file_hash,
+    )
+
+
+def _seed_status_keys(status_keys: set):
+    """Dosyada geçen yeni status key'leri için StatusOption oluşturur."""
+    if status_keys:
+        existing = set(StatusOption.objects.filter(key__in=status_keys).values_list('key', flat=True))
+        for key in (status_keys - existing):
+            StatusOption.objects.get_or_create(key=key, defaults={'label': key})
+
+
+def prepare_file(file_path: str, sheet: Optional[str] = None,
+                 duplicate_policy: Optional[str] = None) -> Dict:
+    """
+    Dosyayı veritabanına dokunmadan okur, doğrular ve staging'e hazır hale getirir.
+    Ayrı süreçlerde (process pool) paralel çalıştırılabilir; sonuç stage_prepared ile yazılır.
+
+    :param duplicate_policy: dosya içi tekrar eden sicil numaraları için DUPLICATE_POLICIES'ten biri
+                             (boşsa settings.IMPORT_DUPLICATE_POLICY)
+    :return: {'values': kolon listeleri, 'status_keys': set, 'row_count': int, 'total_rows': int,
+              'file_sha256': ham dosya özeti (sayfa seçildiyse None), 'content_hash': içerik özeti,
+              'duplicates': tekrar raporu veya None}
+    :raises ValidationError: Validasyon hatası durumunda
+    """
+    stats = _new_stats()
+    values = [[] for _ in STAGING_FIELDS[1:]]
+    status_keys = set()
+    for chunk_values, chunk_keys in _iter_prepared(file_path, stats, sheet):
+        for acc, col in zip(values, chunk_values):
+            acc.extend(col)
+        status_keys |= chunk_keys
+
+    _check_stats(stats, len(values[0]))
+    values, duplicates = _dedupe_values(values, stats, duplicate_policy or settings.IMPORT_DUPLICATE_POLICY)
+    row_count = len(values[0])
+    return {'values': values, 'status_keys': status_keys,
+            'row_count': row_count, 'total_rows': stats['total_rows'],
+            # Çok sayfalı kitapta ham dosya özeti tek bir avukatın listesini temsil etmez
+            'file_sha256': None if sheet else file_sha256(file_path),
+            'content_hash': content_digest(stats, row_count),
+            'duplicates': duplicates}
+
+
+@transaction.atomic
+def stage_prepared(prepared: Dict, lawyer_id: int, original_filename: str,
+                   created_by: str = None) -> Tuple[int, int]:
+    """
+    prepare_file sonucunu yeni bir batch olarak staging tablosuna yazar.
+    parse_and_stage ile aynı batch/status semantiğine sahiptir.
+
+    :return: (batch_id, row_count)
+    :raises UnchangedUpload: son uygulanan liste ile aynıysa (hiçbir şey yazılmaz)
+    """
+    check_unchanged(lawyer_id, prepared['file_sha256'], prepared['content_hash'])
+    batch = _create_batch(lawyer_id, original_filename, created_by, prepared['file_sha256'])
+    batch.content_hash = prepared['content_hash']
+    batch.duplicates = prepared['duplicates']
+    batch.row_count = _write_rows(batch, prepared['values'])
+    batch.save(update_fields=['row_count', 'content_hash', 'duplicates'])
+    _seed_status_keys(prepared['status_keys'])
+    return batch.id, batch.row_count
+
+
+def _upload_sha256(uploaded_file) -> str:
+    """Yüklemenin ham özeti; chunks() her seferinde dosyanın başından okur."""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _upload_source(uploaded_file):
+    """
+    Okuyuculara verilecek kaynak: yükleme zaten diskteyse (TemporaryUploadedFile)
+    o dosyanın yolu, değilse bellekteki/açık dosya nesnesinin kendisi.
+    Ek bir geçici dosya kopyası oluşturulmaz.
+    """
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        return uploaded_file.temporary_file_path()
+    uploaded_file.seek(0)
+    return uploaded_file.file
+
+
+@transaction.atomic
+def parse_and_stage(uploaded_file, lawyer_id: int, created_by: str = None,
+                    progress: Optional[Callable[[int], None]] = None,
+                    duplicate_policy: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Yüklenen dosyayı işler, veritabanına yazar.
+    Dosya kalıcı olarak saklanmaz ve geçici dosyaya kopyalanmaz: okuyucular
+    yükleme akışından (bellekteki dosya) veya Django'nun diske yazdığı
+    yüklemenin kendi yolundan okur.
+
+    Dosya IMPORT_CHUNK_ROWS satırlık parçalar halinde okunur; her parça
+    eşlenir, normalize edilir, doğrulanır ve staging tablosuna yazılır.
+    Böylece CSV dosyalarında bellek kullanımı dosya boyutundan bağımsızdır.
+    Herhangi bir parçada hata çıkarsa transaction geri alınır.
+
+    Validasyonlar:
+    - Dosya formatı kontrolü (xlsx, csv)
+    - Dosya boyutu kontrolü (settings.UPLOAD_MAX_BYTES)
+    - Satır sayısı kontrolü (settings.UPLOAD_MAX_ROWS, 0 = limitsiz)
+    - Gerekli sütunlar kontrolü
+    - Sicil no validasyonu
+    - Veri satırı validasyonu
+    - Dosya içi tekrar eden sicil numaraları (duplicate_policy: first / last / merge / reject;
+      boşsa settings.IMPORT_DUPLICATE_POLICY). Çözüm raporu batch.duplicates alanına yazılır.
+
+    Ham dosya veya içerik özeti avukatın son uygulanan batch'i ile aynıysa
+    UnchangedUpload fırlatılır ve oluşturulan batch geri alınır.
+
+    :param progress: her parçadan sonra o ana kadar okunan satır sayısıyla çağrılır
+    :return: (batch_id, row_count)
+    :raises ValidationError: Validasyon hatası durumunda
+    :raises UnchangedUpload: dosya son uygulanan liste ile aynıysa
+    """
+    # 0) Dosya validasyonu (format ve boyut)
+    is_valid, msg, _ = validate_upload_file(uploaded_file, max_size_bytes=settings.UPLOAD_MAX_BYTES)
+    if not is_valid:
+        raise ValidationError(msg)
+
+    # 1) Ham özet; aynı dosya tekrar yüklendiyse okumadan dön
+    file_hash = _upload_sha256(uploaded_file)
+    check_unchanged(lawyer_id, file_hash=file_hash)
+
+    # 2) avukat doğrula, batch oluştur (hata olursa transaction ile birlikte geri alınır)
+    batch = _create_batch(lawyer_id, uploaded_file.name, created_by, file_hash)
+
+    # 3) parça parça oku → doğrula → eşle → normalize → staging'e yaz
+    source = _upload_source(uploaded_file)
+    suffix = Path(uploaded_file.name).suffix
+    stats = _new_stats()
+    staged_count = 0
+    status_keys = set()
+    for values, chunk_keys in _iter_prepared(source, stats, suffix=suffix):
+        staged_count += _write_rows(batch, values)
+        status_keys |= chunk_keys
+        if progress:
+            progress(stats['total_rows'])
+
+    _check_stats(stats, staged_count)
+    staged_count -= _dedupe_staged(batch, stats, duplicate_policy or settings.IMPORT_DUPLICATE_POLICY)
+
+    # İçerik aynıysa (ör. yalnızca satır sırası değişmiş) staging geri alınır
+    batch.content_hash = content_digest(stats, staged_count)
+    check_unchanged(lawyer_id, content_hash=batch.content_hash)
+
+    # 4) Satır sayısını kaydet
+    batch.row_count = staged_count
+    batch.save(update_fields=['row_count', 'content_hash', 'duplicates'])
+
+    # 5) Yeni status seçeneklerini seed et
+    _seed_status_keys(status_keys)
+
+    return batch.id, batch.row_count
@@ -0,0 +1,287 @@
+"""
+Arka plan içe aktarma işleri (ImportJob).
+
+Yükleme isteği sadece dosyayı diske yazar ve işi kuyruğa alır (enqueue_import).
+run_import_worker komutu işleri claim_next_job ile alır ve run_job ile
+staging → diff → apply adımlarını çalıştırır. Harici bir broker gerekmez;
+kuyruk veritabanındaki ImportJob tablosudur.
+"""
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction, DatabaseError
+from django.utils import timezone
+
+from app.models import ImportJob, Lawyer
+from app.services.importer import (
+    parse_and_stage, estimate_row_count, UnchangedUpload,
+    DUPLICATE_POLICIES, duplicate_report_rows, duplicate_summary,
+)
+from app.services.diff_service import store_diff
+from app.services.apply_service import apply_diff
+from app.services.bulk_import_service import run_bulk_import
+from app.utils.file_validators import (
+    ValidationError, validate_upload_file, validate_file_size, build_error_report_csv
+)
+
+# İlerleme yüzdesinin adımlara dağılımı
+STAGING_START, STAGING_END = 5, 65
+DIFFING_PROGRESS = 70
+APPLYING_PROGRESS = 80
+
+# İlerleme ayrı bir bağlantıdan yazılır (bkz. settings.DATABASES['jobs'])
+PROGRESS_DB = 'jobs'
+
+
+def error_report_path(token: str) -> Path:
+    return Path(settings.MEDIA_ROOT) / 'reports' / f'{token}.csv'
+
+
+def store_error_report(errors) -> str:
+    """Validasyon hatalarını CSV rapor olarak MEDIA_ROOT/reports altına yazar, token döndürür."""
+    token = uuid.uuid4().hex
+    path = error_report_path(token)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(build_error_report_csv(errors))
+    return token
+
+
+def _save_job_file(uploaded_file) -> Path:
+    """
+    Yüklemeyi kuyruk dizinine yazar. Django yüklemeyi zaten diske yazdıysa
+    (TemporaryUploadedFile) dosya kopyalanmadan taşınır.
+    """
+    job_dir = Path(settings.IMPORT_JOB_DIR)
+    job_dir.mkdir(parents=True, exist_ok=True)
+    path = job_dir / f"{uuid.uuid4().hex}{Path(uploaded_file.name).suffix.lower()}"
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        try:
+            os.replace(uploaded_file.temporary_file_path(), path)
+            return path
+        except OSError:
+            pass  # farklı dosya sistemi: kopyala
+    with open(path, 'wb') as fh:
+        for chunk in uploaded_file.chunks():
+            fh.write(chunk)
+    return path
+
+
+def _duplicate_policy(policy: Optional[str]) -> str:
+    policy = policy or settings.IMPORT_DUPLICATE_POLICY
+    if policy not in DUPLICATE_POLICIES:
+        raise ValidationError(f"Geçersiz tekrar çözümü: {policy} (geçerli: {', '.join(DUPLICATE_POLICIES)})")
+    return policy
+
+
+def enqueue_import(uploaded_file, lawyer_id: int, created_by: str = None,
+                   duplicate_policy: Optional[str] = None, review: bool = False) -> ImportJob:
+    """
+    Dosyanın format/boyut kontrolünü yapar, IMPORT_JOB_DIR altına yazar ve işi kuyruğa alır.
+    Dosyanın içeriği burada okunmaz; istek hemen döner.
+
+    :param duplicate_policy: dosya içi tekrar eden sicil numaraları için çözüm (boşsa ayarlardaki varsayılan)
+    :param review: True ise diff uygulanmaz; batch önizlemeden onaylanmak üzere STAGED kalır
+    :raises ValidationError: format/boyut hatası, geçersiz çözüm veya avukat bulunamazsa
+    """
+    policy = _duplicate_policy(duplicate_policy)
+    is_valid, msg, _ = validate_upload_file(uploaded_file, max_size_bytes=settings.UPLOAD_MAX_BYTES)
+    if not is_valid:
+        raise ValidationError(msg)
+
+    if not Lawyer.objects.filter(id=lawyer_id).exists():
+        raise ValidationError(f"Avukat bulunamadı (ID: {lawyer_id})")
+
+    path = _save_job_file(uploaded_file)
+    return ImportJob.objects.create(
+        lawyer_id=lawyer_id,
+        original_filename=uploaded_file.name,
+        file_path=str(path),
+        created_by=created_by,
+        duplicate_policy=policy,
+        review=review,
+    )
+
+
+def enqueue_bulk_import(uploaded_file, created_by: str = None,
+                        duplicate_policy: Optional[str] = None) -> ImportJob:
+    """
+    Çok avukatlı ZIP arşivini kuyruğa alır. Avukat eşlemesi iş çalışırken yapılır
+    (bkz. bulk_import_service). Tekrar çözümü arşivdeki tüm dosyalara uygulanır.
+
+    :raises ValidationError: dosya ZIP değilse, çözüm geçersizse veya boyut hatası varsa
+    """
+    policy = _duplicate_policy(duplicate_policy)
+    if Path(uploaded_file.name).suffix.lower() != '.zip':
+        raise ValidationError("Toplu içe aktarma için .zip dosyası yükleyin")
+
+    is_valid, msg = validate_file_size(uploaded_file.size, max_size_bytes=settings.UPLOAD_MAX_BYTES)
+    if not is_valid:
+        raise ValidationError(msg)
+
+    path = _save_job_file(uploaded_file)
+    return ImportJob.objects.create(
+        kind=ImportJob.KIND_ZIP,
+        original_filename=uploaded_file.name,
+        file_path=str(path),
+        created_by=created_by,
+        duplicate_policy=policy,
+    )
+
+
+def fail_stale_jobs(timeout_minutes: Optional[int] = None) -> int:
+    """
+    IMPORT_JOB_TIMEOUT_MINUTES'tan uzun süredir RUNNING olan işleri FAILED yapar ve kuyruk
+    dosyalarını siler. Öldürülen veya çöken bir worker'ın bıraktığı iş aksi halde hiç
+    bitmez ve ilerleme sayfası onu sonsuza kadar sorgular.
+
+    :return: başarısız sayılan iş sayısı
+    """
+    minutes = timeout_minutes or settings.IMPORT_JOB_TIMEOUT_MINUTES
+    cutoff = timezone.now() - timedelta(minutes=minutes)
+    with transaction.atomic():
+        stale = list(ImportJob.objects.select_for_update(skip_locked=True)
+                     .filter(status=ImportJob.RUNNING, started_at__lt=cutoff))
+        for job in stale:
+            _finish(job, ImportJob.FAILED,
+                    message=f"İş {minutes} dakika içinde tamamlanmadı (worker durmuş olabilir). "
+                            f"Dosyayı yeniden yükleyin.")
+            Path(job.file_path).unlink(missing_ok=True)
+    return len(stale)
+
+
+def claim_next_job() -> Optional[ImportJob]:
+    """
+    Kuyruktaki en eski işi RUNNING olarak işaretleyip döndürür.
+    SKIP LOCKED sayesinde birden fazla worker aynı işi almaz.
+    Önce yarım kalmış (zaman aşımına uğramış) işler başarısız sayılır (bkz. fail_stale_jobs).
+    """
+    fail_stale_jobs()
+    with transaction.atomic():
+        job = (ImportJob.objects.select_for_update(skip_locked=True)
+               .filter(status=ImportJob.QUEUED)
+               .order_by('created_at', 'id')
+               .first())
+        if job is None:
+            return None
+        job.status = ImportJob.RUNNING
+        job.stage = ImportJob.STAGE_STAGING
+        job.progress = STAGING_START
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'stage', 'progress', 'started_at'])
+        return job
+
+
+def _report(job_id: int, stage: str, progress: int):
+    """
+    İlerlemeyi ayrı bağlantıdan yazar. İlerleme bilgisi en iyi çaba ile tutulur;
+    yazılamaması içe aktarmayı durdurmamalıdır.
+    """
+    try:
+        ImportJob.objects.using(PROGRESS_DB).filter(id=job_id).update(stage=stage, progress=progress)
+    except DatabaseError:
+        pass
+
+
+def _finish(job: ImportJob, status: str, **fields):
+    job.status = status
+    job.stage = ImportJob.STAGE_DONE if status == ImportJob.DONE else ImportJob.STAGE_FAILED
+    job.finished_at = timezone.now()
+    if status == ImportJob.DONE:
+        job.progress = 100
+    for name, value in fields.items():
+        setattr(job, name, value)
+    job.save()
+
+
+def run_job(job: ImportJob) -> ImportJob:
+    """
+    Claim edilmiş bir işi çalıştırır: parse_and_stage → store_diff → apply_diff.
+    İnceleme modundaki (review) işlerde apply_diff atlanır. ZIP işleri run_bulk_import'a yönlendirilir.
+    Sonuç veya hata bilgisi job kaydına yazılır; kuyruk dosyası her durumda silinir.
+    """
+    try:
+        if job.kind == ImportJob.KIND_ZIP:
+            _run_bulk_job(job)
+            return job
+
+        total = estimate_row_count(job.file_path)
+        last = [STAGING_START]
+
+        def on_rows(rows_read: int):
+            if not total:
+                return
+            pct = STAGING_START + int((STAGING_END - STAGING_START) * min(rows_read / total, 1))
+            if pct != last[0]:
+                last[0] = pct
+                _report(job.id, ImportJob.STAGE_STAGING, pct)
+
+        with open(job.file_path, 'rb') as fh:
+            batch_id, row_count = parse_and_stage(
+                File(fh, name=job.original_filename), job.lawyer_id,
+                created_by=job.created_by, progress=on_rows,
+                duplicate_policy=job.duplicate_policy,
+            )
+        job.batch_id = batch_id
+        job.save(update_fields=['batch'])
+        duplicates = job.batch.duplicates
+
+        _report(job.id, ImportJob.STAGE_DIFFING, DIFFING_PROGRESS)
+        diff = store_diff(batch_id)
+
+        if job.review:
+            # İnceleme modu: batch STAGED kalır; önizlemeden tamamen veya seçilerek onaylanır
+            result = {"ok": True, "message": "Değişiklikler onay bekliyor", "counts": diff["counts"],
+                      "review": True}
+        else:
+            _report(job.id, ImportJob.STAGE_APPLYING, APPLYING_PROGRESS)
+            result = apply_diff(batch_id, actor=job.created_by, diff=diff)
+
+        # Çözülen tekrarlar hata raporu olarak indirilebilir (dosya yine de uygulanır)
+        _finish(job, ImportJob.DONE if result.get('ok') else ImportJob.FAILED,
+                message=result.get('message'),
+                result_json={'rowCount': row_count, **result, 'duplicates': duplicate_summary(duplicates)},
+                error_report=store_error_report(duplicate_report_rows(duplicates)) if duplicates else None)
+    except UnchangedUpload as uu:
+        # Son uygulanan liste ile aynı: diff/apply atlandı
+        _finish(job, ImportJob.DONE, message=uu.message,
+                result_json={'rowCount': uu.row_count, **uu.as_result()})
+    except ValidationError as ve:
+        _finish(job, ImportJob.FAILED,
+                message=ve.message, details=ve.details,
+                error_report=store_error_report(ve.errors) if ve.errors else None)
+    except Exception as e:
+        _finish(job, ImportJob.FAILED, message=f"Beklenmeyen hata: {e}")
+    finally:
+        Path(job.file_path).unlink(missing_ok=True)
+    return job
+
+
+def _run_bulk_job(job: ImportJob):
+    """
+    ZIP işini çalıştırır. İlerleme tamamlanan dosya sayısına göre raporlanır.
+    Dosya hataları tek bir CSV raporda (Dosya kolonu ile) toplanır.
+    """
+    def on_files(done: int, total: int):
+        pct = STAGING_START + int((100 - STAGING_START) * done / total) if total else STAGING_START
+        _report(job.id, ImportJob.STAGE_STAGING, min(pct, 99))
+
+    report = run_bulk_import(job.file_path, created_by=job.created_by, progress=on_files,
+                             duplicate_policy=job.duplicate_policy)
+
+    all_errors = []
+    for item in report['files']:
+        errors = item.pop('errors')
+        item['errorCount'] = len(errors)
+        label = f"{item['file']} [{item['sheet']}]" if item['sheet'] else item['file']
+        all_errors.extend({**err, 'file': label} for err in errors + item.pop('duplicateRows', []))
+
+    totals = report['totals']
+    _finish(job, ImportJob.DONE if totals['failed'] == 0 else ImportJob.FAILED,
+            message=f"{totals['succeeded']}/{totals['files']} liste içe aktarıldı",
+            result_json=report,
+            error_report=store_error_report(all_errors) if all_errors else None)
@@ -0,0 +1,124 @@
+"""
+Staging saklama (retention) politikası.
+
+Uygulanmış (APPLIED) veya reddedilmiş (REJECTED) batch'lerin UploadRowStaging satırları
+diff/apply bittikten sonra kullanılmaz. STAGING_RETENTION_DAYS günden eski batch'lerin
+satırları purge_staging komutu ile silinir; UploadBatch başlığı (dosya adı, satır sayısı,
+parmak izleri) ve BatchDiff sayaçları korunur, BatchDiff.diff_json ve satırları (BatchDiffRow)
+boşaltılır.
+
+Silme, batch_id indeksini kullanan sınırlı boyutlu parçalar halinde ve her parça ayrı
+transaction'da yapılır; böylece uzun süren kilitler ve büyük WAL patlamaları oluşmaz.
+"""
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from app.models import UploadBatch, UploadRowStaging, BatchDiff, BatchDiffRow
+
+PURGEABLE_STATUSES = (UploadBatch.APPLIED, UploadBatch.REJECTED)
+
+
+def purgeable_batches(days: int):
+    """Staging satırları silinebilecek batch'ler (en eskiden yeniye)."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return (UploadBatch.objects
+            .filter(status__in=PURGEABLE_STATUSES, created_at__lt=cutoff, purged_at__isnull=True)
+            .order_by('id'))
+
+
+def _delete_chunk_postgres(batch_id: int, chunk_rows: int) -> List[int]:
+    """
+    Bir parçayı siler ve silinen satırların disk üzerindeki boyutlarını döndürür.
+    Alt sorgu batch_id indeksini tarar; ORDER BY yoktur, böylece her parça batch'in
+    tüm satırlarını sıralamadan LIMIT kadar satırda durur.
+    """
+    table = connection.ops.quote_name(UploadRowStaging._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE id IN ("
+            f"  SELECT id FROM {table} WHERE batch_id = %s LIMIT %s"
+            f") RETURNING pg_column_size({table}.*)",
+            [batch_id, chunk_rows],
+        )
+        return [size for (size,) in cursor.fetchall()]
+
+
+def _delete_chunk(batch_id: int, chunk_rows: int) -> List[int]:
+    """Veritabanından bağımsız karşılık; satır boyutu ölçülemez."""
+    ids = list(UploadRowStaging.objects.filter(batch_id=batch_id)
+               .order_by().values_list('id', flat=True)[:chunk_rows])
+    if ids:
+        UploadRowStaging.objects.filter(id__in=ids).delete()
+    return [0] * len(ids)
+
+
+def _relation_size() -> Optional[int]:
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_total_relation_size(%s)", [UploadRowStaging._meta.db_table])
+        return cursor.fetchone()[0]
+
+
+def vacuum_staging():
+    """Silinen satırların yerini yeniden kullanılabilir yapar (yalnızca PostgreSQL; transaction dışında)."""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"VACUUM (ANALYZE) {connection.ops.quote_name(UploadRowStaging._meta.db_table)}")
+
+
+def purge_staging(days: Optional[int] = None, chunk_rows: int = 5000, dry_run: bool = False,
+                  vacuum: bool = False, progress: Optional[Callable[[UploadBatch, int], None]] = None) -> Dict:
+    """
+    Saklama süresi dolan batch'lerin staging satırlarını siler.
+
+    :param days: saklama süresi (boşsa settings.STAGING_RETENTION_DAYS)
+    :param chunk_rows: her DELETE ifadesinde en fazla silinecek satır
+    :param dry_run: yalnızca silinecek batch/satır sayısını raporla
+    :param vacuum: bitince VACUUM (ANALYZE) çalıştır ve tablo boyutunu tekrar ölç
+    :param progress: progress(batch, silinen_satır) — her batch bittiğinde çağrılır
+    :return: {'batches', 'rows', 'diffs', 'bytes' (PostgreSQL dışında None),
+              'tableBytesBefore', 'tableBytesAfter', 'dryRun'}
+    """
+    days = settings.STAGING_RETENTION_DAYS if days is None else days
+    batches = purgeable_batches(days)
+    report = {'batches': 0, 'rows': 0, 'diffs': 0, 'bytes': None, 'dryRun': dry_run,
+              'tableBytesBefore': _relation_size(), 'tableBytesAfter': None}
+
+    if dry_run:
+        report['batches'] = batches.count()
+        report['rows'] = UploadRowStaging.objects.filter(batch__in=batches).count()
+        return report
+
+    delete_chunk = _delete_chunk_postgres if connection.vendor == 'postgresql' else _delete_chunk
+    reclaimed = 0
+    for batch in list(batches):
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                sizes = delete_chunk(batch.id, chunk_rows)
+            deleted += len(sizes)
+            reclaimed += sum(sizes)
+            if len(sizes) < chunk_rows:
+                break
+
+        with transaction.atomic():
+            report['diffs'] += BatchDiff.objects.filter(batch=batch).exclude(diff_json={}).update(diff_json={})
+            BatchDiffRow.objects.filter(diff__batch=batch).delete()
+            UploadBatch.objects.filter(id=batch.id).update(purged_at=timezone.now())
+        report['batches'] += 1
+        report['rows'] += deleted
+        if progress:
+            progress(batch, deleted)
+
+    if connection.vendor == 'postgresql':
+        report['bytes'] = reclaimed
+    if vacuum:
+        vacuum_staging()
+    report['tableBytesAfter'] = _relation_size()
+    return report
@@ -0,0 +1,250 @@
+"""
+Parçalı (chunked) ve kaldığı yerden devam edebilen yükleme.
+
+  1) open_session: dosya adı ve boyutu ile oturum açılır; dosya UPLOAD_SESSION_DIR altında
+     tam boyutta (seyrek) ayrılır.
+  2) write_chunk: parça n, istek gövdesinden akış halinde geçici bir dosyaya yazılır;
+     SHA-256'sı istemcinin gönderdiğiyle eşleşirse dosyada n * chunk_size konumuna kopyalanır
+     ve UploadChunk olarak onaylanır.
+     Bağlantı koparsa istemci onaylı parçaları oturumdan okuyup eksik olanlardan devam eder;
+     aynı parçanın tekrar gönderilmesi zararsızdır.
+  3) finalize_session: tüm parçalar onaylıysa dosya kopyalanmadan kuyruk dizinine taşınır ve
+     normal yükleme gibi ImportJob oluşturulur (staging run_job → parse_and_stage ile yapılır).
+
+Hiçbir istek dosyanın tamamını taşımaz; parça gövdesi belleğe alınmadan diske yazılır.
+"""
+import hashlib
+import shutil
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from app.models import ImportJob, UploadChunk, UploadSession
+from app.services.importer import file_sha256
+from app.services.job_service import enqueue_bulk_import, enqueue_import
+from app.utils.file_validators import ValidationError, validate_file_extension, validate_file_size
+
+MIN_CHUNK_BYTES = 64 * 1024
+READ_BLOCK = 64 * 1024
+
+
+class _AssembledFile(File):
+    """
+    Birleştirilmiş oturum dosyası. temporary_file_path sayesinde kuyruğa alınırken
+    (job_service._save_job_file) TemporaryUploadedFile gibi kopyalanmadan taşınır.
+    """
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def _chunk_size(requested: Optional[int]) -> int:
+    limit = settings.UPLOAD_CHUNK_BYTES
+    return max(MIN_CHUNK_BYTES, min(int(requested or limit), limit))
+
+
+def open_session(filename: str, size: int, chunk_size: Optional[int] = None,
+                 sha256: Optional[str] = None, created_by: str = None) -> UploadSession:
+    """
+    Yükleme oturumu açar. ZIP arşivleri toplu içe aktarma olarak sonlandırılır.
+
+    :param chunk_size: istenen parça boyutu (MIN_CHUNK_BYTES..UPLOAD_CHUNK_BYTES aralığına çekilir)
+    :param sha256: tüm dosyanın beklenen SHA-256'sı (opsiyonel)
+    :raises ValidationError: desteklenmeyen format, boyut hatası veya açık oturum sınırı aşıldı
+    """
+    filename = Path(filename or '').name
+    if Path(filename).suffix.lower() != '.zip':
+        is_valid, msg = validate_file_extension(filename)
+        if not is_valid:
+            raise ValidationError(msg)
+    is_valid, msg = validate_file_size(size, max_size_bytes=settings.UPLOAD_MAX_BYTES)
+    if not is_valid:
+        raise ValidationError(msg)
+
+    # Her oturum diskte tam boyutta yer ayırır; kullanıcı başına açık oturum sayısı sınırlıdır
+    active = UploadSession.objects.filter(
+        created_by=created_by, status=UploadSession.OPEN,
+        updated_at__gte=timezone.now() - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+    ).count()
+    if active >= settings.UPLOAD_SESSION_MAX_OPEN:
+        raise ValidationError(f"En fazla {settings.UPLOAD_SESSION_MAX_OPEN} açık yükleme oturumunuz olabilir",
+                              details=["Devam eden yüklemeleri tamamlayın veya iptal edin"])
+
+    token = uuid.uuid4().hex
+    directory = Path(settings.UPLOAD_SESSION_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{token}{Path(filename).suffix.lower()}"
+    with open(path, 'wb') as fh:
+        fh.truncate(size)
+
+    return UploadSession.objects.create(
+        token=token,
+        original_filename=filename,
+        size=size,
+        chunk_size=_chunk_size(chunk_size),
+        sha256=(sha256 or '').lower() or None,
+        file_path=str(path),
+        created_by=created_by,
+    )
+
+
+def get_session(token: str) -> UploadSession:
+    try:
+        return UploadSession.objects.get(token=token)
+    except UploadSession.DoesNotExist:
+        raise ValidationError(f"Yükleme oturumu bulunamadı: {token}")
+
+
+def session_state(session: UploadSession) -> Dict:
+    """Onaylı parçalar ve devam edilecek ilk eksik parça (hepsi alındıysa None)."""
+    received = sorted(session.chunks.values_list('index', flat=True))
+    received_set = set(received)
+    next_chunk = next((i for i in range(session.total_chunks) if i not in received_set), None)
+    return {
+        'token': session.token,
+        'filename': session.original_filename,
+        'size': session.size,
+        'chunkSize': session.chunk_size,
+        'totalChunks': session.total_chunks,
+        'receivedChunks': received,
+        'nextChunk': next_chunk,
+        'status': session.status,
+        'jobId': session.job_id,
+    }
+
+
+def _receive_chunk(stream, path: Path, expected: int):
+    """
+    Parçayı stream'den path'e yazar (en fazla expected + 1 byte okunur; fazlası boyut hatasıdır).
+
+    :return: (okunan byte sayısı, SHA-256 hex)
+    :raises OSError: bağlantı koptu veya disk hatası
+    """
+    digest = hashlib.sha256()
+    received = 0
+    with open(path, 'wb') as fh:
+        while received <= expected:
+            block = stream.read(min(READ_BLOCK, expected + 1 - received)) if stream else b''
+            if not block:
+                break
+            digest.update(block)
+            fh.write(block)
+            received += len(block)
+    return received, digest.hexdigest()
+
+
+def write_chunk(session: UploadSession, index: int, stream, sha256: str) -> UploadChunk:
+    """
+    Parçayı stream'den geçici dosyaya okur, boyutunu ve SHA-256'sını doğrular, ardından
+    dosyadaki yerine kopyalayıp onaylar. Ağdan okuma transaction dışında yapılır; oturum
+    satırı yalnızca kopyalama ve onay sırasında kilitlenir (finalize_session aynı kilidi
+    alır). Boyutu veya özeti tutmayan parça yazılmaz (istemci tekrar gönderir).
+
+    :raises ValidationError: oturum kapalı, parça numarası/boyutu geçersiz veya özet uyuşmuyor
+    """
+    if not sha256:
+        raise ValidationError("Parça özeti (X-Chunk-SHA256) zorunlu")
+    if session.status != UploadSession.OPEN:
+        raise ValidationError("Yükleme oturumu tamamlanmış")
+    if not 0 <= index < session.total_chunks:
+        raise ValidationError(f"Geçersiz parça numarası: {index} (0..{session.total_chunks - 1})")
+
+    offset = index * session.chunk_size
+    expected = min(session.chunk_size, session.size - offset)
+    part = Path(f"{session.file_path}.{index}.{uuid.uuid4().hex[:8]}.part")
+    try:
+        try:
+            received, digest = _receive_chunk(stream, part, expected)
+        except OSError:
+            raise ValidationError(f"Parça {index} okunamadı (bağlantı kesilmiş olabilir)")
+        if received != expected:
+            raise ValidationError(f"Parça {index} boyutu hatalı: {received} byte (beklenen {expected})")
+        if digest != sha256.lower():
+            raise ValidationError(f"Parça {index} özeti uyuşmuyor")
+
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(id=session.id)
+            if session.status != UploadSession.OPEN:
+                raise ValidationError("Yükleme oturumu tamamlanmış")
+            with open(part, 'rb') as src, open(session.file_path, 'r+b') as dst:
+                dst.seek(offset)
+                shutil.copyfileobj(src, dst, READ_BLOCK * 16)
+            chunk, _ = UploadChunk.objects.update_or_create(
+                session=session, index=index, defaults={'size': received, 'sha256': digest})
+            UploadSession.objects.filter(id=session.id).update(updated_at=timezone.now())
+        return chunk
+    finally:
+        part.unlink(missing_ok=True)
+
+
+def finalize_session(token: str, lawyer_id: Optional[int] = None, created_by: str = None,
+                     duplicate_policy: Optional[str] = None, review: bool = False) -> ImportJob:
+    """
+    Tüm parçalar alındıysa dosyayı kuyruğa alır (ZIP → enqueue_bulk_import, diğerleri →
+    enqueue_import). Kuyruğa alma doğrulaması başarısız olursa oturum açık kalır;
+    istemci parametreleri düzeltip tekrar sonlandırabilir. review yalnızca tek avukat
+    dosyalarında kullanılır (ZIP arşivleri her zaman uygulanır).
+
+    :raises ValidationError: eksik parça, dosya özeti uyuşmazlığı veya kuyruğa alma hatası
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().filter(token=token).first()
+        if session is None:
+            raise ValidationError(f"Yükleme oturumu bulunamadı: {token}")
+        if session.status != UploadSession.OPEN:
+            raise ValidationError("Yükleme oturumu zaten tamamlanmış", details=[f"İş: {session.job_id}"])
+
+        state = session_state(session)
+        if state['nextChunk'] is not None:
+            missing = session.total_chunks - len(state['receivedChunks'])
+            raise ValidationError(f"Eksik parça var: {missing} parça (ilk eksik: {state['nextChunk']})")
+
+        if session.sha256:
+            if file_sha256(session.file_path) != session.sha256:
+                raise ValidationError("Dosya özeti (SHA-256) uyuşmuyor; yükleme bozulmuş olabilir")
+
+        with open(session.file_path, 'rb') as fh:
+            assembled = _AssembledFile(fh, name=session.original_filename)
+            if Path(session.original_filename).suffix.lower() == '.zip':
+                job = enqueue_bulk_import(assembled, created_by=created_by or session.created_by,
+                                          duplicate_policy=duplicate_policy)
+            else:
+                if not lawyer_id:
+                    raise ValidationError("Avukat (lawyerId) zorunlu")
+                job = enqueue_import(assembled, lawyer_id, created_by=created_by or session.created_by,
+                                     duplicate_policy=duplicate_policy, review=review)
+
+        session.status = UploadSession.COMPLETE
+        session.job = job
+        session.save(update_fields=['status', 'job', 'updated_at'])
+        session.chunks.all().delete()
+    return job
+
+
+def abort_session(token: str):
+    """Oturumu ve diskteki dosyasını siler."""
+    session = get_session(token)
+    Path(session.file_path).unlink(missing_ok=True)
+    session.delete()
+
+
+def purge_expired_sessions(hours: Optional[int] = None) -> int:
+    """
+    Süresi dolan açık oturumları (son parçadan bu yana `hours` saat geçmiş) dosyalarıyla
+    birlikte, tamamlanmışları yalnızca kayıt olarak siler. Silinen oturum sayısını döndürür.
+    """
+    hours = settings.UPLOAD_SESSION_TTL_HOURS if hours is None else hours
+    expired = UploadSession.objects.filter(updated_at__lt=timezone.now() - timedelta(hours=hours))
+    for path in expired.filter(status=UploadSession.OPEN).values_list('file_path', flat=True):
+        Path(path).unlink(missing_ok=True)
+        # Yarıda kalan parça alımlarının geçici dosyaları (bkz. write_chunk)
+        for part in Path(path).parent.glob(f"{Path(path).name}.*.part"):
+            part.unlink(missing_ok=True)
+    count = expired.count()
+    expired.delete()
+    return count
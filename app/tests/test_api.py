@@ -0,0 +1,23 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from app.services.importer import PREVIEW_MAX_ROWS
+
+CSV = ("sicilno,ad,soyad\n" + "".join(f"{1000 + i},Ad{i},Soyad{i}\n" for i in range(PREVIEW_MAX_ROWS + 50))).encode()
+
+
+class UploadPreviewApiTests(TestCase):
+
+    def _preview(self, rows):
+        upload = SimpleUploadedFile("liste.csv", CSV, content_type="text/csv")
+        return self.client.post("/api/uploads/preview/", {"file": upload, "rows": rows})
+
+    def test_invalid_rows_is_400(self):
+        response = self._preview("abc")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"], "rows sayı olmalı")
+
+    def test_rows_are_clamped(self):
+        response = self._preview(PREVIEW_MAX_ROWS * 10)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["rows"]), PREVIEW_MAX_ROWS)
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import SimpleTestCase, TestCase
+
+from app.models import BatchDiff, BatchDiffRow, ImportJob, Lawyer, UploadBatch
+from app.services.bulk_loader import _copy_value, bulk_load, insert_rows, update_rows
+
+
+class InsertRowsTests(TestCase):
+    """COPY olmayan yol değerleri alanların dönüşümünden geçirmeli (update_rows gibi)."""
+
+    def test_datetime_and_json_round_trip(self):
+        started = datetime(2026, 3, 1, 12, 30, tzinfo=dt_timezone(timedelta(hours=3)))
+        details = [{'satır': 2, 'hata': 'Sicil No çok kısa'}]
+
+        insert_rows(ImportJob, ['original_filename', 'file_path', 'started_at', 'details'],
+                    [('liste.csv', '/tmp/liste.csv', started, details)])
+
+        job = ImportJob.objects.get(original_filename='liste.csv')
+        self.assertEqual(job.started_at, started)
+        self.assertEqual(job.details, details)
+
+    def test_bulk_load_fk_and_json(self):
+        lawyer = Lawyer.objects.create(sicil_no='T1', ad='Test', soyad='Avukat')
+        diff = BatchDiff.objects.create(batch=UploadBatch.objects.create(lawyer=lawyer, original_filename='a.csv'),
+                                       diff_json={})
+        rows = [(diff.id, 'added', str(1000 + i), {'kisi_sicilno': str(1000 + i), 'ad': 'Işık'}) for i in range(5)]
+
+        self.assertEqual(bulk_load(BatchDiffRow, ['diff', 'section', 'kisi_sicilno', 'data'], rows), 5)
+        self.assertEqual(list(diff.rows.order_by('kisi_sicilno').values_list('data', flat=True)),
+                         [row[3] for row in rows])
+
+    def test_update_rows(self):
+        jobs = [ImportJob.objects.create(original_filename=f'{i}.csv', file_path='x') for i in range(3)]
+        finished = datetime(2026, 3, 1, 9, 0, tzinfo=dt_timezone.utc)
+
+        update_rows(ImportJob, ['finished_at', 'details'], [(job.id, finished, ['ok']) for job in jobs])
+
+        self.assertEqual(set(ImportJob.objects.values_list('finished_at', flat=True)), {finished})
+        self.assertEqual(set(map(tuple, ImportJob.objects.values_list('details', flat=True))), {('ok',)})
+
+
+class CopyValueTests(SimpleTestCase):
+
+    def test_copy_text_format(self):
+        self.assertEqual(_copy_value(None), '\\N')
+        self.assertEqual(_copy_value(float('nan')), '\\N')
+        self.assertEqual(_copy_value(True), 't')
+        self.assertEqual(_copy_value('a\tb\nc\\'), 'a\\tb\\nc\\\\')
+        self.assertEqual(_copy_value({'ad': 'Işık', 'not': 'a\tb'}), '{"ad": "Işık", "not": "a\\\\tb"}')
@@ -0,0 +1,226 @@
+import random
+
+from django.test import TestCase, override_settings
+
+from app.models import BatchDiffRow, Lawyer, LawyerPerson, Person, StatusOption, UploadBatch, UploadRowStaging
+from app.services import importer
+from app.services.diff_service import (
+    COMPARE_FIELDS, DIFF_SECTIONS, _field_changed, backfill_row_hashes, compute_diff, diff_page,
+)
+from app.utils.file_validators import ValidationError
+from app.utils.normalization import row_hash
+
+# (kisi_sicilno, alanlar): mevcut liste; cevap_status None → status yok
+CURRENT = [
+    ('1001', dict(ad='Ali', soyad='Yılmaz', mail='ali@example.com', telno='05321112233', status='geliyor')),
+    ('1002', dict(ad='Ayşe', soyad='Öz', status='geliyor')),
+    ('1003', dict(ad='IŞIK', soyad='İNCE', mail='Isik@Example.com', telno='0532 111 22 33')),
+    ('1004', dict(ad='Can', soyad='Er', notlar=' not ')),
+    ('1005', dict(ad='Deniz', soyad='Ak', status='geliyor')),
+    ('1006', dict(ad='Ece', soyad='Su', ilce=None)),
+    ('1007', dict(ad='Filiz', soyad='Tan')),
+    ('1008', dict(ad='Gül', soyad='Ün', active=False)),
+    ('1010', dict(ad='Hakan', soyad='Kaya')),
+    ('', dict(ad='Sicilsiz', soyad='Kayıt')),
+]
+# Staging satırları id sırasında; 1010 iki kez geçer, son satır geçerlidir
+STAGED = [
+    ('1001', dict(ad='Ali', soyad='Yılmaz', mail='ali@example.com', telno='05321112233', cevap_status_key='geliyor')),
+    ('1002', dict(ad='Ayşe Nur', soyad='Öz', cevap_status_key='geliyor')),
+    ('1003', dict(ad='ışık', soyad='ince', mail='isik@example.com', telno='05321112233')),
+    ('1004', dict(ad='Can', soyad='Er', notlar='not')),
+    ('1005', dict(ad='Deniz', soyad='Ak', cevap_status_key='gelmiyor')),
+    ('1006', dict(ad='Ece', soyad='Su', ilce='')),
+    ('1008', dict(ad='Gül', soyad='Ün')),
+    ('1009', dict(ad='Hale', soyad='Işık', ilce='Kadıköy')),
+    ('1010', dict(ad='Hakan', soyad='Kara')),
+    ('1010', dict(ad='Hakan', soyad='Kaya')),
+    ('  ', dict(ad='Boş', soyad='Sicil')),
+]
+
+
+def _legacy_diff(lawyer_id: int, batch_id: int):
+    """Tuple snapshot'lardan önceki model nesnesi + satır sözlüğü yolu (referans)."""
+    current = {}
+    for lp in LawyerPerson.objects.filter(lawyer_id=lawyer_id, active=True).select_related("cevap_status"):
+        ks = (lp.kisi_sicilno or "").strip()
+        if not ks:
+            continue
+        current[ks] = {
+            "kisi_sicilno": ks, "ad": lp.ad or "", "soyad": lp.soyad or "", "mail": lp.mail or "",
+            "telno": lp.telno or "", "ilce": lp.ilce or "", "adres_aciklama": lp.adres_aciklama or "",
+            "notlar": lp.notlar or "", "cevap_status_key": lp.cevap_status.key if lp.cevap_status_id else "",
+        }
+    new = {}
+    for r in UploadRowStaging.objects.filter(batch_id=batch_id).order_by("id"):
+        ks = (r.kisi_sicilno or "").strip()
+        if not ks:
+            continue
+        new[ks] = {"kisi_sicilno": ks, **{f: (getattr(r, f) or "").strip() for f in COMPARE_FIELDS}}
+
+    added = [new[k] for k in sorted(new.keys() - current.keys())]
+    removed = [current[k] for k in sorted(current.keys() - new.keys())]
+    changed = []
+    for ks in sorted(current.keys() & new.keys()):
+        fields = [f for f in COMPARE_FIELDS if _field_changed(current[ks], new[ks], f)]
+        if fields:
+            changed.append({"kisi_sicilno": ks, "fields": fields, "before": current[ks], "after": new[ks]})
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+class DiffFixtureMixin:
+    """Her değişiklik türünden en az bir satır içeren mevcut liste ve staging batch'i (row_hash NULL)."""
+
+    def setUp(self):
+        statuses = {key: StatusOption.objects.create(key=key, label=key.title()) for key in ('geliyor', 'gelmiyor')}
+        self.lawyer = Lawyer.objects.create(sicil_no='A1', ad='Test', soyad='Avukat')
+        other = Lawyer.objects.create(sicil_no='A2', ad='Diğer', soyad='Avukat')
+        person = Person.objects.create(kisi_sicilno='P1', ad='Ref', soyad='Kişi')
+
+        people = []
+        for ks, fields in CURRENT:
+            fields = dict(fields)
+            status = statuses.get(fields.pop('status', None))
+            people.append(LawyerPerson(lawyer=self.lawyer, person=person, kisi_sicilno=ks, cevap_status=status,
+                                       **fields))
+        # Başka avukatın aynı sicilli kaydı diff'e karışmamalı
+        people.append(LawyerPerson(lawyer=other, person=person, kisi_sicilno='1009', ad='Hale', soyad='Işık'))
+        LawyerPerson.objects.bulk_create(people)
+
+        self.batch = UploadBatch.objects.create(lawyer=self.lawyer, original_filename='liste.csv')
+        UploadRowStaging.objects.bulk_create(
+            UploadRowStaging(batch=self.batch, kisi_sicilno=ks, **fields) for ks, fields in STAGED)
+
+
+class RowHashTests(DiffFixtureMixin, TestCase):
+    """row_hash'li karşılaştırma, özetlerin olmadığı (metin karşılaştırmalı) yol ile aynı sonucu vermeli."""
+
+    def test_sql_diff_same_with_and_without_hashes(self):
+        with override_settings(DIFF_ENGINE='sql'):
+            without = compute_diff(self.batch.id)
+            backfill_row_hashes()
+            self.assertFalse(LawyerPerson.objects.filter(row_hash__isnull=True).exists())
+            self.assertFalse(UploadRowStaging.objects.filter(row_hash__isnull=True).exists())
+            with_hashes = compute_diff(self.batch.id)
+
+        self.assertEqual(with_hashes, without)
+        self.assertEqual(with_hashes['counts'], {'added': 2, 'removed': 1, 'changed': 2})
+        self.assertEqual([row['kisi_sicilno'] for row in with_hashes['changed']], ['1002', '1005'])
+
+    def test_write_paths_agree(self):
+        # save(), backfill (vektörel) ve staging yazımı aynı içerik için aynı özeti üretmeli
+        backfill_row_hashes()
+        backfilled = {lp.kisi_sicilno: lp.row_hash for lp in LawyerPerson.objects.filter(lawyer=self.lawyer)}
+        for lp in LawyerPerson.objects.filter(lawyer=self.lawyer):
+            self.assertEqual(row_hash(lp), backfilled[lp.kisi_sicilno])
+            lp.save()
+            self.assertEqual(LawyerPerson.objects.get(id=lp.id).row_hash, backfilled[lp.kisi_sicilno])
+
+        batch = UploadBatch.objects.create(lawyer=self.lawyer, original_filename='b.csv')
+        staged = [(ks, fields) for ks, fields in STAGED if ks.strip()]
+        values = [[ks for ks, _ in staged]] + [[fields.get(f) for _, fields in staged]
+                                               for f in importer.STAGING_FIELDS[2:]]
+        importer._write_rows(batch, values)
+        hashes = dict(UploadRowStaging.objects.filter(batch=batch).values_list('kisi_sicilno', 'row_hash'))
+
+        # Yalnızca biçim farkı (İ/ı, büyük/küçük harf, telefon yazımı, boşluk, None/'') özeti değiştirmez
+        for ks in ('1001', '1003', '1004', '1006', '1010'):
+            self.assertEqual(hashes[ks], backfilled[ks], ks)
+        self.assertNotEqual(hashes['1002'], backfilled['1002'])
+
+
+class DiffPageTests(DiffFixtureMixin, TestCase):
+    """Keyset sayfaları uç uca eklenince tam diff'in bölümleri elde edilmeli."""
+
+    def setUp(self):
+        super().setUp()
+        # Metin sırası sayısal sıradan farklı olan siciller ('1009' < '10090' < '101'); yalnızca rakam,
+        # böylece sıra veritabanı collation'ından bağımsızdır
+        UploadRowStaging.objects.bulk_create(
+            UploadRowStaging(batch=self.batch, kisi_sicilno=ks, ad='Yeni', soyad='Kişi')
+            for ks in ['101', '10090', '100900', '999', '9', '0100', *[f'2{i:03d}' for i in range(20)]])
+
+    def _walk(self, section, limit):
+        results, cursor, pages = [], None, 0
+        while True:
+            page = diff_page(self.batch.id, section, cursor=cursor, limit=limit)
+            results += page['results']
+            pages += 1
+            self.assertLessEqual(pages, UploadRowStaging.objects.count() + 1, 'imleç ilerlemiyor')
+            cursor = page['nextCursor']
+            if cursor is None:
+                return page['count'], results, pages
+
+    def test_pages_match_full_diff(self):
+        full = compute_diff(self.batch.id)
+        self.assertEqual(full['counts']['added'], 28)
+        for section in DIFF_SECTIONS:
+            for limit in (1, 3, 1000):
+                with self.subTest(section=section, limit=limit):
+                    count, results, pages = self._walk(section, limit)
+                    self.assertEqual(count, full['counts'][section])
+                    self.assertEqual(results, full[section])
+                    self.assertEqual(pages, max(1, -(-count // limit)))
+
+    def test_rows_filled_from_stored_json(self):
+        # Satır tablosundan önce saklanmış diff: ilk sayfa okumasında diff_json'dan doldurulur
+        expected = self._walk('added', 5)[1]
+        BatchDiffRow.objects.all().delete()
+        self.assertEqual(self._walk('added', 5)[1], expected)
+
+    def test_invalid_section(self):
+        with self.assertRaises(ValidationError):
+            diff_page(self.batch.id, 'unchanged')
+
+
+class DiffEngineParityTests(DiffFixtureMixin, TestCase):
+    """Python (tuple snapshot) ve SQL motorları eski nesne + sözlük yolu ile aynı diff'i üretmeli."""
+
+    def assertEnginesAgree(self):
+        legacy = _legacy_diff(self.lawyer.id, self.batch.id)
+        for engine in ('python', 'sql'):
+            with self.subTest(engine=engine), override_settings(DIFF_ENGINE=engine):
+                diff = compute_diff(self.batch.id)
+                self.assertEqual({section: diff[section] for section in DIFF_SECTIONS}, legacy)
+                self.assertEqual(diff['counts'], {section: len(legacy[section]) for section in DIFF_SECTIONS})
+        return legacy
+
+    def test_fixture(self):
+        legacy = self.assertEnginesAgree()
+        self.assertEqual([row['kisi_sicilno'] for row in legacy['added']], ['1008', '1009'])
+        self.assertEqual([row['kisi_sicilno'] for row in legacy['removed']], ['1007'])
+        self.assertEqual([(row['kisi_sicilno'], row['fields']) for row in legacy['changed']],
+                         [('1002', ['ad']), ('1005', ['cevap_status_key'])])
+        backfill_row_hashes()
+        self.assertEnginesAgree()
+
+    def test_random_lists(self):
+        rng = random.Random(11)
+        values = {
+            'ad': ['Ali', 'ALİ', 'ali', ' Ali ', 'Işık', 'IŞIK', 'ışık', 'Veli'],
+            'soyad': ['Öz', 'ÖZ', 'öz ', 'Er'],
+            'mail': [None, '', 'a@b.co', 'A@B.CO', ' a@b.co', 'c@d.co'],
+            'telno': [None, '', '05321112233', '0532 111 22 33', '+90 532 111 2233', '5321112233', '02121234567'],
+            'ilce': [None, '', 'Çankaya', 'ÇANKAYA', 'Kadıköy'],
+            'adres_aciklama': [None, '', 'Örnek sk.', 'Örnek sk. ', 'Satır 1\nSatır 2'],
+            'notlar': [None, '', 'not', ' not'],
+        }
+        statuses = [None, *StatusOption.objects.all()]
+        person = Person.objects.first()
+
+        def fields():
+            return {field: rng.choice(options) for field, options in values.items()}
+
+        LawyerPerson.objects.bulk_create(
+            LawyerPerson(lawyer=self.lawyer, person=person, kisi_sicilno=f'5{i:03d}', active=rng.random() > 0.1,
+                         cevap_status=rng.choice(statuses), **fields())
+            for i in range(300))
+        UploadRowStaging.objects.bulk_create(
+            UploadRowStaging(batch=self.batch, kisi_sicilno=f'5{rng.randrange(350):03d}',
+                             cevap_status_key=rng.choice([None, '', 'geliyor', 'gelmiyor']), **fields())
+            for _ in range(400))
+
+        legacy = self.assertEnginesAgree()
+        self.assertTrue(all(legacy[section] for section in DIFF_SECTIONS))
+        backfill_row_hashes()
+        self.assertEnginesAgree()
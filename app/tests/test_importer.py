@@ -0,0 +1,160 @@
+import io
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from app.models import Lawyer, UploadBatch, UploadRowStaging
+from app.services import importer
+from app.utils.file_validators import validate_sicil_no
+
+
+def _multiline_csv(rows: int = 2000) -> bytes:
+    """Tırnak içinde çok satırlı adres hücreleri olan CSV."""
+    lines = ["sicilno,ad,soyad,adres_aciklama,notlar"]
+    for i in range(rows):
+        lines.append(f'{1000 + i},Ad{i},Soyad{i},"Satır 1\nSatır 2, no: {i}",not{i}')
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _legacy_staging_rows(df: pd.DataFrame, batch: UploadBatch):
+    """Tuple yolundan önceki iterrows + UploadRowStaging döngüsü (referans)."""
+    rows = []
+    for idx, r in df.iterrows():
+        ks = str(r.get('kisi_sicilno') or r.get('sicilno') or '').strip()
+        ad = str(r.get('ad') or '').strip()
+        soyad = str(r.get('soyad') or '').strip()
+        if not ks or not ad or not soyad:
+            continue
+        if not validate_sicil_no(ks)[0]:
+            continue
+        rows.append(UploadRowStaging(
+            batch=batch, kisi_sicilno=ks, ad=ad, soyad=soyad,
+            telno=r.get('telno'), mail=r.get('mail'), ilce=r.get('ilce'),
+            adres_aciklama=r.get('adres_aciklama'), notlar=r.get('notlar'),
+            cevap_status_key=(str(r.get('cevap_status_key')).lower() if r.get('cevap_status_key') else None)
+        ))
+    return rows
+
+
+def _read(data: bytes, engine: str) -> pd.DataFrame:
+    source = io.BytesIO(data)
+    source.name = "liste.csv"
+    with override_settings(IMPORT_CSV_ENGINE=engine):
+        return pd.concat(list(importer._iter_chunks(source, 500)), ignore_index=True)
+
+
+class CsvEngineParityTests(SimpleTestCase):
+    """pyarrow CSV okuyucusu pandas C okuyucusu ile aynı satırları üretmeli."""
+
+    def test_multiline_cells_across_blocks(self):
+        data = _multiline_csv()
+        # Küçük blok: çok satırlı hücreler blok sınırlarına denk gelir
+        with mock.patch.object(importer, "CSV_BLOCK_BYTES", 4096):
+            arrow = _read(data, "pyarrow")
+        pandas = _read(data, "c")
+
+        self.assertEqual(len(arrow), 2000)
+        self.assertEqual(arrow.iloc[7]["adres_aciklama"], "Satır 1\nSatır 2, no: 7")
+        pd.testing.assert_frame_equal(arrow, pandas[arrow.columns], check_dtype=False)
+
+
+class ParseAndStageCsvTests(TestCase):
+
+    def test_multiline_csv_is_staged(self):
+        lawyer = Lawyer.objects.create(sicil_no="T1", ad="Test", soyad="Avukat")
+        upload = SimpleUploadedFile("liste.csv", _multiline_csv(300), content_type="text/csv")
+
+        with mock.patch.object(importer, "CSV_BLOCK_BYTES", 4096):
+            batch_id, row_count = importer.parse_and_stage(upload, lawyer.id)
+
+        self.assertEqual(row_count, 300)
+        row = UploadRowStaging.objects.get(batch_id=batch_id, kisi_sicilno="1005")
+        self.assertEqual(row.adres_aciklama, "Satır 1\nSatır 2, no: 5")
+
+
+class StagingRowsParityTests(SimpleTestCase):
+    """Vektörel staging kolonları eski satır satır UploadRowStaging yolu ile aynı değerleri üretmeli."""
+
+    def test_tuples_match_legacy_objects(self):
+        raw = pd.DataFrame({
+            'Sicil No': ['10001', ' 10002 ', '', None, '10005', '10006', 'AB-7', '10008', np.nan],
+            'ad': ['Ali', ' Ayşe ', 'Can', 'Deniz', None, 'EMRE', 'işık', '  ', 'Gül'],
+            'Soyad': ['Yılmaz', 'Öz', 'Er', 'Ak', 'Su', ' KAYA ', 'ılgaz', 'Tan', 'Ün'],
+            'Cevap Durumu': ['Geliyor', 'GELMİYOR', None, 'nötr', '', ' Geliyor ', np.nan, 'x', 'y'],
+            'Tel No': ['0532 111 22 33', '+90 (532) 111-2233', None, '', '123', np.nan, '05321112233', 'a', 'b'],
+            'Mail': ['Ali@Example.COM', ' x@y.com ', None, '', 'yok', np.nan, 'A@B.co', 'c', 'd'],
+            'İlçe': ['Çankaya', ' KEÇİÖREN ', None, '', 'ışıklar', np.nan, 'Yenimahalle', 'e', 'f'],
+            'Adres': ['Örnek sk. no: 1', None, '', '  ', 'a\nb', np.nan, 'x', 'g', 'h'],
+            'Notlar': [None] * 9,
+        }, dtype=object)
+        df = importer._normalize_df(importer._map_columns(raw))
+        batch = UploadBatch(id=1)
+
+        values, status_keys = importer._chunk_values(df, importer._new_stats())
+        rows = [(batch.id, *row) for row in zip(*values)]
+        legacy = [tuple(getattr(obj, f if f != 'batch' else 'batch_id') for f in importer.STAGING_FIELDS)
+                  for obj in _legacy_staging_rows(df, batch)]
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows, legacy)
+        self.assertEqual(status_keys, {key for *_, key in rows if key})
+
+
+def _typed_table() -> pa.Table:
+    """Tipli kolonlar (int, null) içeren liste; CSV karşılığı _typed_csv."""
+    return pa.table({
+        'sicilno': pa.array([1001, 1002, 1003, 1004], pa.int64()),
+        'ad': ['Ali', ' Ayşe ', 'İsmail', 'Can'],
+        'soyad': ['Yılmaz', 'Öz', 'IŞIK', 'Er'],
+        'telno': pa.array([5321112233, None, 2121234567, None], pa.int64()),
+        'mail': ['Ali@Example.COM', None, '', 'can@example.com'],
+        'cevapdurumu': ['Geliyor', None, 'GELMİYOR', 'Geliyor'],
+        'adres': ['Satır 1\nSatır 2', None, 'Örnek sk.', ''],
+    })
+
+
+def _typed_csv() -> bytes:
+    return ("sicilno,ad,soyad,telno,mail,cevapdurumu,adres\n"
+            "1001,Ali,Yılmaz,5321112233,Ali@Example.COM,Geliyor,\"Satır 1\nSatır 2\"\n"
+            "1002, Ayşe ,Öz,,,,\n"
+            "1003,İsmail,IŞIK,2121234567,,GELMİYOR,Örnek sk.\n"
+            "1004,Can,Er,,can@example.com,Geliyor,\n").encode('utf-8')
+
+
+def _arrow_bytes(table: pa.Table, stream: bool) -> bytes:
+    sink = pa.BufferOutputStream()
+    writer = pa.ipc.new_stream if stream else pa.ipc.new_file
+    with writer(sink, table.schema) as out:
+        out.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class FormatParityTests(TestCase):
+    """Parquet ve Arrow IPC yüklemeleri CSV ile aynı staging satırlarını ve içerik özetini üretmeli."""
+
+    def _stage(self, name: str, data: bytes):
+        lawyer = Lawyer.objects.create(sicil_no=f"T-{name}", ad='Test', soyad='Avukat')
+        batch_id, _ = importer.parse_and_stage(SimpleUploadedFile(name, data), lawyer.id)
+        rows = list(UploadRowStaging.objects.filter(batch_id=batch_id).order_by('id')
+                    .values_list(*importer.STAGING_FIELDS[1:], 'row_hash'))
+        return rows, UploadBatch.objects.get(id=batch_id).content_hash
+
+    def test_formats_stage_same_rows(self):
+        parquet = pa.BufferOutputStream()
+        pq.write_table(_typed_table(), parquet)
+        csv_rows, csv_hash = self._stage('liste.csv', _typed_csv())
+
+        self.assertEqual(len(csv_rows), 4)
+        self.assertEqual(csv_rows[0][:4], ('1001', 'Ali', 'Yılmaz', '05321112233'))
+        for name, data in (('liste.parquet', parquet.getvalue().to_pybytes()),
+                           ('liste.arrow', _arrow_bytes(_typed_table(), stream=False)),
+                           ('liste.arrows', _arrow_bytes(_typed_table(), stream=True))):
+            with self.subTest(format=name):
+                rows, content_hash = self._stage(name, data)
+                self.assertEqual(rows, csv_rows)
+                self.assertEqual(content_hash, csv_hash)
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from app.models import ImportJob
+from app.services.job_service import claim_next_job, fail_stale_jobs
+
+
+@override_settings(IMPORT_JOB_TIMEOUT_MINUTES=30)
+class StaleJobTests(TestCase):
+
+    def _job(self, status, started_minutes_ago=None, path='/nonexistent/job.csv'):
+        started = timezone.now() - timedelta(minutes=started_minutes_ago) if started_minutes_ago else None
+        return ImportJob.objects.create(original_filename='liste.csv', file_path=path,
+                                        status=status, started_at=started)
+
+    def test_only_timed_out_running_jobs_fail(self):
+        stale = self._job(ImportJob.RUNNING, started_minutes_ago=45)
+        fresh = self._job(ImportJob.RUNNING, started_minutes_ago=5)
+        queued = self._job(ImportJob.QUEUED)
+
+        self.assertEqual(fail_stale_jobs(), 1)
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, ImportJob.FAILED)
+        self.assertEqual(stale.stage, ImportJob.STAGE_FAILED)
+        self.assertIsNotNone(stale.finished_at)
+        self.assertEqual(ImportJob.objects.get(id=fresh.id).status, ImportJob.RUNNING)
+        self.assertEqual(ImportJob.objects.get(id=queued.id).status, ImportJob.QUEUED)
+
+    def test_claim_recovers_stale_jobs(self):
+        stale = self._job(ImportJob.RUNNING, started_minutes_ago=45)
+        queued = self._job(ImportJob.QUEUED)
+
+        self.assertEqual(claim_next_job().id, queued.id)
+        self.assertEqual(ImportJob.objects.get(id=stale.id).status, ImportJob.FAILED)
@@ -0,0 +1,75 @@
+import math
+import random
+import unicodedata
+
+import pandas as pd
+from django.test import SimpleTestCase
+
+from app.utils import normalization as norm
+
+# (tek değer, kolon) çiftleri
+PAIRS = [
+    (norm.normalize_text, norm.normalize_text_series),
+    (norm.normalize_name, norm.normalize_name_series),
+    (norm.normalize_phone, norm.normalize_phone_series),
+    (norm.normalize_email, norm.normalize_email_series),
+    (norm.normalize_status_key, norm.normalize_status_key_series),
+    (norm.fold_key, norm.fold_key_series),
+]
+
+SAMPLES = [
+    None, math.nan, pd.NA, '', '   ', '\t\n', 'Ali', '  ali  veli ', 'İSTANBUL', 'ıIiİ', 'GELİYOR',
+    'Çağrı Öztürk', 'a 　b', 'a\vb', 'a\x85b', 'a\x1cb', ' x ',
+    '+90 532 111 22 33', '0090 532 111 22 33', '0532-111-22-33', '5321112233', '12', 'tel: yok',
+    '٣٣٣', '０５３２', 'Ali@ÖRNEK.com ', 5321112233, 5321112233.0, 0, True, b'x',
+]
+
+
+def _bmp_chars():
+    """Python'un Unicode veritabanında tanımlı BMP karakterleri (yeni sürüm farkları hariç)."""
+    return [chr(c) for c in range(0x10000)
+            if not 0xD800 <= c < 0xE000 and unicodedata.category(chr(c)) != 'Cn']
+
+
+class ScalarSeriesParityTests(SimpleTestCase):
+    """Düz Python tek değer biçimleri pyarrow kolon çekirdekleriyle aynı sonucu vermeli."""
+
+    def assert_parity(self, values):
+        for scalar, series in PAIRS:
+            expected = series(pd.Series(values, dtype=object)).tolist()
+            for value, want in zip(values, expected):
+                with self.subTest(func=scalar.__name__, value=value):
+                    self.assertEqual(scalar(value), want)
+
+    def test_samples(self):
+        self.assert_parity(SAMPLES)
+
+    def test_every_bmp_character(self):
+        self.assert_parity([f' a{ch}B{ch}1 ' for ch in _bmp_chars()])
+
+    def test_random_strings(self):
+        rng = random.Random(0)
+        alphabet = 'aıiIİçÇğĞöÖşŞüÜ0123456789 +-@.\t ̇'
+        self.assert_parity([''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+                            for _ in range(2000)])
+
+
+class RowHashTests(SimpleTestCase):
+
+    def test_scalar_matches_series(self):
+        rows = [
+            {'ad': 'Ali', 'soyad': 'IŞIK', 'telno': '+90 532 111 22 33', 'mail': 'A@B.COM',
+             'ilce': 'Kadıköy', 'adres_aciklama': ' Örnek sk. ', 'notlar': None},
+            {'ad': 'ali', 'soyad': 'ışık', 'telno': '05321112233', 'mail': 'a@b.com',
+             'ilce': 'KADIKÖY', 'adres_aciklama': 'Örnek sk.'},
+            {'ad': 'Ali', 'soyad': 'Işık', 'telno': 5321112233},
+            {},
+        ]
+        frame = pd.DataFrame(rows, columns=list(norm.ROW_HASH_FIELDS), dtype=object)
+        self.assertEqual([norm.row_hash(row) for row in rows], norm.row_hash_series(frame).tolist())
+
+    def test_format_only_changes_keep_hash(self):
+        a = {'ad': 'İsmail', 'soyad': 'Işık', 'telno': '+90 532 111 22 33', 'mail': 'X@Y.com'}
+        b = {'ad': 'ismail', 'soyad': 'ışık', 'telno': '0532 111 2233', 'mail': 'x@y.com'}
+        self.assertEqual(norm.row_hash(a), norm.row_hash(b))
+        self.assertNotEqual(norm.row_hash(a), norm.row_hash({**b, 'ilce': 'Çankaya'}))
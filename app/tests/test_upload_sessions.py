@@ -0,0 +1,105 @@
+import hashlib
+import io
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from app.models import Lawyer, UploadChunk, UploadSession
+from app.services import upload_session_service as sessions
+from app.utils.file_validators import ValidationError
+
+DATA = ("sicilno,ad,soyad\n" + "".join(f"{1000 + i},Ad{i},Soyad{i}\n" for i in range(20000))).encode()
+CHUNK = 64 * 1024
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class _TempDirs:
+    """Oturum ve kuyruk dosyaları geçici dizinlere yazılır."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.settings_override = override_settings(UPLOAD_SESSION_DIR=f"{self.tmp}/sessions",
+                                                   IMPORT_JOB_DIR=f"{self.tmp}/jobs")
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        super().tearDown()
+
+    def _upload(self, session):
+        parts = [DATA[i:i + session.chunk_size] for i in range(0, len(DATA), session.chunk_size)]
+        for i, part in enumerate(parts):
+            sessions.write_chunk(session, i, io.BytesIO(part), _sha(part))
+        return parts
+
+
+class WriteChunkTests(_TempDirs, TestCase):
+
+    def test_finalize_assembles_file(self):
+        lawyer = Lawyer.objects.create(sicil_no="T1", ad="Test", soyad="Avukat")
+        session = sessions.open_session("liste.csv", len(DATA), chunk_size=CHUNK, sha256=_sha(DATA))
+        self._upload(session)
+
+        job = sessions.finalize_session(session.token, lawyer_id=lawyer.id)
+
+        self.assertEqual(Path(job.file_path).read_bytes(), DATA)
+        self.assertEqual(list(Path(self.tmp, "sessions").glob("*.part")), [])
+
+    def test_bad_resend_keeps_confirmed_chunk(self):
+        session = sessions.open_session("liste.csv", len(DATA), chunk_size=CHUNK)
+        parts = self._upload(session)
+
+        with self.assertRaises(ValidationError):
+            sessions.write_chunk(session, 0, io.BytesIO(b"x" * len(parts[0])), _sha(parts[0]))
+        with self.assertRaises(ValidationError):
+            sessions.write_chunk(session, 0, io.BytesIO(parts[0][:-1]), _sha(parts[0]))
+
+        self.assertTrue(UploadChunk.objects.filter(session=session, index=0).exists())
+        self.assertEqual(Path(session.file_path).read_bytes(), DATA)
+
+    def test_write_after_finalize_is_rejected(self):
+        lawyer = Lawyer.objects.create(sicil_no="T1", ad="Test", soyad="Avukat")
+        session = sessions.open_session("liste.csv", len(DATA), chunk_size=CHUNK)
+        parts = self._upload(session)
+        sessions.finalize_session(session.token, lawyer_id=lawyer.id)
+
+        # Bellekteki oturum nesnesi hâlâ OPEN; kilit altında yeniden okunup reddedilmeli
+        with self.assertRaisesMessage(ValidationError, "tamamlanmış"):
+            sessions.write_chunk(session, 0, io.BytesIO(parts[0]), _sha(parts[0]))
+
+    @override_settings(UPLOAD_SESSION_MAX_OPEN=2)
+    def test_open_sessions_are_capped_per_user(self):
+        sessions.open_session("a.csv", 1024, created_by="ali")
+        sessions.open_session("b.csv", 1024, created_by="ali")
+
+        with self.assertRaises(ValidationError):
+            sessions.open_session("c.csv", 1024, created_by="ali")
+        sessions.open_session("c.csv", 1024, created_by="veli")
+        self.assertEqual(UploadSession.objects.filter(created_by="ali").count(), 2)
+
+
+class _NoTransactionStream(io.BytesIO):
+    """Okunurken açık transaction (dolayısıyla satır kilidi) olmadığını doğrular."""
+
+    def read(self, *args):
+        assert not connection.in_atomic_block, "parça transaction içinde okunuyor"
+        return super().read(*args)
+
+
+class WriteChunkLockTests(_TempDirs, TransactionTestCase):
+
+    def test_body_is_read_outside_transaction(self):
+        session = sessions.open_session("liste.csv", len(DATA), chunk_size=CHUNK)
+        part = DATA[:session.chunk_size]
+
+        sessions.write_chunk(session, 0, _NoTransactionStream(part), _sha(part))
+
+        self.assertTrue(UploadChunk.objects.filter(session=session, index=0).exists())
@@ -0,0 +1,130 @@
+import re
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from app.utils.file_validators import collect_dataframe_errors, validate_dataframe_data, validate_sicil_no
+
+
+def _legacy_collect_errors(df: pd.DataFrame):
+    """Vektörel motordan önceki iterrows döngüsü (referans); tüm hataları döndürür."""
+    errors = []
+    valid_rows = 0
+    for idx, row in df.iterrows():
+        row_num = idx + 2
+        sicil = row.get('sicilno') or row.get('kisi_sicilno')
+        if pd.isna(sicil) or str(sicil).strip() == '':
+            errors.append({'row': row_num, 'field': 'sicilno', 'value': sicil, 'error': 'Sicil No boş olamaz'})
+            continue
+        is_valid, error_msg = validate_sicil_no(sicil)
+        if not is_valid:
+            errors.append({'row': row_num, 'field': 'sicilno', 'value': sicil, 'error': error_msg})
+            continue
+        ad = row.get('ad')
+        if pd.isna(ad) or str(ad).strip() == '':
+            errors.append({'row': row_num, 'field': 'ad', 'value': ad, 'error': 'Ad boş olamaz'})
+            continue
+        if len(str(ad).strip()) < 2:
+            errors.append({'row': row_num, 'field': 'ad', 'value': ad, 'error': 'Ad en az 2 karakter olmalı'})
+            continue
+        soyad = row.get('soyad')
+        if pd.isna(soyad) or str(soyad).strip() == '':
+            errors.append({'row': row_num, 'field': 'soyad', 'value': soyad, 'error': 'Soyad boş olamaz'})
+            continue
+        if len(str(soyad).strip()) < 2:
+            errors.append({'row': row_num, 'field': 'soyad', 'value': soyad, 'error': 'Soyad en az 2 karakter olmalı'})
+            continue
+        mail = row.get('mail')
+        if mail and not pd.isna(mail) and str(mail).strip():
+            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+            if not re.match(email_pattern, str(mail).strip()):
+                errors.append({'row': row_num, 'field': 'mail', 'value': mail, 'error': f'Geçersiz e-posta formatı: {mail}'})
+        valid_rows += 1
+    return errors, valid_rows
+
+
+def _comparable(errors):
+    """NaN != NaN olduğundan değerler karşılaştırma için metne çevrilir."""
+    return [(e['row'], e['field'], 'nan' if isinstance(e['value'], float) and np.isnan(e['value']) else e['value'],
+             e['error']) for e in errors]
+
+
+# (sicilno, ad, soyad, mail): her kontrol ve öncelik sırası için en az bir satır
+_ROWS = [
+    ('10001', 'Ali', 'Yılmaz', 'ali@example.com'),
+    (np.nan, 'Ali', 'Yılmaz', None),
+    (None, 'Ali', 'Yılmaz', None),
+    ('   ', 'Ali', 'Yılmaz', None),
+    ('12', 'Ali', 'Yılmaz', None),
+    (' 12 ', None, None, None),
+    ('1' * 21, 'Ali', 'Yılmaz', None),
+    ('ab#cd', 'Ali', 'Yılmaz', None),
+    ('İST-10', 'Ali', 'Yılmaz', None),
+    ('A-1/2_3.4', 'Ali', 'Yılmaz', None),
+    ('10002', np.nan, 'Yılmaz', 'gecersiz'),
+    ('10003', ' ', 'Yılmaz', None),
+    ('10004', ' A ', 'Yılmaz', None),
+    ('10005', 'Ali', None, None),
+    ('10006', 'Ali', 'Y', None),
+    ('10007', 'Ali', 'Yılmaz', 'gecersiz-mail'),
+    ('10008', 'Ali', 'Yılmaz', '  '),
+    ('10009', 'Ali', 'Yılmaz', np.nan),
+    ('10010', 'Ali', 'Yılmaz', ' ali@example.com '),
+    ('10011', 'Ali', 'Yılmaz', 'ali@örnek.com'),
+    (10012, 'Ali', 'Yılmaz', None),
+]
+
+
+class VectorizedValidationParityTests(SimpleTestCase):
+    """collect_dataframe_errors, eski satır satır motorla aynı hataları aynı sırada üretmeli."""
+
+    def assertSameAsLegacy(self, df):
+        errors, valid = collect_dataframe_errors(df)
+        legacy_errors, legacy_valid = _legacy_collect_errors(df)
+        self.assertEqual(_comparable(errors), _comparable(legacy_errors))
+        self.assertEqual(valid, legacy_valid)
+
+    def test_every_check(self):
+        df = pd.DataFrame(_ROWS, columns=['sicilno', 'ad', 'soyad', 'mail'], dtype=object)
+        self.assertSameAsLegacy(df)
+        errors, valid = collect_dataframe_errors(df)
+        self.assertEqual(valid, 8)
+        self.assertEqual(len(errors), len(_ROWS) - valid + 2)
+
+    def test_kisi_sicilno_column_and_chunk_index(self):
+        # Parça parça okumada index 0'dan başlamaz; satır numarası index + 2 olmalı
+        df = pd.DataFrame(_ROWS, columns=['kisi_sicilno', 'ad', 'soyad', 'mail'], dtype=object,
+                          index=range(5000, 5000 + len(_ROWS)))
+        self.assertSameAsLegacy(df)
+        self.assertEqual(collect_dataframe_errors(df)[0][0]['row'], 5003)
+
+    def test_missing_optional_columns(self):
+        self.assertSameAsLegacy(pd.DataFrame({'sicilno': ['10001', '1'], 'ad': ['Ali', 'Ali'],
+                                              'soyad': ['Yılmaz', 'Yılmaz']}, dtype=object))
+
+    def test_empty_sicilno_falls_back_to_kisi_sicilno(self):
+        df = pd.DataFrame({'sicilno': ['', None, np.nan, '10001'], 'kisi_sicilno': ['10002', '1', None, '2'],
+                           'ad': ['Ali'] * 4, 'soyad': ['Yılmaz'] * 4}, dtype=object)
+        self.assertSameAsLegacy(df)
+
+    def test_random_frame(self):
+        rng = np.random.default_rng(7)
+        pool = {
+            'sicilno': ['10001', 'AB-12', '12', '', '  ', None, np.nan, 'x' * 25, 'a b', 'İ12', '99999 '],
+            'ad': ['Ali', 'A', ' ', None, np.nan, 'Işık', ' Ay '],
+            'soyad': ['Yılmaz', 'Y', '', None, np.nan, 'Öz'],
+            'mail': ['a@b.co', 'a@b', '', None, np.nan, ' x@y.com', 'x y@z.com'],
+        }
+        n = 3000
+        df = pd.DataFrame({col: [values[i] for i in rng.integers(0, len(values), n)]
+                           for col, values in pool.items()}, dtype=object)
+        self.assertSameAsLegacy(df)
+
+    def test_validate_dataframe_data_returns_first_ten(self):
+        df = pd.DataFrame({'sicilno': ['1'] * 15 + ['10001'], 'ad': ['Ali'] * 16, 'soyad': ['Yılmaz'] * 16},
+                          dtype=object)
+        success, message, errors = validate_dataframe_data(df)
+        self.assertFalse(success)
+        self.assertEqual(message, '15 satırda hata bulundu, 1 satır geçerli.')
+        self.assertEqual(_comparable(errors), _comparable(_legacy_collect_errors(df)[0][:10]))
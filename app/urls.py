@@ -8,10 +8,17 @@ router.register(r'lawyers', LawyerViewSet, basename='lawyers')
 router.register(r'status-options', StatusOptionViewSet, basename='status-options')
 router.register(r'people', PersonViewSet, basename='people')
 
-
-urlpatterns = [ path('', include(router.urls)) ]
 from .views import UploadViewSet
 router.register(r'uploads', UploadViewSet, basename='uploads')
 
+from .views import UploadSessionViewSet
+router.register(r'upload-sessions', UploadSessionViewSet, basename='upload-sessions')
+
+from .views import ImportJobViewSet
+router.register(r'import-jobs', ImportJobViewSet, basename='import-jobs')
+
 from .views import ReportsViewSet
-router.register(r'reports', ReportsViewSet, basename='reports')
\ No newline at end of file
+router.register(r'reports', ReportsViewSet, basename='reports')
+
+# router.urls ilk erişimde önbelleğe alındığı için tüm kayıtlardan sonra include edilmeli
+urlpatterns = [ path('', include(router.urls)) ]
@@ -1,13 +1,14 @@
 from django.urls import path
 from .views_ui import (
     ui_dashboard, ui_lawyers, ui_people, ui_upload,
-    ui_diff_preview, ui_approve_batch, ui_people_export,
+    ui_diff_preview, ui_diff_section, ui_approve_batch, ui_people_export,
     ui_download_template_csv, ui_download_template_xlsx,
     ui_approve_selected, ui_lawyer_people,
     ui_people_export_preview, ui_people_export_download,
     ui_person_edit, ui_person_relation_delete, ui_lawyer_delete,
     ui_unique_people, ui_unique_person_detail,
-    ui_person_analytics,
+    ui_person_analytics, ui_upload_error_report,
+    ui_import_job, ui_import_job_status, ui_upload_bulk, ui_upload_preview,
 )
 from .views_election import (
     ui_elections, ui_election_create, ui_election_activate,
@@ -26,7 +27,13 @@ urlpatterns = [
     path('people/export/preview/', ui_people_export_preview, name='ui_people_export_preview'),
     path('people/export/download/', ui_people_export_download, name='ui_people_export_download'),
     path('upload/', ui_upload, name='ui_upload'),
+    path('upload/bulk/', ui_upload_bulk, name='ui_upload_bulk'),
+    path('upload/preview/', ui_upload_preview, name='ui_upload_preview'),
+    path('upload/jobs/<int:job_id>/', ui_import_job, name='ui_import_job'),
+    path('upload/jobs/<int:job_id>/status/', ui_import_job_status, name='ui_import_job_status'),
+    path('upload/error-report/<str:token>/', ui_upload_error_report, name='ui_upload_error_report'),
     path('upload/<int:batch_id>/diff/', ui_diff_preview, name='ui_diff_preview'),
+    path('upload/<int:batch_id>/diff/<str:section>/', ui_diff_section, name='ui_diff_section'),
     path('upload/<int:batch_id>/approve/', ui_approve_batch, name='ui_approve_batch'),
     path('lawyers/<int:lawyer_id>/', ui_lawyer_people, name='ui_lawyer_people'),
 
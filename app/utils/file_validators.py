@@ -8,19 +8,29 @@ from pathlib import Path
 
 
 class ValidationError(Exception):
-    """Validasyon hatası"""
-    def __init__(self, message: str, details: Optional[List[str]] = None):
+    """
+    Validasyon hatası.
+    errors: satır bazlı hataların tam listesi (indirilebilir rapor için)
+    """
+    def __init__(self, message: str, details: Optional[List[str]] = None,
+                 errors: Optional[List[dict]] = None):
         self.message = message
         self.details = details or []
+        self.errors = errors or []
         super().__init__(self.message)
 
+    def __reduce__(self):
+        # Process pool'dan dönerken detay ve hata listesi kaybolmasın
+        return self.__class__, (self.message, self.details, self.errors)
+
 
 def validate_file_extension(filename: str) -> Tuple[bool, str]:
     """
     Dosya uzantısını kontrol eder.
-    Sadece .xlsx, .xls, .csv uzantılarına izin verilir.
+    Excel, CSV ve Parquet / Arrow IPC uzantılarına izin verilir.
     """
-    allowed_extensions = ['.xlsx', '.xls', '.xlsm', '.csv', '.txt']
+    allowed_extensions = ['.xlsx', '.xls', '.xlsm', '.csv', '.txt',
+                          '.parquet', '.pq', '.arrow', '.feather', '.ipc', '.arrows']
     suffix = Path(filename).suffix.lower()
 
     if suffix not in allowed_extensions:
@@ -29,16 +39,19 @@ def validate_file_extension(filename: str) -> Tuple[bool, str]:
     return True, "OK"
 
 
-def validate_file_size(file_size: int, max_size_mb: int = 10) -> Tuple[bool, str]:
+def validate_file_size(file_size: int, max_size_mb: int = 10,
+                       max_size_bytes: Optional[int] = None) -> Tuple[bool, str]:
     """
     Dosya boyutunu kontrol eder.
-    Default max: 10 MB
+    Default max: 10 MB. max_size_bytes verilirse max_size_mb yerine o kullanılır.
     """
-    max_size_bytes = max_size_mb * 1024 * 1024
+    if max_size_bytes is None:
+        max_size_bytes = max_size_mb * 1024 * 1024
 
     if file_size > max_size_bytes:
         size_mb = file_size / (1024 * 1024)
-        return False, f"Dosya çok büyük: {size_mb:.2f} MB. Maksimum boyut: {max_size_mb} MB"
+        limit_mb = max_size_bytes / (1024 * 1024)
+        return False, f"Dosya çok büyük: {size_mb:.2f} MB. Maksimum boyut: {limit_mb:.0f} MB"
 
     if file_size == 0:
         return False, "Dosya boş"
@@ -115,104 +128,162 @@ def validate_dataframe_data(df: pd.DataFrame) -> Tuple[bool, str, List[dict]]:
     Returns: (success, message, errors_list)
         errors_list: [{'row': satır_no, 'field': alan_adı, 'value': değer, 'error': hata_mesajı}]
     """
-    errors = []
-    valid_rows = 0
-
-    for idx, row in df.iterrows():
-        row_num = idx + 2  # Excel'de 1 başlık, 2'den başlar
-
-        # Sicil No validasyonu
-        sicil = row.get('sicilno') or row.get('kisi_sicilno')
-        if pd.isna(sicil) or str(sicil).strip() == '':
-            errors.append({
-                'row': row_num,
-                'field': 'sicilno',
-                'value': sicil,
-                'error': 'Sicil No boş olamaz'
-            })
-            continue
+    errors, valid_rows = collect_dataframe_errors(df)
+    success, message = summarize_validation(len(errors), valid_rows)
+    if valid_rows == 0:
+        return success, message, errors
+    # İlk 10 hatayı döndür
+    return success, message, errors[:10]
 
-        is_valid, error_msg = validate_sicil_no(sicil)
-        if not is_valid:
-            errors.append({
-                'row': row_num,
-                'field': 'sicilno',
-                'value': sicil,
-                'error': error_msg
-            })
-            continue
 
-        # Ad validasyonu
-        ad = row.get('ad')
-        if pd.isna(ad) or str(ad).strip() == '':
-            errors.append({
-                'row': row_num,
-                'field': 'ad',
-                'value': ad,
-                'error': 'Ad boş olamaz'
-            })
-            continue
+def summarize_validation(error_count: int, valid_rows: int) -> Tuple[bool, str]:
+    """
+    Hata ve geçerli satır sayılarından validasyon sonucunu üretir.
+    Parça parça (chunk) okunan dosyalarda toplam sayılarla çağrılır.
 
-        if len(str(ad).strip()) < 2:
-            errors.append({
-                'row': row_num,
-                'field': 'ad',
-                'value': ad,
-                'error': 'Ad en az 2 karakter olmalı'
-            })
-            continue
+    Returns: (success, message)
+    """
+    # Tüm satırlar hatalıysa
+    if valid_rows == 0 and error_count:
+        return False, f"Dosyada geçerli satır bulunamadı. Toplam {error_count} hata."
 
-        # Soyad validasyonu
-        soyad = row.get('soyad')
-        if pd.isna(soyad) or str(soyad).strip() == '':
-            errors.append({
-                'row': row_num,
-                'field': 'soyad',
-                'value': soyad,
-                'error': 'Soyad boş olamaz'
-            })
-            continue
+    # Bazı hatalar var ama geçerli satırlar da var
+    if error_count:
+        return False, f"{error_count} satırda hata bulundu, {valid_rows} satır geçerli."
 
-        if len(str(soyad).strip()) < 2:
-            errors.append({
-                'row': row_num,
-                'field': 'soyad',
-                'value': soyad,
-                'error': 'Soyad en az 2 karakter olmalı'
-            })
-            continue
+    return True, f"Tüm {valid_rows} satır geçerli"
 
-        # Email validasyonu (opsiyonel ama varsa doğru formatta olmalı)
-        mail = row.get('mail')
-        if mail and not pd.isna(mail) and str(mail).strip():
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, str(mail).strip()):
-                errors.append({
-                    'row': row_num,
-                    'field': 'mail',
-                    'value': mail,
-                    'error': f'Geçersiz e-posta formatı: {mail}'
-                })
-                # Email hatası kritik değil, devam et
-
-        valid_rows += 1
 
-    # Tüm satırlar hatalıysa
-    if valid_rows == 0 and errors:
-        return False, f"Dosyada geçerli satır bulunamadı. Toplam {len(errors)} hata.", errors
+SICIL_PATTERN = re.compile(r'^[A-Za-z0-9\-/_.]+$')
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Satır bazlı kontroller, validate_sicil_no ile aynı öncelik sırasında.
+# Bir satır ilk başarısız kontrolde hatalı sayılır, sonrakiler değerlendirilmez.
+_REQUIRED_CHECKS = [
+    ('sicilno', 'empty', lambda v: 'Sicil No boş olamaz'),
+    ('sicilno', 'short', lambda v: f"Sicil No çok kısa: '{v}' (Minimum 3 karakter)"),
+    ('sicilno', 'long', lambda v: f"Sicil No çok uzun: '{v}' (Maksimum 20 karakter)"),
+    ('sicilno', 'chars', lambda v: f"Sicil No geçersiz karakterler içeriyor: '{v}'. Sadece harf, rakam, -, /, _ kullanılabilir"),
+    ('ad', 'empty', lambda v: 'Ad boş olamaz'),
+    ('ad', 'short', lambda v: 'Ad en az 2 karakter olmalı'),
+    ('soyad', 'empty', lambda v: 'Soyad boş olamaz'),
+    ('soyad', 'short', lambda v: 'Soyad en az 2 karakter olmalı'),
+]
+
+
+def _column(df: pd.DataFrame, *names: str) -> pd.Series:
+    """
+    Satır bazında row.get(names[0]) or row.get(names[1]) or ... ile aynı değeri verir:
+    boş ('' / None) hücrede sıradaki kolona geçilir, son kolonun değeri olduğu gibi alınır.
+    Hiçbir kolon yoksa boş (None) bir seri.
+    """
+    result = pd.Series([None] * len(df), index=df.index, dtype=object)
+    for i, name in enumerate(reversed(names)):
+        if name not in df.columns:
+            continue
+        col = df[name]
+        # Object dizilerinde bool dönüşümü Python doğruluk değeridir (NaN dolu sayılır)
+        result = col if i == 0 else col.astype(object).where(col.to_numpy(dtype=bool), result)
+    return result
 
-    # Bazı hatalar var ama geçerli satırlar da var
-    if errors:
-        error_summary = f"{len(errors)} satırda hata bulundu, {valid_rows} satır geçerli."
-        # İlk 10 hatayı döndür
-        return False, error_summary, errors[:10]
 
-    return True, f"Tüm {valid_rows} satır geçerli", []
+def _stripped(col: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """(boş maskesi, strip edilmiş metin) döndürür. str(x).strip() ile aynı sonucu verir."""
+    missing = col.isna()
+    text = col.astype(str).str.strip().where(~missing, '')
+    return missing | (text == ''), text
 
 
-def validate_upload_file(uploaded_file, max_size_mb: int = 10) -> Tuple[bool, str, Optional[List[dict]]]:
+def collect_dataframe_errors(df: pd.DataFrame) -> Tuple[List[dict], int]:
+    """
+    DataFrame içindeki tüm satır hatalarını kolon bazlı (vektörel) olarak toplar.
+    Her kontrol tüm seri üzerinde tek seferde bir hata maskesi üretir;
+    sadece hatalı satırlar için Python seviyesinde hata kaydı oluşturulur.
+    Satır numaraları df.index üzerinden hesaplanır (Excel satırı = index + 2).
+
+    Returns: (errors_list, valid_rows)
+    """
+    if df.empty:
+        return [], 0
+
+    sicil_raw = _column(df, 'sicilno', 'kisi_sicilno')
+    ad_raw = _column(df, 'ad')
+    soyad_raw = _column(df, 'soyad')
+    mail_raw = _column(df, 'mail')
+
+    sicil_empty, sicil = _stripped(sicil_raw)
+    ad_empty, ad = _stripped(ad_raw)
+    soyad_empty, soyad = _stripped(soyad_raw)
+    mail_empty, mail = _stripped(mail_raw)
+
+    sicil_len = sicil.str.len()
+    masks = {
+        ('sicilno', 'empty'): sicil_empty,
+        ('sicilno', 'short'): sicil_len < 3,
+        ('sicilno', 'long'): sicil_len > 20,
+        ('sicilno', 'chars'): ~sicil.str.match(SICIL_PATTERN),
+        ('ad', 'empty'): ad_empty,
+        ('ad', 'short'): ad.str.len() < 2,
+        ('soyad', 'empty'): soyad_empty,
+        ('soyad', 'short'): soyad.str.len() < 2,
+    }
+    raw_values = {'sicilno': sicil_raw, 'ad': ad_raw, 'soyad': soyad_raw}
+    texts = {'sicilno': sicil, 'ad': ad, 'soyad': soyad}
+
+    # Pozisyon -> hata; her satır için en fazla bir zorunlu alan hatası
+    found = {}
+    remaining = pd.Series(True, index=df.index)
+    for field, check, message in _REQUIRED_CHECKS:
+        hit = masks[(field, check)] & remaining
+        if not hit.any():
+            continue
+        remaining &= ~hit
+        positions = hit.to_numpy().nonzero()[0]
+        for pos, idx, raw, text in zip(positions, df.index[positions],
+                                       raw_values[field].iloc[positions], texts[field].iloc[positions]):
+            found[pos] = {'row': idx + 2, 'field': field, 'value': raw, 'error': message(text)}
+
+    # Email validasyonu (opsiyonel ama varsa doğru formatta olmalı)
+    # Email hatası kritik değil, satır geçerli sayılır
+    mail_bad = remaining & ~mail_empty & ~mail.str.match(EMAIL_PATTERN)
+    if mail_bad.any():
+        positions = mail_bad.to_numpy().nonzero()[0]
+        for pos, idx, raw in zip(positions, df.index[positions], mail_raw.iloc[positions]):
+            found[pos] = {'row': idx + 2, 'field': 'mail', 'value': raw,
+                          'error': f'Geçersiz e-posta formatı: {raw}'}
+
+    errors = [found[pos] for pos in sorted(found)]
+    valid_rows = int(remaining.sum())
+    return errors, valid_rows
+
+
+def build_error_report_csv(errors: List[dict]) -> bytes:
+    """
+    Hata listesini Excel'de açılabilir CSV raporuna çevirir (UTF-8 BOM ile).
+    Kolonlar: Satır, Alan, Değer, Hata
+    Hatalarda 'file' anahtarı varsa (toplu içe aktarma) başa Dosya kolonu eklenir.
+    """
+    import csv
+    import io
+
+    with_file = any('file' in err for err in errors)
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow((['Dosya'] if with_file else []) + ['Satır', 'Alan', 'Değer', 'Hata'])
+    for err in errors:
+        value = err.get('value')
+        if value is None or (isinstance(value, float) and pd.isna(value)):
+            value = ''
+        prefix = [err.get('file', '')] if with_file else []
+        writer.writerow(prefix + [err['row'], err['field'], value, err['error']])
+    return buf.getvalue().encode('utf-8-sig')
+
+
+def validate_upload_file(uploaded_file, max_size_mb: int = 10,
+                         max_size_bytes: Optional[int] = None) -> Tuple[bool, str, Optional[List[dict]]]:
     """
     Yüklenen dosyanın tüm validasyonlarını yapar.
+    max_size_bytes verilirse boyut limiti byte cinsinden uygulanır.
 
     Returns: (success, message, error_details)
     """
@@ -222,7 +293,7 @@ def validate_upload_file(uploaded_file, max_size_mb: int = 10) -> Tuple[bool, st
         return False, msg, None
 
     # 2. Dosya boyutu kontrolü
-    is_valid, msg = validate_file_size(uploaded_file.size, max_size_mb)
+    is_valid, msg = validate_file_size(uploaded_file.size, max_size_mb, max_size_bytes)
     if not is_valid:
         return False, msg, None
 
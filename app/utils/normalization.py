@@ -1,11 +1,189 @@
+"""
+Alan normalizasyonu.
+
+Her kural iki biçimde sunulur: kolon (pandas Series, içe aktarma) pyarrow.compute
+çekirdekleriyle, tek değer (UI düzenlemeleri, model kaydı, diff karşılaştırması) düz
+Python ile çalışır. Tek değer biçimi çekirdeklerin davranışını birebir izler (RE2 \s ve
+\d yalnızca ASCII, utf8_lower 'İ' → 'i'); ikisinin her girdi için aynı sonucu verdiği
+app/tests/test_normalization.py'de doğrulanır. Boş / yalnızca boşluk içeren değerler None olur.
+"""
 import re
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# 'İ' küçük harfe çevrilirken 'i' + U+0307 (birleşik nokta) oluşabilir
+_COMBINING_DOT = '\u0307'
+# RE2: \s yalnızca ASCII boşlukları kapsar; \p{Z} Unicode boşluklarını (NBSP vb.) ekler
+_SPACES = r'[\s\p{Z}]+'
+# Ülke kodu (0090 / 90) veya trunk '0' yalnızca ardından 10 haneli ulusal numara geliyorsa atılır
+_NATIONAL_PHONE = r'^(?:0090|90|0)?(\d{10})$'
+
+# Tek değer biçimleri için düz Python karşılıkları: RE2 \s = [\t\n\f\r ], \p{Z} = Zs/Zl/Zp
+_SPACES_RE = re.compile('[\t\n\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+')
+_NON_DIGITS_RE = re.compile('[^0-9]+')
+_NATIONAL_PHONE_RE = re.compile('(?:0090|90|0)?([0-9]{10})')
+
+
+def _as_strings(values) -> pa.Array:
+    """Değerleri Arrow string dizisine çevirir; None/NaN null olur, metin olmayanlar str() ile yazılır."""
+    try:
+        arr = pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        arr = None
+    if arr is None or not (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type)):
+        arr = pa.array([None if pd.isna(v) else str(v) for v in values], type=pa.string())
+    return arr
+
+
+def _blank_to_null(arr: pa.Array) -> pa.Array:
+    return pc.if_else(pc.equal(arr, ''), pa.scalar(None, arr.type), arr)
+
+
+def _text(arr: pa.Array) -> pa.Array:
+    return _blank_to_null(pc.utf8_trim_whitespace(arr))
+
+
+def _name(arr: pa.Array) -> pa.Array:
+    return pc.replace_substring_regex(_text(arr), _SPACES, ' ')
+
+
+def _phone(arr: pa.Array) -> pa.Array:
+    digits = pc.replace_substring_regex(_text(arr), r'\D+', '')
+    return _blank_to_null(pc.replace_substring_regex(digits, _NATIONAL_PHONE, r'0\1'))
+
+
+def _email(arr: pa.Array) -> pa.Array:
+    return pc.utf8_lower(_text(arr))
+
+
+def _status_key(arr: pa.Array) -> pa.Array:
+    return pc.replace_substring(pc.utf8_lower(_text(arr)), _COMBINING_DOT, '')
+
+
+def _fold(arr: pa.Array) -> pa.Array:
+    folded = pc.replace_substring(pc.utf8_lower(_name(arr)), _COMBINING_DOT, '')
+    return pc.fill_null(pc.replace_substring(folded, 'ı', 'i'), '')
+
+
+def _series(kernel: Callable[[pa.Array], pa.Array]) -> Callable[[pd.Series], pd.Series]:
+    def apply(col: pd.Series) -> pd.Series:
+        out = kernel(_as_strings(col)).to_numpy(zero_copy_only=False)
+        return pd.Series(out, index=col.index, dtype=object)
+    return apply
+
+
+def _as_string(value) -> Optional[str]:
+    """_as_strings'in tek değer karşılığı: None/NaN → None, metin olmayanlar str() ile yazılır."""
+    if isinstance(value, str):
+        return value
+    if value is None or pd.isna(value) is True:
+        return None
+    return str(value)
+
+
+def _lower(value: str) -> str:
+    # utf8_lower bağlamsız basit eşlemeyi kullanır: 'İ' → 'i' (str.lower 'i' + U+0307 üretir),
+    # 'Σ' → 'σ' (str.lower kelime sonunda 'ς' üretir)
+    return value.replace('İ', 'i').replace('Σ', 'σ').lower()
+
+
+def _text_value(value) -> Optional[str]:
+    value = _as_string(value)
+    return (value.strip() or None) if value is not None else None
+
+
+def _name_value(value) -> Optional[str]:
+    value = _text_value(value)
+    return _SPACES_RE.sub(' ', value) if value is not None else None
+
+
+def _phone_value(value) -> Optional[str]:
+    value = _text_value(value)
+    if value is None:
+        return None
+    digits = _NON_DIGITS_RE.sub('', value)
+    match = _NATIONAL_PHONE_RE.fullmatch(digits)
+    return ('0' + match.group(1) if match else digits) or None
+
+
+def _email_value(value) -> Optional[str]:
+    value = _text_value(value)
+    return _lower(value) if value is not None else None
+
+
+def _status_key_value(value) -> Optional[str]:
+    value = _text_value(value)
+    return _lower(value).replace(_COMBINING_DOT, '') if value is not None else None
+
+
+def _fold_value(value) -> str:
+    value = _name_value(value)
+    if value is None:
+        return ''
+    return _lower(value).replace(_COMBINING_DOT, '').replace('ı', 'i')
+
+
+# Kolon (vektörel) biçimleri
+normalize_text_series = _series(_text)
+normalize_name_series = _series(_name)
+normalize_phone_series = _series(_phone)
+normalize_email_series = _series(_email)
+normalize_status_key_series = _series(_status_key)
+fold_key_series = _series(_fold)
+
+# Tek değer biçimleri
+# normalize_text: kenar boşlukları atılır.
+normalize_text = _text_value
+# normalize_name: ad/soyad/ilçe; ayrıca ardışık boşluklar teke indirilir.
+normalize_name = _name_value
+# normalize_phone: tek ulusal biçim, 0 + 10 hane (ör. +90 532 111 22 33 → 05321112233).
+# 10 haneye indirgenemeyen numaralar yalnızca rakamlarıyla bırakılır.
+normalize_phone = _phone_value
+# normalize_email: küçük harf.
+normalize_email = _email_value
+# normalize_status_key: küçük harf, 'İ' kaynaklı birleşik nokta atılır (GELİYOR → geliyor).
+normalize_status_key = _status_key_value
+# fold_key: Türkçe harf duyarsız karşılaştırma anahtarı (İ/I/ı/i aynı; büyük/küçük harf ve
+# boşluk farkı yok sayılır). Saklanmaz; yalnızca eşitlik kontrolünde kullanılır. Boş → ''.
+fold_key = _fold_value
+
+
+# Satır özeti: diff'te karşılaştırılan metin alanlarının karşılaştırma anahtarları
+# (bkz. diff_service._field_changed) birleştirilip 64 bitlik özete çevrilir. Özetleri eşit
+# iki satırın hiçbir alanı değişmiş sayılmaz; yalnızca biçim farkı (İ/ı, telefon yazımı vb.)
+# özeti değiştirmez. cevap_status FK olduğundan (silinince NULL olur) özete katılmaz.
+ROW_HASH_FIELDS = ('ad', 'soyad', 'telno', 'mail', 'ilce', 'adres_aciklama', 'notlar')
+_ROW_HASH_KEYS = {
+    'ad': _fold, 'soyad': _fold, 'ilce': _fold,
+    'telno': _phone, 'mail': _email,
+    'adres_aciklama': _text, 'notlar': _text,
+}
+_ROW_HASH_VALUE_KEYS = {
+    'ad': _fold_value, 'soyad': _fold_value, 'ilce': _fold_value,
+    'telno': _phone_value, 'mail': _email_value,
+    'adres_aciklama': _text_value, 'notlar': _text_value,
+}
+_ROW_HASH_SEP = '\x1f'
 
 
-def normalize_phone(s: str) -> str:
-    if not s:
-        return s
-    return re.sub(r'\D+', '', s)
+def row_hash_series(frame: pd.DataFrame) -> pd.Series:
+    """Her satırın içerik özeti (int64; BigIntegerField'e sığar). Eksik kolonlar boş sayılır."""
+    parts = []
+    for field in ROW_HASH_FIELDS:
+        values = frame[field] if field in frame.columns else [None] * len(frame.index)
+        parts.append(pc.fill_null(_ROW_HASH_KEYS[field](_as_strings(values)), ''))
+    joined = pc.binary_join_element_wise(*parts, _ROW_HASH_SEP).to_numpy(zero_copy_only=False)
+    hashed = pd.util.hash_array(joined.astype(object), categorize=False)
+    return pd.Series(hashed.view('int64'), index=frame.index)
 
 
-def normalize_email(s: str) -> str:
-    return s.strip().lower() if s else s
\ No newline at end of file
+def row_hash(values) -> int:
+    """Tek satırın içerik özeti; values alan adı → değer eşlemesi (dict veya model nesnesi)."""
+    get = values.get if isinstance(values, dict) else (lambda f: getattr(values, f, None))
+    joined = _ROW_HASH_SEP.join(_ROW_HASH_VALUE_KEYS[f](get(f)) or '' for f in ROW_HASH_FIELDS)
+    hashed = pd.util.hash_array(np.array([joined], dtype=object), categorize=False)
+    return int(hashed.view('int64')[0])
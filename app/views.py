@@ -4,15 +4,18 @@ from .models import Lawyer, StatusOption, Person
 from .serializers import LawyerSerializer, StatusOptionSerializer, PersonListSerializer
 
 from rest_framework.decorators import action
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework import status
 from rest_framework.response import Response
 
-from .models import UploadBatch
-from .serializers import UploadBatchSerializer, DiffResponseSerializer
-from .services.importer import parse_and_stage
-from .services.diff_service import compute_diff
+from .models import UploadBatch, ImportJob
+from .serializers import UploadBatchSerializer, DiffResponseSerializer, ImportJobSerializer
+from .services.job_service import enqueue_import, enqueue_bulk_import
+from .services.importer import preview_upload, PREVIEW_ROWS, PREVIEW_MAX_ROWS
+from .services import upload_session_service as sessions
+from .services.diff_service import DIFF_PAGE_SIZE, diff_page, diff_summary, get_diff
 from .services.apply_service import apply_diff
+from .utils.file_validators import ValidationError
 
 
 class LawyerViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.GenericViewSet):
@@ -39,32 +42,84 @@ class UploadViewSet(viewsets.GenericViewSet):
     serializer_class = UploadBatchSerializer
     parser_classes = [MultiPartParser, FormParser]
 
-    # POST /api/uploads/ (form-data: file, lawyerId)
+    # POST /api/uploads/ (form-data: file, lawyerId, duplicatePolicy=first|last|merge|reject, review=1)
+    # Dosya kuyruğa alınır; işlem run_import_worker tarafından yapılır.
+    # review=1 ile diff uygulanmaz; batch /api/uploads/{id}/approve/ ile onaylanır.
+    # 202 + statusUrl döner; ilerleme GET /api/import-jobs/{id}/ ile izlenir.
     def create(self, request, *args, **kwargs):
         file = request.FILES.get('file')
         lawyer_id = int(request.data.get('lawyerId'))
         if not file or not lawyer_id:
             return Response({"detail": "file ve lawyerId zorunlu"}, status=400)
 
-        # 1) Dosyayı staging'e yükle
-        batch_id, row_count = parse_and_stage(file, lawyer_id,
-                                              created_by=str(request.user) if request.user.is_authenticated else None)
-
-        # 2) Otomatik olarak uygula (approve et)
-        actor = str(request.user) if request.user.is_authenticated else None
-        result = apply_diff(batch_id, actor=actor)
-
-        # 3) Sonucu döndür
-        obj = UploadBatch.objects.get(id=batch_id)
-        response_data = UploadBatchSerializer(obj).data
-        response_data['apply_result'] = result  # Ekleme/güncelleme sayılarını da göster
-
-        return Response(response_data, status=status.HTTP_201_CREATED)
-
-    # GET /api/uploads/{id}/diff/
+        try:
+            job = enqueue_import(file, lawyer_id,
+                                 created_by=str(request.user) if request.user.is_authenticated else None,
+                                 duplicate_policy=request.data.get('duplicatePolicy'),
+                                 review=request.data.get('review') in ('1', 'true', True))
+        except ValidationError as ve:
+            return Response({"detail": ve.message, "details": ve.details}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = ImportJobSerializer(job, context={'request': request}).data
+        return Response(data, status=status.HTTP_202_ACCEPTED, headers={'Location': data['statusUrl']})
+
+    # POST /api/uploads/bulk/ (form-data: file=.zip, duplicatePolicy)
+    # Çok avukatlı ZIP arşivi; konsolide rapor işin result alanında döner.
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        file = request.FILES.get('file')
+        if not file:
+            return Response({"detail": "file zorunlu"}, status=400)
+
+        try:
+            job = enqueue_bulk_import(file,
+                                      created_by=str(request.user) if request.user.is_authenticated else None,
+                                      duplicate_policy=request.data.get('duplicatePolicy'))
+        except ValidationError as ve:
+            return Response({"detail": ve.message, "details": ve.details}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = ImportJobSerializer(job, context={'request': request}).data
+        return Response(data, status=status.HTTP_202_ACCEPTED, headers={'Location': data['statusUrl']})
+
+    # POST /api/uploads/preview/ (form-data: file, rows=20 (en fazla PREVIEW_MAX_ROWS), truncated=0|1)
+    # Yalnızca başlık + ilk satırlar okunur: sütun eşlemesi, normalize örnek, erken hatalar.
+    @action(detail=False, methods=['post'])
+    def preview(self, request):
+        file = request.FILES.get('file')
+        if not file:
+            return Response({"detail": "file zorunlu"}, status=400)
+
+        try:
+            rows = int(request.data.get('rows') or PREVIEW_ROWS)
+        except ValueError:
+            return Response({"detail": "rows sayı olmalı"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            data = preview_upload(file, rows=min(max(rows, 1), PREVIEW_MAX_ROWS),
+                                  truncated=request.data.get('truncated') in ('1', 'true'))
+        except ValidationError as ve:
+            return Response({"detail": ve.message, "details": ve.details}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
+    # GET /api/uploads/{id}/diff/                   → tüm diff
+    # GET /api/uploads/{id}/diff/?summary=1          → yalnızca sayılar
+    # GET /api/uploads/{id}/diff/?section=added|removed|changed&cursor=<nextCursor>&limit=100
     @action(detail=True, methods=['get'])
     def diff(self, request, pk=None):
-        diff = compute_diff(int(pk))
+        section = request.query_params.get('section')
+        if section:
+            try:
+                limit = int(request.query_params.get('limit') or DIFF_PAGE_SIZE)
+            except ValueError:
+                return Response({"detail": "limit sayı olmalı"}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                page = diff_page(int(pk), section, cursor=request.query_params.get('cursor'), limit=limit)
+            except ValidationError as ve:
+                return Response({"detail": ve.message, "details": ve.details}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(page)
+        if request.query_params.get('summary') in ('1', 'true'):
+            return Response(diff_summary(int(pk)))
+
+        diff = get_diff(int(pk))
 
         return Response(diff)
 
@@ -77,6 +132,85 @@ class UploadViewSet(viewsets.GenericViewSet):
         return Response(result, status=code)
 
 
+class UploadSessionViewSet(viewsets.ViewSet):
+    """
+    Parçalı, devam ettirilebilir yükleme (bkz. upload_session_service):
+      POST   /api/upload-sessions/                       {filename, size, chunkSize?, sha256?}
+      GET    /api/upload-sessions/{token}/               onaylı parçalar + nextChunk (devam için)
+      PUT    /api/upload-sessions/{token}/chunks/{n}/    ham gövde, başlık X-Chunk-SHA256
+      POST   /api/upload-sessions/{token}/finalize/      {lawyerId, duplicatePolicy, review?} → 202 + iş
+      DELETE /api/upload-sessions/{token}/               oturumu iptal et
+    """
+    lookup_field = 'token'
+    parser_classes = [JSONParser, FormParser, MultiPartParser]
+
+    def _actor(self, request):
+        return str(request.user) if request.user.is_authenticated else None
+
+    def create(self, request):
+        try:
+            session = sessions.open_session(
+                request.data.get('filename'), int(request.data.get('size') or 0),
+                chunk_size=request.data.get('chunkSize'), sha256=request.data.get('sha256'),
+                created_by=self._actor(request))
+        except (TypeError, ValueError):
+            return Response({"detail": "size ve chunkSize sayı olmalı"}, status=400)
+        except ValidationError as ve:
+            return Response({"detail": ve.message, "details": ve.details}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(sessions.session_state(session), status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, token=None):
+        try:
+            session = sessions.get_session(token)
+        except ValidationError as ve:
+            return Response({"detail": ve.message}, status=status.HTTP_404_NOT_FOUND)
+        return Response(sessions.session_state(session))
+
+    def destroy(self, request, token=None):
+        try:
+            sessions.abort_session(token)
+        except ValidationError as ve:
+            return Response({"detail": ve.message}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    # Gövde request.data ile ayrıştırılmaz; akış doğrudan dosyaya yazılır
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)')
+    def chunk(self, request, token=None, index=None):
+        try:
+            session = sessions.get_session(token)
+        except ValidationError as ve:
+            return Response({"detail": ve.message}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            chunk = sessions.write_chunk(session, int(index), request.stream,
+                                         request.headers.get('X-Chunk-SHA256'))
+        except ValidationError as ve:
+            return Response({"detail": ve.message, **sessions.session_state(session)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response({'index': chunk.index, 'size': chunk.size, 'sha256': chunk.sha256,
+                         **sessions.session_state(session)})
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, token=None):
+        lawyer_id = request.data.get('lawyerId')
+        try:
+            job = sessions.finalize_session(token, lawyer_id=int(lawyer_id) if lawyer_id else None,
+                                            created_by=self._actor(request),
+                                            duplicate_policy=request.data.get('duplicatePolicy'),
+                                            review=request.data.get('review') in ('1', 'true', True))
+        except ValidationError as ve:
+            return Response({"detail": ve.message, "details": ve.details}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = ImportJobSerializer(job, context={'request': request}).data
+        return Response(data, status=status.HTTP_202_ACCEPTED, headers={'Location': data['statusUrl']})
+
+
+class ImportJobViewSet(mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    queryset = ImportJob.objects.all().order_by('-id')
+    serializer_class = ImportJobSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["lawyer", "status", "kind"]
+
+
 class ReportsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'])
     def overview(self, request):
@@ -4,18 +4,23 @@ from django.core.paginator import Paginator
 from django.db.models import Q
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, FileResponse, Http404
 from django.db import transaction
+from django.urls import reverse
+from django.conf import settings
 import csv
 from io import BytesIO
 
-from .models import Lawyer, Person, StatusOption, LawyerPerson, UploadBatch, Election
-from .services.importer import parse_and_stage
-from .services.diff_service import compute_diff
+from .models import Lawyer, Person, StatusOption, LawyerPerson, UploadBatch, Election, ImportJob
+from .services.job_service import enqueue_import, enqueue_bulk_import, error_report_path
+from .services.importer import preview_upload
+from .services.upload_session_service import finalize_session
+from .services.diff_service import batch_overlap, diff_page, diff_summary
 from .services.apply_service import apply_diff
 from .services.reports import report_overview
 from .services.unique_people_service import UniquePeopleService
 from .services.person_analytics_service import PersonAnalyticsService
+from .utils.normalization import normalize_email, normalize_name, normalize_phone, normalize_text
 
 from django.shortcuts import get_object_or_404
 
@@ -157,11 +162,12 @@ def ui_upload(request):
     if request.method == 'GET':
         # Tüm avukatları alfabetik sırala
         lawyers = Lawyer.objects.all().order_by('ad', 'soyad')
-        return render(request, 'app/upload_wizard.html', {'lawyers': lawyers})
+        return render(request, 'app/upload_wizard.html', {'lawyers': lawyers, 'chunk_bytes': settings.UPLOAD_CHUNK_BYTES})
 
-    # POST
+    # POST: dosya ya doğrudan ya da parçalı yükleme oturumu (upload_session) ile gelir
     file = request.FILES.get('file')
-    if not file:
+    upload_token = request.POST.get('upload_session')
+    if not file and not upload_token:
         messages.error(request, 'Dosya zorunludur.')
         return redirect('ui_upload')
 
@@ -202,53 +208,131 @@ def ui_upload(request):
             else:
                 messages.info(request, f'Mevcut avukat kullanılıyor: {lawyer.ad} {lawyer.soyad}')
 
+    # Dosya kuyruğa alınır; staging/diff/apply arka planda run_import_worker ile yapılır
+    from app.utils.file_validators import ValidationError
+
     try:
-        # 1) Dosyayı staging'e yükle
-        from app.utils.file_validators import ValidationError
+        created_by = str(request.user) if request.user.is_authenticated else None
+        if file:
+            job = enqueue_import(file, lawyer.id, created_by=created_by,
+                                 duplicate_policy=request.POST.get('duplicate_policy'),
+                                 review=request.POST.get('review') == '1')
+        else:
+            job = finalize_session(upload_token, lawyer.id, created_by=created_by,
+                                   duplicate_policy=request.POST.get('duplicate_policy'),
+                                   review=request.POST.get('review') == '1')
+    except ValidationError as ve:
+        messages.error(request, f'❌ Dosya Validasyon Hatası: {ve.message}')
+        return redirect('ui_upload')
 
-        try:
-            batch_id, row_count = parse_and_stage(
-                file, lawyer.id,
-                created_by=str(request.user) if request.user.is_authenticated else None
-            )
-        except ValidationError as ve:
-            # Detaylı validasyon hatası
-            error_msg = f'❌ Dosya Validasyon Hatası: {ve.message}'
-            messages.error(request, error_msg)
-
-            # Detayları ayrı mesajlar olarak ekle
-            if ve.details:
-                for detail in ve.details[:10]:  # Max 10 detay göster
-                    messages.warning(request, f'  • {detail}')
+    return redirect('ui_import_job', job_id=job.id)
 
-            return redirect('ui_upload')
-
-        # 2) Otomatik olarak uygula
-        actor = str(request.user) if request.user.is_authenticated else None
-        result = apply_diff(batch_id, actor=actor)
-
-        if result.get('ok'):
-            counts = result.get('counts', {})
-            added = counts.get('added', 0)
-            changed = counts.get('changed', 0)
-            messages.success(
-                request,
-                f'✓ Yükleme başarılı! {row_count} satır işlendi. '
-                f'{added} yeni kayıt eklendi, {changed} kayıt güncellendi.'
-            )
-        else:
-            messages.warning(request, f'Yükleme tamamlandı ancak uygulama sırasında sorun oluştu: {result.get("message")}')
 
+@require_http_methods(["POST"])
+def ui_upload_bulk(request):
+    """Çok avukatlı ZIP arşivini kuyruğa alır (dosya adı / manifest / sayfa adı ile eşleme)."""
+    active_election = Election.objects.filter(is_active=True).first()
+    if active_election:
+        messages.error(request, f'Aktif seçim devam ediyor ({active_election.name}). Seçim bitene kadar yükleme yapamazsınız.')
         return redirect('ui_dashboard')
-    except Exception as e:
-        messages.error(request, f'Beklenmeyen hata: {e}')
+
+    file = request.FILES.get('archive')
+    upload_token = request.POST.get('upload_session')
+    if not file and not upload_token:
+        messages.error(request, 'ZIP dosyası zorunludur.')
         return redirect('ui_upload')
 
+    from app.utils.file_validators import ValidationError
+
+    try:
+        created_by = str(request.user) if request.user.is_authenticated else None
+        if file:
+            job = enqueue_bulk_import(file, created_by=created_by,
+                                      duplicate_policy=request.POST.get('duplicate_policy'))
+        else:
+            job = finalize_session(upload_token, created_by=created_by,
+                                   duplicate_policy=request.POST.get('duplicate_policy'))
+    except ValidationError as ve:
+        messages.error(request, f'❌ Dosya Validasyon Hatası: {ve.message}')
+        return redirect('ui_upload')
+
+    return redirect('ui_import_job', job_id=job.id)
+
+
+@require_http_methods(["POST"])
+def ui_upload_preview(request):
+    """
+    Sihirbazın önizleme adımı (JSON): dosyanın başlığı ve ilk satırları okunur,
+    staging'e yazılmaz. Büyük CSV'lerde tarayıcı yalnızca dosyanın başını gönderir (truncated=1).
+    """
+    from app.utils.file_validators import ValidationError
+
+    file = request.FILES.get('file')
+    if not file:
+        return JsonResponse({'success': False, 'error': 'Dosya zorunludur.'}, status=400)
+    try:
+        data = preview_upload(file, truncated=request.POST.get('truncated') == '1')
+    except ValidationError as ve:
+        return JsonResponse({'success': False, 'error': ve.message, 'details': ve.details}, status=400)
+    return JsonResponse({'success': True, **data})
+
+
+@require_http_methods(["GET"])
+def ui_import_job(request, job_id: int):
+    """Arka plan içe aktarma işinin ilerleme sayfası."""
+    job = get_object_or_404(ImportJob.objects.select_related('lawyer'), id=job_id)
+    return render(request, 'app/import_job.html', {'job': job})
+
+
+@require_http_methods(["GET"])
+def ui_import_job_status(request, job_id: int):
+    """İlerleme sayfasının periyodik olarak sorguladığı iş durumu (JSON)."""
+    job = get_object_or_404(ImportJob, id=job_id)
+    return JsonResponse({
+        'id': job.id,
+        'status': job.status,
+        'stage': job.stage,
+        'progress': job.progress,
+        'message': job.message,
+        'details': job.details[:10],
+        'result': job.result_json,
+        'errorReportUrl': reverse('ui_upload_error_report', args=[job.error_report]) if job.error_report else None,
+        'previewUrl': reverse('ui_diff_preview', args=[job.batch_id]) if job.batch_id else None,
+    })
+
+
+@require_http_methods(["GET"])
+def ui_upload_error_report(request, token: str):
+    """Başarısız yüklemenin tam hata raporunu (CSV) indirir."""
+    if not token.isalnum():
+        raise Http404
+    path = error_report_path(token)
+    if not path.exists():
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename='hata_raporu.csv',
+                        content_type='text/csv; charset=utf-8')
+
 
 @require_http_methods(["GET"])
 def ui_diff_preview(request, batch_id: int):
-    diff = compute_diff(batch_id)
-    return render(request, 'app/diff_preview.html', {'diff': diff})
+    # Yalnızca sayılar; satırlar bölüm bölüm ui_diff_section ile yüklenir
+    diff = diff_summary(batch_id)
+    # Onay (tamamı veya seçili satırlar) yalnızca henüz uygulanmamış batch'lerde sunulur
+    pending = UploadBatch.objects.filter(id=batch_id, status=UploadBatch.STAGED).exists()
+    return render(request, 'app/diff_preview.html',
+                  {'diff': diff, 'overlap': batch_overlap(batch_id), 'pending': pending})
+
+
+@require_http_methods(["GET"])
+def ui_diff_section(request, batch_id: int, section: str):
+    """Diff önizlemesinin bir bölümünden bir sayfa (JSON, ?cursor=<nextCursor>)."""
+    from app.utils.file_validators import ValidationError
+
+    try:
+        page = diff_page(batch_id, section, cursor=request.GET.get('cursor'))
+    except ValidationError as ve:
+        return JsonResponse({'success': False, 'error': ve.message, 'details': ve.details}, status=400)
+    return JsonResponse({'success': True, **page})
 
 
 @csrf_exempt
@@ -530,124 +614,17 @@ def ui_approve_selected(request, batch_id: int):
       - removed: çoklu checkbox (value=kisi_sicilno)
       - changed: çoklu checkbox (value=kisi_sicilno) -> tüm değişen alanlar uygulanır
     """
-    diff = compute_diff(batch_id)
-    sel_added = set(request.POST.getlist('added'))
-    sel_removed = set(request.POST.getlist('removed'))
-    sel_changed = set(request.POST.getlist('changed'))
-
-    # diff.lawyer.* bilgileri diff objesinde mevcut
-    lawyer_id = diff['lawyer']['id'] if isinstance(diff.get('lawyer'), dict) and diff['lawyer'].get('id') else None
-    if not lawyer_id:
-        messages.error(request, 'Avukat bilgisi bulunamadı.')
+    selected = {section: set(request.POST.getlist(section)) for section in ('added', 'removed', 'changed')}
+    res = apply_diff(batch_id, actor=str(request.user) if request.user.is_authenticated else None,
+                     selected=selected)
+    if not res.get('ok'):
+        messages.error(request, res.get('message', 'Uygulama başarısız.'))
         return redirect('ui_diff_preview', batch_id=batch_id)
 
-    try:
-        lawyer = Lawyer.objects.get(id=lawyer_id)
-    except Lawyer.DoesNotExist:
-        messages.error(request, 'Avukat kaydı bulunamadı.')
-        return redirect('ui_diff_preview', batch_id=batch_id)
-
-    # Yardımcı: status key -> instance
-    def get_status(key):
-        if not key:
-            return None
-        try:
-            return StatusOption.objects.get(key=key)
-        except StatusOption.DoesNotExist:
-            return None
-
-    applied_add, applied_remove, applied_change = 0, 0, 0
-
-    with transaction.atomic():
-        # ADDED - Yeni kayıtlar
-        for row in diff.get('added', []):
-            ks = str(row.get('kisi_sicilno') or '')
-            if ks not in sel_added:
-                continue
-
-            # Person global kaydı (referans için) - sadece sicilno saklanır
-            person, _ = Person.objects.get_or_create(
-                kisi_sicilno=ks,
-                defaults={
-                    'ad': row.get('ad') or '',
-                    'soyad': row.get('soyad') or '',
-                }
-            )
-
-            # KRITIK: Gerçek veriler LawyerPerson'da saklanır
-            # Her avukat için bağımsız kopya
-            LawyerPerson.objects.update_or_create(
-                lawyer=lawyer,
-                kisi_sicilno=ks,
-                defaults={
-                    'person': person,
-                    'ad': row.get('ad') or '',
-                    'soyad': row.get('soyad') or '',
-                    'mail': row.get('mail') or '',
-                    'telno': row.get('telno') or '',
-                    'ilce': row.get('ilce') or '',
-                    'adres_aciklama': row.get('adres_aciklama') or '',
-                    'notlar': row.get('notlar') or '',
-                    'cevap_status': get_status(row.get('cevap_status_key')),
-                    'active': True
-                }
-            )
-            applied_add += 1
-
-        # REMOVED - Kayıt silme (soft delete)
-        for row in diff.get('removed', []):
-            ks = str(row.get('kisi_sicilno') or '')
-            if ks not in sel_removed:
-                continue
-
-            # Bu avukattan kaldır (hard delete veya soft delete)
-            deleted_count = LawyerPerson.objects.filter(
-                lawyer=lawyer,
-                kisi_sicilno=ks
-            ).delete()[0]
-
-            if deleted_count > 0:
-                applied_remove += 1
-
-        # CHANGED - Mevcut kayıtları güncelle
-        for row in diff.get('changed', []):
-            ks = str(row.get('kisi_sicilno') or '')
-            if ks not in sel_changed:
-                continue
-
-            after = row.get('after') or {}
-
-            # Person referansını al/oluştur
-            person, _ = Person.objects.get_or_create(
-                kisi_sicilno=ks,
-                defaults={
-                    'ad': after.get('ad') or '',
-                    'soyad': after.get('soyad') or '',
-                }
-            )
-
-            # KRITIK: LawyerPerson'ı güncelle - sadece bu avukatın verisi
-            LawyerPerson.objects.update_or_create(
-                lawyer=lawyer,
-                kisi_sicilno=ks,
-                defaults={
-                    'person': person,
-                    'ad': after.get('ad') or '',
-                    'soyad': after.get('soyad') or '',
-                    'mail': after.get('mail') or '',
-                    'telno': after.get('telno') or '',
-                    'ilce': after.get('ilce') or '',
-                    'adres_aciklama': after.get('adres_aciklama') or '',
-                    'notlar': after.get('notlar') or '',
-                    'cevap_status': get_status(after.get('cevap_status_key')),
-                    'active': True
-                }
-            )
-            applied_change += 1
-
+    counts = res['counts']
     messages.success(
         request,
-        f"Seçili değişiklikler uygulandı. (+{applied_add} / -{applied_remove} / Δ{applied_change})"
+        f"Seçili değişiklikler uygulandı. (+{counts['added']} / -{counts['removed']} / Δ{counts['changed']})"
     )
     return redirect('ui_dashboard')
 
@@ -719,13 +696,14 @@ def ui_person_edit(request, person_id):
         import json
         data = json.loads(request.body)
 
-        lp.ad = data.get('ad', lp.ad)
-        lp.soyad = data.get('soyad', lp.soyad)
-        lp.mail = data.get('mail') or None
-        lp.telno = data.get('telno') or None
-        lp.ilce = data.get('ilce') or None
-        lp.adres_aciklama = data.get('adres_aciklama') or None
-        lp.notlar = data.get('notlar') or None
+        # İçe aktarmayla aynı normalizasyon (app.utils.normalization)
+        lp.ad = normalize_name(data.get('ad')) or lp.ad
+        lp.soyad = normalize_name(data.get('soyad')) or lp.soyad
+        lp.mail = normalize_email(data.get('mail'))
+        lp.telno = normalize_phone(data.get('telno'))
+        lp.ilce = normalize_name(data.get('ilce'))
+        lp.adres_aciklama = normalize_text(data.get('adres_aciklama'))
+        lp.notlar = normalize_text(data.get('notlar'))
 
         status_key = data.get('cevap_status_key')
         if status_key:
@@ -85,6 +85,9 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT', '5432'),
     }
 }
+# İçe aktarma işlerinin ilerlemesi ayrı bir bağlantıdan yazılır; böylece
+# uzun süren staging transaction'ı devam ederken de UI'dan okunabilir.
+DATABASES['jobs'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -123,3 +126,42 @@ STATICFILES_DIRS = [BASE_DIR / 'app' / 'static']
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Liste yükleme (import) limitleri
+# UPLOAD_MAX_BYTES: yüklenebilecek en büyük dosya (byte)
+# UPLOAD_MAX_ROWS: dosyadaki en fazla veri satırı (0 = limitsiz)
+# IMPORT_CHUNK_ROWS: akış (streaming) okumada her parçadaki satır sayısı
+UPLOAD_MAX_BYTES = int(os.getenv('UPLOAD_MAX_BYTES', str(512 * 1024 * 1024)))
+UPLOAD_MAX_ROWS = int(os.getenv('UPLOAD_MAX_ROWS', '2000000'))
+IMPORT_CHUNK_ROWS = int(os.getenv('IMPORT_CHUNK_ROWS', '5000'))
+
+# Arka plan içe aktarma işleri: kuyruktaki dosyaların tutulduğu dizin
+IMPORT_JOB_DIR = os.getenv('IMPORT_JOB_DIR', str(BASE_DIR / 'var' / 'import_jobs'))
+# Bu süreden (dakika) uzun süredir RUNNING olan işler, worker öldürülmüş/çökmüş sayılıp FAILED yapılır
+IMPORT_JOB_TIMEOUT_MINUTES = int(os.getenv('IMPORT_JOB_TIMEOUT_MINUTES', '120'))
+
+# Toplu (ZIP) içe aktarmada dosyaları paralel okuyan süreç sayısı (boş = CPU sayısı)
+IMPORT_WORKERS = int(os.getenv('IMPORT_WORKERS', '0')) or None
+
+# CSV okuyucusu: 'pyarrow' (çok iş parçacıklı) veya 'c' (pandas C okuyucusu)
+IMPORT_CSV_ENGINE = os.getenv('IMPORT_CSV_ENGINE', 'pyarrow')
+
+# Aynı sicil no dosyada birden fazla satırda geçerse varsayılan çözüm:
+# 'first' (ilk satır), 'last' (son satır), 'merge' (dolu alanlar birleştirilir), 'reject' (dosya reddedilir)
+IMPORT_DUPLICATE_POLICY = os.getenv('IMPORT_DUPLICATE_POLICY', 'last')
+
+# Uygulanmış/reddedilmiş batch'lerin staging satırlarının saklanma süresi (gün);
+# süresi dolanlar purge_staging komutu ile silinir
+STAGING_RETENTION_DAYS = int(os.getenv('STAGING_RETENTION_DAYS', '30'))
+
+# Parçalı (chunked) yükleme: parçaların birleştirildiği dizin, en büyük parça boyutu (byte)
+# ve tamamlanmayan oturumların saklanma süresi (saat; purge_staging ile silinir)
+UPLOAD_SESSION_DIR = os.getenv('UPLOAD_SESSION_DIR', str(BASE_DIR / 'var' / 'upload_sessions'))
+UPLOAD_CHUNK_BYTES = int(os.getenv('UPLOAD_CHUNK_BYTES', str(8 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv('UPLOAD_SESSION_TTL_HOURS', '48'))
+# Kullanıcı başına aynı anda açık olabilecek yükleme oturumu sayısı (her biri diskte dosya boyutu kadar yer ayırır)
+UPLOAD_SESSION_MAX_OPEN = int(os.getenv('UPLOAD_SESSION_MAX_OPEN', '3'))
+
+# Diff motoru: 'sql' (eşleme ve karşılaştırma veritabanında; yalnızca farklı satırlar okunur)
+# veya 'python' (tüm kayıtlar belleğe alınıp karşılaştırılır)
+DIFF_ENGINE = os.getenv('DIFF_ENGINE', 'sql')
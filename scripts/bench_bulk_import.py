@@ -0,0 +1,63 @@
+"""
+Toplu içe aktarma hazırlık adımı benchmark'ı: aynı dosya setini prepare_file ile
+önce sırayla, sonra ProcessPoolExecutor ile paralel okur.
+Veritabanına yazılmaz; yalnızca okuma + doğrulama + normalize süresi ölçülür.
+
+Kullanım:
+    python scripts/bench_bulk_import.py [dosya_sayısı] [dosya_başına_satır] [süreç_sayısı]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from app.services.importer import prepare_file  # noqa: E402
+
+
+def write_files(directory: str, count: int, rows: int):
+    paths = []
+    for f in range(count):
+        path = os.path.join(directory, f"L{1000 + f}.csv")
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write("sicilno,ad,soyad,cevapDurumu,telno,mail,ilce\n")
+            for i in range(rows):
+                fh.write(f"{10000 + i},Ad{i},Soyad{i},Geliyor,0532 111 {i % 10000:04d},Kisi{i}@Example.com,Çankaya\n")
+        paths.append(path)
+    return paths
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(directory, count, rows)
+
+        t0 = time.perf_counter()
+        serial = [prepare_file(p)['row_count'] for p in paths]
+        serial_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            parallel = [r['row_count'] for r in pool.map(prepare_file, paths)]
+        parallel_time = time.perf_counter() - t0
+
+    print(f"Dosya x satır       : {count} x {rows}")
+    print(f"Süreç sayısı        : {workers} (CPU: {os.cpu_count()})")
+    print(f"Sıralı              : {serial_time:.2f} sn")
+    print(f"Paralel             : {parallel_time:.2f} sn")
+    print(f"Hızlanma            : {serial_time / parallel_time:.2f}x")
+    print(f"Sonuçlar aynı       : {serial == parallel}")
+
+
+if __name__ == '__main__':
+    main()
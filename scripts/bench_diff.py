@@ -0,0 +1,120 @@
+"""
+Diff snapshot benchmark'ı: eski model nesnesi + satır sözlüğü snapshot'larını
+values_list ile okunan sabit konumlu tuple snapshot'larıyla karşılaştırır
+(avukat başına N kişi, staging'de %1 eklenen/kaldırılan ve %1 değişen satır).
+Karşılaştırma için SQL motoru (_sql_diff) da ölçülür.
+Test verisi tek bir transaction içinde yazılır ve sonunda geri alınır.
+
+Kullanım:
+    python scripts/bench_diff.py [kişi_sayısı]
+"""
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+
+from app.models import Lawyer, LawyerPerson, Person, StatusOption, UploadBatch, UploadRowStaging  # noqa: E402
+from app.services.diff_service import (  # noqa: E402
+    COMPARE_FIELDS, _diff_dicts, _field_changed, _snapshot_for_lawyer, _snapshot_from_batch, _sql_diff,
+)
+
+
+def legacy_diff(lawyer_id: int, batch_id: int):
+    """Eski snapshot + _diff_dicts yolunun birebir kopyası."""
+    current = {}
+    for lp in LawyerPerson.objects.filter(lawyer_id=lawyer_id, active=True).select_related("cevap_status"):
+        ks = (lp.kisi_sicilno or "").strip()
+        if not ks:
+            continue
+        current[ks] = {
+            "kisi_sicilno": ks, "ad": lp.ad or "", "soyad": lp.soyad or "", "mail": lp.mail or "",
+            "telno": lp.telno or "", "ilce": lp.ilce or "", "adres_aciklama": lp.adres_aciklama or "",
+            "notlar": lp.notlar or "", "cevap_status_key": lp.cevap_status.key if lp.cevap_status_id else "",
+        }
+    new = {}
+    for r in UploadRowStaging.objects.filter(batch_id=batch_id):
+        ks = (r.kisi_sicilno or "").strip()
+        if not ks:
+            continue
+        new[ks] = {"kisi_sicilno": ks, **{f: (getattr(r, f) or "").strip() for f in COMPARE_FIELDS}}
+
+    added = [new[k] for k in sorted(new.keys() - current.keys())]
+    removed = [current[k] for k in sorted(current.keys() - new.keys())]
+    changed = []
+    for ks in sorted(current.keys() & new.keys()):
+        fields = [f for f in COMPARE_FIELDS if _field_changed(current[ks], new[ks], f)]
+        if fields:
+            changed.append({"kisi_sicilno": ks, "fields": fields, "before": current[ks], "after": new[ks]})
+    return added, removed, changed
+
+
+def tuple_diff(lawyer_id: int, batch_id: int):
+    return _diff_dicts(_snapshot_for_lawyer(lawyer_id), _snapshot_from_batch(batch_id))
+
+
+def sql_diff(lawyer_id: int, batch_id: int):
+    return _sql_diff(batch_id, lawyer_id)
+
+
+def measure(fn, *args):
+    # Süre tracemalloc kapalıyken, bellek ayrı bir çalıştırmada ölçülür
+    t0 = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def seed(n: int):
+    status = StatusOption.objects.get_or_create(key='geliyor', defaults={'label': 'Geliyor'})[0]
+    lawyer = Lawyer.objects.create(sicil_no=f"B{uuid.uuid4().hex[:8]}", ad='Bench', soyad='Diff')
+    person = Person.objects.create(kisi_sicilno=f"B{uuid.uuid4().hex[:8]}", ad='Bench', soyad='Diff')
+    batch = UploadBatch.objects.create(lawyer=lawyer, original_filename='bench.csv')
+
+    def fields(i):
+        return dict(ad=f"Ad{i}", soyad='Işık', mail=f"kisi{i}@example.com", telno=f"0532111{i % 10000:04d}",
+                    ilce='Kadıköy', adres_aciklama='Örnek mahallesi, örnek sokak no: 1', notlar='')
+
+    LawyerPerson.objects.bulk_create(
+        (LawyerPerson(lawyer=lawyer, person=person, kisi_sicilno=str(10 ** 6 + i), cevap_status=status, **fields(i))
+         for i in range(n)), batch_size=5000)
+    shift = n // 100
+    UploadRowStaging.objects.bulk_create(
+        (UploadRowStaging(batch=batch, kisi_sicilno=str(10 ** 6 + i), cevap_status_key='geliyor',
+                          **{**fields(i), **({'ilce': 'Çankaya'} if i % 100 == 0 else {})})
+         for i in range(shift, n + shift)), batch_size=5000)
+    return lawyer.id, batch.id
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with transaction.atomic():
+        lawyer_id, batch_id = seed(n)
+        results = {name: measure(fn, lawyer_id, batch_id)
+                   for name, fn in (('Eski (nesne+dict)', legacy_diff), ('Tuple', tuple_diff), ('SQL', sql_diff))}
+        transaction.set_rollback(True)
+
+    print(f"Kişi sayısı          : {n}")
+    for name, (result, elapsed, peak) in results.items():
+        counts = '/'.join(str(len(part)) for part in result)
+        print(f"{name:<20} : {elapsed:.2f} sn / {peak / 1e6:.1f} MB (eklenen/kaldırılan/değişen: {counts})")
+    first = next(iter(results.values()))[0]
+    print(f"Sonuçlar aynı        : {all(result == first for result, _, _ in results.values())}")
+
+
+if __name__ == '__main__':
+    main()
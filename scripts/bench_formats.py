@@ -0,0 +1,99 @@
+"""
+Yükleme formatı benchmark'ı: aynı listeyi CSV, XLSX, Parquet ve Arrow IPC olarak
+yazar ve her birini prepare_file ile (okuma + doğrulama + eşleme + normalize)
+işleme süresini ölçer. CSV hem pandas C hem pyarrow okuyucusu ile ölçülür
+(settings.IMPORT_CSV_ENGINE). Veritabanına yazılmaz.
+Tüm formatların aynı içerik özetini (content_hash) verdiği de kontrol edilir.
+
+Kullanım:
+    python scripts/bench_formats.py [satır_sayısı]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import pandas as pd  # noqa: E402
+import pyarrow as pa  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from django.conf import settings  # noqa: E402
+
+from app.services.importer import prepare_file, _iter_chunks  # noqa: E402
+
+
+def build_frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'sicilno': [f"{100000 + i}" for i in range(n)],
+        'ad': [f"Ad{i}" for i in range(n)],
+        'soyad': [f"Soyad{i}" for i in range(n)],
+        'cevapDurumu': (['Geliyor', 'gelmiyor', None, 'nötr'] * (n // 4 + 1))[:n],
+        'telno': [f"0532 111 {i % 10000:04d}" for i in range(n)],
+        'mail': [f"Kisi{i}@Example.com" for i in range(n)],
+        'ilce': (['Çankaya', 'Keçiören', None] * (n // 3 + 1))[:n],
+    })
+
+
+def write_xlsx(df: pd.DataFrame, path: str):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False):
+        ws.append(list(row))
+    wb.save(path)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def read_only(path: str) -> int:
+    return sum(len(chunk) for chunk in _iter_chunks(path, 5000))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    df = build_frame(n)
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'liste.csv')
+        paths = {
+            'CSV (c)': csv_path,
+            'CSV (pyarrow)': csv_path,
+            'XLSX': os.path.join(directory, 'liste.xlsx'),
+            'Parquet': os.path.join(directory, 'liste.parquet'),
+            'Arrow IPC': os.path.join(directory, 'liste.arrow'),
+        }
+        df.to_csv(csv_path, index=False)
+        write_xlsx(df, paths['XLSX'])
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, paths['Parquet'], compression='zstd')
+        with pa.ipc.new_file(paths['Arrow IPC'], table.schema) as writer:
+            writer.write_table(table)
+
+        print(f"Satır sayısı: {n}")
+        print(f"{'Format':<14} {'Boyut':>10} {'Okuma':>9} {'Tam hazırlık':>13}")
+        hashes = set()
+        for name, path in paths.items():
+            settings.IMPORT_CSV_ENGINE = 'c' if name == 'CSV (c)' else 'pyarrow'
+            _, read_time = timed(read_only, path)
+            prepared, total_time = timed(prepare_file, path)
+            hashes.add(prepared['content_hash'])
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{name:<14} {size_mb:>8.1f}MB {read_time:>8.2f}s {total_time:>12.2f}s")
+        print(f"İçerik özetleri aynı: {len(hashes) == 1}")
+
+
+if __name__ == '__main__':
+    main()
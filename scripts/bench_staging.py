@@ -0,0 +1,93 @@
+"""
+Staging hazırlık adımı benchmark'ı: eski satır satır (iterrows + UploadRowStaging
+nesnesi) yol ile yeni vektörel tuple yolunu karşılaştırır.
+Veritabanına yazılmaz; yalnızca satırları INSERT'e hazırlama maliyeti ölçülür.
+
+Kullanım:
+    python scripts/bench_staging.py [satır_sayısı]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import pandas as pd  # noqa: E402
+
+from app.models import UploadBatch, UploadRowStaging  # noqa: E402
+from app.services.importer import _map_columns, _normalize_df, _staging_columns, STAGING_FIELDS  # noqa: E402
+from app.utils.file_validators import validate_sicil_no  # noqa: E402
+
+
+def legacy_rows(df: pd.DataFrame, batch: UploadBatch):
+    """Eski staging döngüsünün birebir kopyası."""
+    rows = []
+    for idx, r in df.iterrows():
+        ks = str(r.get('kisi_sicilno') or r.get('sicilno') or '').strip()
+        ad = str(r.get('ad') or '').strip()
+        soyad = str(r.get('soyad') or '').strip()
+        if not ks or not ad or not soyad:
+            continue
+        is_valid, _ = validate_sicil_no(ks)
+        if not is_valid:
+            continue
+        rows.append(UploadRowStaging(
+            batch=batch, kisi_sicilno=ks, ad=ad, soyad=soyad,
+            telno=r.get('telno'), mail=r.get('mail'), ilce=r.get('ilce'),
+            adres_aciklama=r.get('adres_aciklama'), notlar=r.get('notlar'),
+            cevap_status_key=(str(r.get('cevap_status_key')).lower() if r.get('cevap_status_key') else None)
+        ))
+    return rows
+
+
+def vectorized_rows(df: pd.DataFrame, batch: UploadBatch):
+    cols, keep = _staging_columns(df)
+    cols = {k: v[keep] for k, v in cols.items()}
+    values = [cols[f].tolist() for f in STAGING_FIELDS[1:]]
+    return [(batch.id,) + row for row in zip(*values)]
+
+
+def measure(fn, *args):
+    # CPU süresi tracemalloc kapalıyken, bellek ayrı bir çalıştırmada ölçülür
+    t0 = time.process_time()
+    result = fn(*args)
+    cpu = time.process_time() - t0
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, cpu, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    raw = pd.DataFrame({
+        'sicilno': [f"{10000 + i}" for i in range(n)],
+        'ad': [f"Ad{i}" for i in range(n)],
+        'soyad': [f"Soyad{i}" for i in range(n)],
+        'cevapdurumu': ['Geliyor', 'gelmiyor', None, 'nötr'] * (n // 4) + [None] * (n % 4),
+        'telno': [f"0532 111 {i % 10000:04d}" for i in range(n)],
+        'mail': [f"Kisi{i}@Example.com" for i in range(n)],
+        'ilce': ['Çankaya', 'Keçiören', None] * (n // 3) + [None] * (n % 3),
+        'notlar': [None] * n,
+    })
+    df = _normalize_df(_map_columns(raw))
+    batch = UploadBatch(id=1)
+
+    old, old_cpu, old_peak = measure(legacy_rows, df, batch)
+    new, new_cpu, new_peak = measure(vectorized_rows, df, batch)
+
+    print(f"Satır sayısı        : {n}")
+    print(f"Eski CPU / bellek   : {old_cpu:.3f} sn / {old_peak / 1e6:.1f} MB")
+    print(f"Yeni CPU / bellek   : {new_cpu:.3f} sn / {new_peak / 1e6:.1f} MB")
+    print(f"Satırlar aynı       : {len(old) == len(new) and all(o.kisi_sicilno == t[1] and o.cevap_status_key == t[-1] for o, t in zip(old, new))}")
+
+
+if __name__ == '__main__':
+    main()
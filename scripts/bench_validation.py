@@ -0,0 +1,113 @@
+"""
+validate_dataframe_data benchmark'ı: eski satır satır (iterrows) motor ile
+yeni kolon bazlı (vektörel) motoru karşılaştırır ve sonuçların aynı olduğunu doğrular.
+
+Kullanım:
+    python scripts/bench_validation.py [satır_sayısı]
+"""
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.file_validators import collect_dataframe_errors, validate_sicil_no  # noqa: E402
+
+
+def legacy_collect_errors(df: pd.DataFrame):
+    """Eski iterrows tabanlı motorun birebir kopyası (tüm hataları döndürür)."""
+    errors = []
+    valid_rows = 0
+    for idx, row in df.iterrows():
+        row_num = idx + 2
+        sicil = row.get('sicilno') or row.get('kisi_sicilno')
+        if pd.isna(sicil) or str(sicil).strip() == '':
+            errors.append({'row': row_num, 'field': 'sicilno', 'value': sicil, 'error': 'Sicil No boş olamaz'})
+            continue
+        is_valid, error_msg = validate_sicil_no(sicil)
+        if not is_valid:
+            errors.append({'row': row_num, 'field': 'sicilno', 'value': sicil, 'error': error_msg})
+            continue
+        ad = row.get('ad')
+        if pd.isna(ad) or str(ad).strip() == '':
+            errors.append({'row': row_num, 'field': 'ad', 'value': ad, 'error': 'Ad boş olamaz'})
+            continue
+        if len(str(ad).strip()) < 2:
+            errors.append({'row': row_num, 'field': 'ad', 'value': ad, 'error': 'Ad en az 2 karakter olmalı'})
+            continue
+        soyad = row.get('soyad')
+        if pd.isna(soyad) or str(soyad).strip() == '':
+            errors.append({'row': row_num, 'field': 'soyad', 'value': soyad, 'error': 'Soyad boş olamaz'})
+            continue
+        if len(str(soyad).strip()) < 2:
+            errors.append({'row': row_num, 'field': 'soyad', 'value': soyad, 'error': 'Soyad en az 2 karakter olmalı'})
+            continue
+        mail = row.get('mail')
+        if mail and not pd.isna(mail) and str(mail).strip():
+            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+            if not re.match(email_pattern, str(mail).strip()):
+                errors.append({'row': row_num, 'field': 'mail', 'value': mail, 'error': f'Geçersiz e-posta formatı: {mail}'})
+        valid_rows += 1
+    return errors, valid_rows
+
+
+def make_frame(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        'sicilno': [f"{10000 + i}" for i in range(n)],
+        'ad': [f"Ad{i}" for i in range(n)],
+        'soyad': [f"Soyad{i}" for i in range(n)],
+        'mail': [f"kisi{i}@example.com" for i in range(n)],
+    }, dtype=object)
+    # ~%2 hatalı satır ekle
+    bad = rng.choice(n, size=max(1, n // 50), replace=False)
+    for j, pos in enumerate(bad):
+        kind = j % 6
+        if kind == 0:
+            df.at[pos, 'sicilno'] = np.nan
+        elif kind == 1:
+            df.at[pos, 'sicilno'] = '12'
+        elif kind == 2:
+            df.at[pos, 'sicilno'] = 'ab#cd'
+        elif kind == 3:
+            df.at[pos, 'ad'] = 'A'
+        elif kind == 4:
+            df.at[pos, 'soyad'] = '  '
+        else:
+            df.at[pos, 'mail'] = 'gecersiz-mail'
+    return df
+
+
+def _same(a, b):
+    def key(e):
+        v = e['value']
+        return e['row'], e['field'], 'nan' if isinstance(v, float) and pd.isna(v) else str(v), e['error']
+    return [key(e) for e in a] == [key(e) for e in b]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_frame(n)
+
+    t0 = time.perf_counter()
+    legacy_errors, legacy_valid = legacy_collect_errors(df)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new_errors, new_valid = collect_dataframe_errors(df)
+    t_new = time.perf_counter() - t0
+
+    print(f"Satır sayısı       : {n}")
+    print(f"Eski (iterrows)    : {t_legacy:.3f} sn")
+    print(f"Yeni (vektörel)    : {t_new:.3f} sn")
+    print(f"Hızlanma           : {t_legacy / t_new:.1f}x")
+    print(f"Hata / geçerli     : {len(new_errors)} / {new_valid}")
+    print(f"Sonuçlar aynı      : {_same(legacy_errors, new_errors) and legacy_valid == new_valid}")
+
+
+if __name__ == '__main__':
+    main()
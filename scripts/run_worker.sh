@@ -0,0 +1,3 @@
+#!/usr/bin/env bash
+export DJANGO_SETTINGS_MODULE=core.settings
+python manage.py run_import_worker